@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Admission control for upstream Claude API calls
+Bounds in-flight requests with an adaptive AIMD limit, queues the excess by
+priority with a deadline and rejects early when the queue is full
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+
+PRIORITY_INTERACTIVE = 0  # Attendee chat
+PRIORITY_BACKGROUND = 1   # Kiosk smoke tests, pre-warming scripts
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted; carries a Retry-After hint"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ('event', 'granted', 'cancelled')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+        self.cancelled = False
+
+
+class AdmissionController:
+    """Concurrency limiter with additive-increase / multiplicative-decrease
+
+    Every call that finishes quickly raises the limit by 1/limit (about one
+    slot per round of calls); an upstream 429 or a call slower than
+    `latency_target` multiplies it by `decrease_factor`.
+    """
+
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=16, max_queue=32,
+                 queue_timeout=10.0, latency_target=8.0, decrease_factor=0.5):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+
+        self.in_flight = 0
+        self.avg_latency = latency_target / 2
+        self.stats = {'admitted': 0, 'queued': 0, 'rejected_full': 0, 'rejected_timeout': 0,
+                      'throttled': 0, 'decreases': 0}
+        self._queue = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def _retry_after(self):
+        """Seconds until a slot is likely free, for the Retry-After header"""
+        backlog = len(self._queue) + 1
+        return max(1, math.ceil(self.avg_latency * backlog / max(1, int(self.limit))))
+
+    def _dispatch(self):
+        """Hand free slots to the highest-priority waiters (lock held)"""
+        while self._queue and self.in_flight < int(self.limit):
+            _, _, waiter = heapq.heappop(self._queue)
+            if waiter.cancelled:
+                continue
+            waiter.granted = True
+            self.in_flight += 1
+            waiter.event.set()
+
+    def acquire(self, priority=PRIORITY_INTERACTIVE):
+        """Block until a slot is free; raise AdmissionRejected on overflow or deadline"""
+        with self._lock:
+            if self.in_flight < int(self.limit) and not self._queue:
+                self.in_flight += 1
+                self.stats['admitted'] += 1
+                return
+            if len(self._queue) >= self.max_queue:
+                self.stats['rejected_full'] += 1
+                raise AdmissionRejected('queue full', self._retry_after())
+            waiter = _Waiter()
+            heapq.heappush(self._queue, (priority, next(self._seq), waiter))
+            self.stats['queued'] += 1
+
+        waiter.event.wait(self.queue_timeout)
+
+        with self._lock:
+            if waiter.granted:
+                self.stats['admitted'] += 1
+                return
+            waiter.cancelled = True
+            self._queue = [item for item in self._queue if item[2] is not waiter]
+            heapq.heapify(self._queue)
+            self.stats['rejected_timeout'] += 1
+            raise AdmissionRejected('queue timeout', self._retry_after())
+
+    def release(self, latency, throttled=False):
+        """Free a slot and adapt the limit to how the call went"""
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            self.avg_latency = 0.8 * self.avg_latency + 0.2 * latency
+            if throttled:
+                self.stats['throttled'] += 1
+            if throttled or latency > self.latency_target:
+                self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                self.stats['decreases'] += 1
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._dispatch()
+
+    def snapshot(self):
+        """Current state for the metrics endpoint"""
+        with self._lock:
+            return {
+                'limit': round(self.limit, 2),
+                'in_flight': self.in_flight,
+                'queued': len(self._queue),
+                'avg_latency': round(self.avg_latency, 2),
+                **self.stats
+            }
@@ -1,5 +1,168 @@
 // === Conference App ===
 
+// === Query normalization (mirrors normalize.py - keep the rules in sync) ===
+const QUERY_TIME_PATTERN = /(^|[^\d:.])(\d{1,2})(?:[:.](\d{2}))?(?:\s*([ap])\.?\s?m\b\.?|\s*(uhr|hod(?:in|\.)?)\b)?(?![\d:])/g;
+const QUERY_TOKEN_PATTERN = /\d\d:\d\d|[\p{L}\p{N}_]+/gu;
+const QUERY_SPECIAL_FOLDS = { 'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ø': 'o', 'ł': 'l', 'đ': 'd', 'ı': 'i' };
+const QUERY_STOPWORDS = {
+    en: ['a', 'an', 'the', 'is', 'are', 'am', 'be', 'to', 'of', 'in', 'on', 'at', 'for', 'and', 'or', 'i', 'me',
+         'my', 'you', 'your', 'can', 'could', 'do', 'does', 'please', 'there', 'any', 'it', 'this', 'that', 's'],
+    cs: ['a', 'i', 'je', 'jsou', 'v', 've', 'na', 'o', 'mi', 'me', 'se', 'si', 'to', 'ten', 'ta', 'za', 'do',
+         'z', 'ze', 'k', 'ke', 's', 'prosim', 'nejake', 'nejaky', 'hod', 'hodin'],
+    de: ['der', 'die', 'das', 'den', 'dem', 'ein', 'eine', 'einen', 'ist', 'sind', 'im', 'in', 'um', 'am', 'an',
+         'und', 'oder', 'ich', 'du', 'es', 'gibt', 'zu', 'zum', 'zur', 'bitte', 'mir', 'uhr']
+};
+const QUERY_STOPWORD_SETS = Object.fromEntries(
+    Object.entries(QUERY_STOPWORDS).map(([lang, words]) => [lang, new Set(words)])
+);
+QUERY_STOPWORD_SETS.any = new Set(Object.values(QUERY_STOPWORDS).flat());
+
+function canonicalTimes(text) {
+    return text.replace(QUERY_TIME_PATTERN, (match, before, hour, minutes, meridiem, unit) => {
+        if (minutes === undefined && meridiem === undefined && unit === undefined) return match;
+        let h = parseInt(hour, 10);
+        const m = parseInt(minutes || '0', 10);
+        if (meridiem) {
+            if (h < 1 || h > 12) return match;
+            h = h % 12 + (meridiem === 'p' ? 12 : 0);
+        }
+        if (h > 23 || m > 59) return match;
+        return `${before}${String(h).padStart(2, '0')}:${String(m).padStart(2, '0')}`;
+    });
+}
+
+function foldDiacritics(text) {
+    return text.replace(/[ßæœøłđı]/g, ch => QUERY_SPECIAL_FOLDS[ch]).normalize('NFD').replace(/[\u0300-\u036f]/g, '');
+}
+
+function normalizeQuery(text, language) {
+    const stopwords = QUERY_STOPWORD_SETS[language] || QUERY_STOPWORD_SETS.en;
+    const folded = foldDiacritics(canonicalTimes(text.toLowerCase()));
+    return (folded.match(QUERY_TOKEN_PATTERN) || []).filter(t => !stopwords.has(t)).join(' ');
+}
+
+// === Autocomplete (mirrors SuggestIndex.lookup in suggest.py, used when /api/suggest is unreachable) ===
+const SUGGEST_LIMIT = 8;
+const SUGGEST_MIN_QUERY_CHARS = 2;
+const SUGGEST_TYPO_MIN_CHARS = 3;
+const SUGGEST_MAX_CANDIDATES = 400;
+const SUGGEST_RETRY_MS = 30000;  // After a failed /api/suggest call, search locally this long
+
+function suggestTokens(text) {
+    return foldDiacritics(text.toLowerCase()).match(QUERY_TOKEN_PATTERN) || [];
+}
+
+class SuggestIndex {
+    constructor({ items, tokens, postings }) {
+        this.items = items;  // [text, kind, ask], best first
+        this.tokens = tokens;  // Sorted distinct tokens
+        this.postings = postings;
+        this.itemTokens = items.map(([text]) => new Set(suggestTokens(text)));
+    }
+
+    bisect(prefix) {
+        let lo = 0, hi = this.tokens.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (this.tokens[mid] < prefix) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    }
+
+    isPrefix(prefix) {
+        const i = this.bisect(prefix);
+        return i < this.tokens.length && this.tokens[i].startsWith(prefix);
+    }
+
+    nextChars(prefix) {
+        const chars = [];
+        let i = this.bisect(prefix);
+        while (i < this.tokens.length && this.tokens[i].startsWith(prefix)) {
+            if (this.tokens[i].length === prefix.length) { i++; continue; }
+            const c = this.tokens[i][prefix.length];
+            chars.push(c);
+            i = this.bisect(prefix + String.fromCharCode(c.charCodeAt(0) + 1));
+        }
+        return chars;
+    }
+
+    typoVariants(token) {
+        const variants = new Set();
+        for (let i = 0; i < token.length; i++) {
+            const before = token.slice(0, i);
+            if (!this.isPrefix(before)) break;
+            variants.add(before + token.slice(i + 1));
+            if (i + 1 < token.length) variants.add(before + token[i + 1] + token[i] + token.slice(i + 2));
+            for (const c of this.nextChars(before)) {
+                variants.add(before + c + token.slice(i + 1));
+                variants.add(before + c + token.slice(i));
+            }
+        }
+        variants.delete(token);
+        return [...variants].filter(v => v && this.isPrefix(v));
+    }
+
+    prefixed(prefix) {
+        const found = new Set();
+        for (let i = this.bisect(prefix); i < this.tokens.length && this.tokens[i].startsWith(prefix)
+             && found.size < SUGGEST_MAX_CANDIDATES; i++) {
+            this.postings[i].slice(0, SUGGEST_MAX_CANDIDATES - found.size).forEach(item => found.add(item));
+        }
+        return found;
+    }
+
+    exactPostings(token) {
+        const i = this.bisect(token);
+        return i < this.tokens.length && this.tokens[i] === token ? this.postings[i] : [];
+    }
+
+    candidates(complete, anchor) {
+        // Items with the rarest finished word first; exact prefixes before typos
+        const finished = complete.map(t => this.exactPostings(t)).filter(p => p.length);
+        const pool = finished.length ? finished.reduce((a, b) => (b.length < a.length ? b : a))
+            .slice(0, SUGGEST_MAX_CANDIDATES) : [];
+        const inPool = (prefixes, typo) => new Map(pool
+            .filter(item => [...this.itemTokens[item]].some(t => prefixes.some(p => t.startsWith(p))))
+            .map(item => [item, typo]));
+
+        let found = inPool([anchor], false);
+        if (found.size === 0) found = new Map([...this.prefixed(anchor)].map(item => [item, false]));
+        if (found.size || anchor.length < SUGGEST_TYPO_MIN_CHARS) return found;
+        const variants = this.typoVariants(anchor);
+        if (variants.length === 0) return found;
+        found = inPool(variants, true);
+        if (found.size === 0) {
+            for (const variant of variants) this.prefixed(variant).forEach(item => found.set(item, true));
+        }
+        return found;
+    }
+
+    lookup(query, limit = SUGGEST_LIMIT) {
+        const tokens = suggestTokens(query);
+        if (query.trim().length < SUGGEST_MIN_QUERY_CHARS || tokens.length === 0) return [];
+        // A trailing space means the last word is finished; the last word is matched as a prefix either way
+        const complete = /\s$/.test(query) ? tokens : tokens.slice(0, -1);
+        const typo = this.candidates(complete, tokens[tokens.length - 1]);
+
+        // Items that also contain the finished words come first; if any do, the others are dropped
+        const wanted = [...new Set(complete)];
+        const matched = new Map([...typo.keys()].map(item =>
+            [item, wanted.filter(t => this.itemTokens[item].has(t)).length]));
+        const best = Math.max(0, ...matched.values());
+        const ranked = [...typo.keys()].filter(item => matched.get(item) === best)
+            .sort((a, b) => (typo.get(a) - typo.get(b)) || (a - b));
+        const suggestions = [], asked = new Set();
+        for (const item of ranked) {
+            const [text, kind, ask] = this.items[item];
+            if (asked.has(ask)) continue;
+            asked.add(ask);
+            suggestions.push({ text, kind, ask, typo: typo.get(item) });
+            if (suggestions.length === limit) break;
+        }
+        return suggestions;
+    }
+}
+
 class ConferenceApp {
     constructor() {
         this.data = null;
@@ -9,6 +172,12 @@ class ConferenceApp {
         this.apiUsageCount = this.loadApiUsage();
         this.conversationHistory = [];  // Store conversation context
         this.lastFaqAnswer = null;  // Store last FAQ answer for context
+        this.chatSessionId = null;  // Server-side conversation (the server keeps the history)
+        this.localTurn = null;  // Last question answered from the FAQ here, sent with the next API call
+        this.suggestIndex = null;  // data/suggest.json, loaded the first time /api/suggest cannot be reached
+        this.photos = null;  // data/photos.json (srcsets of the local speaker photos), loaded with the first speaker
+        this.suggestServerDownUntil = 0;
+        this.suggestRequest = 0;  // Latest keystroke; slower responses for earlier ones are dropped
         this.init();
     }
 
@@ -25,6 +194,7 @@ class ConferenceApp {
         try {
             const response = await fetch('data/faq.json');
             this.faq = await response.json();
+            this.prepareFAQ();
             console.log(`Loaded ${this.faq.length} FAQ entries`);
         } catch (error) {
             console.error('Error loading FAQ:', error);
@@ -32,6 +202,39 @@ class ConferenceApp {
         }
     }
 
+    prepareFAQ() {
+        // Normalize once here; searchFAQ compares normalized text only
+        for (const faqItem of this.faq) {
+            faqItem.normalizedKeywords = faqItem.keywords.map(k => normalizeQuery(k, 'any')).filter(k => k);
+            faqItem.normalizedPrefix = normalizeQuery(faqItem.question, 'any').substring(0, 20);
+        }
+    }
+
+    async applyDataUpdate(patch, version) {
+        // The service worker found a new data release: patch what is loaded, or reload it if there is no patch
+        try {
+            if (!patch) throw new Error('No patch for this release');
+            if (patch['conference.json']) this.data = applyJsonPatch(this.data, patch['conference.json']);
+            if (patch['faq.json']) {
+                this.faq = applyJsonPatch(this.faq, patch['faq.json']);
+                this.prepareFAQ();
+            }
+        } catch (error) {
+            await this.loadData();
+            await this.loadFAQ();
+        }
+        this.suggestIndex = null;
+        this.photos = null;
+        this.updateRoomFilter();
+        if (!this.data.rooms.some(room => room.id === this.currentRoom)) this.currentRoom = 'all';
+        document.getElementById('room-filter').value = this.currentRoom;
+        this.renderSchedule();
+        if (document.getElementById('my-schedule-tab').classList.contains('active')) {
+            this.renderMySchedule();
+        }
+        console.log(`Updated to data release ${version}`);
+    }
+
     loadApiUsage() {
         const stored = localStorage.getItem('apiUsageCount');
         return stored ? JSON.parse(stored) : { spent: 0.0, date: new Date().toDateString() };
@@ -106,6 +309,7 @@ class ConferenceApp {
         document.getElementById('chat-input').addEventListener('keypress', (e) => {
             if (e.key === 'Enter') this.sendChatMessage();
         });
+        document.getElementById('chat-input').addEventListener('input', (e) => this.updateSuggestions(e.target.value));
         
         // Modal close
         document.querySelector('.modal-close').addEventListener('click', () => {
@@ -362,9 +566,29 @@ class ConferenceApp {
         }, 100);
     }
 
-    showSpeakerDetail(speakerName) {
+    async loadPhotos() {
+        if (this.photos) return;
+        try {
+            const response = await fetch('data/photos.json');
+            this.photos = response.ok ? await response.json() : { speakers: {} };
+        } catch (error) {
+            this.photos = { speakers: {} };
+        }
+    }
+
+    speakerPhotoHtml(speaker) {
+        // Only local photos (photos.py); remote ones would be a third-party request per speaker
+        if (!speaker.photo || /^https?:/.test(speaker.photo)) return '';
+        const entry = this.photos && this.photos.speakers[speaker.id];
+        const sources = entry ? Object.entries(entry.sources)
+            .map(([type, srcset]) => `<source type="${type}" srcset="${srcset}" sizes="96px">`).join('') : '';
+        return `<picture class="speaker-photo">${sources}<img src="${speaker.photo}" alt="${speaker.name}" width="96" height="96" decoding="async"></picture>`;
+    }
+
+    async showSpeakerDetail(speakerName) {
         const speaker = this.data.speakers.find(s => s.name === speakerName);
         if (!speaker) return;
+        await this.loadPhotos();
 
         const modal = document.getElementById('session-modal');
         const detail = document.getElementById('session-detail');
@@ -377,6 +601,7 @@ class ConferenceApp {
         }).join('');
 
         detail.innerHTML = `
+            ${this.speakerPhotoHtml(speaker)}
             <h2>${speaker.name}</h2>
             ${speaker.title ? `<p style="font-style: italic; color: #666;">${speaker.title}</p>` : ''}
 
@@ -529,6 +754,7 @@ class ConferenceApp {
         // Add user message
         this.addChatMessage(message, 'user');
         input.value = '';
+        this.renderSuggestions([]);
         
         // Disable send button
         const sendBtn = document.getElementById('chat-send');
@@ -548,6 +774,57 @@ class ConferenceApp {
         sendBtn.textContent = 'Send';
     }
     
+    async fetchSuggestions(query) {
+        if (Date.now() >= this.suggestServerDownUntil) {
+            try {
+                const response = await fetch(`api/suggest?q=${encodeURIComponent(query)}`);
+                if (response.ok) return (await response.json()).suggestions;
+            } catch (error) {
+                // Offline or no backend: fall through to the local index
+            }
+            this.suggestServerDownUntil = Date.now() + SUGGEST_RETRY_MS;
+        }
+        if (!this.suggestIndex) {
+            const response = await fetch('data/suggest.json');
+            this.suggestIndex = new SuggestIndex(await response.json());
+        }
+        return this.suggestIndex.lookup(query);
+    }
+
+    async updateSuggestions(query) {
+        const request = ++this.suggestRequest;
+        let suggestions = [];
+        if (query.trim().length >= SUGGEST_MIN_QUERY_CHARS) {
+            try {
+                suggestions = await this.fetchSuggestions(query);
+            } catch (error) {
+                console.error('Autocomplete unavailable:', error);
+            }
+        }
+        if (request === this.suggestRequest) this.renderSuggestions(suggestions);
+    }
+
+    renderSuggestions(suggestions) {
+        const container = document.getElementById('chat-suggestions');
+        container.innerHTML = '';
+        container.hidden = suggestions.length === 0;
+        suggestions.forEach(suggestion => {
+            const button = document.createElement('button');
+            button.type = 'button';
+            button.className = `chat-suggestion ${suggestion.kind}`;
+            button.textContent = suggestion.ask;
+            button.title = suggestion.text;
+            button.addEventListener('click', () => {
+                const input = document.getElementById('chat-input');
+                input.value = suggestion.ask;
+                this.suggestRequest++;
+                this.renderSuggestions([]);
+                input.focus();
+            });
+            container.appendChild(button);
+        });
+    }
+
     // Simple fuzzy match - calculates similarity between two strings
     fuzzyMatch(str1, str2) {
         const s1 = str1.toLowerCase();
@@ -578,6 +855,7 @@ class ConferenceApp {
         if (!this.faq || this.faq.length === 0) return null;
 
         const messageLower = message.toLowerCase();
+        const messageNormalized = normalizeQuery(message, this.detectLanguage(message));
         let bestMatches = [];
         let fuzzyMatches = [];
 
@@ -604,15 +882,15 @@ class ConferenceApp {
         for (const faqItem of this.faq) {
             let score = 0;
 
-            // Check if any keywords match exactly
-            for (const keyword of faqItem.keywords) {
-                if (messageLower.includes(keyword.toLowerCase())) {
+            // Check if any keywords match (times, case and diacritics normalized)
+            for (const keyword of faqItem.normalizedKeywords) {
+                if (messageNormalized.includes(keyword)) {
                     score += 10;
                 }
             }
 
             // Check if question is similar
-            if (messageLower.includes(faqItem.question.toLowerCase().substring(0, 20))) {
+            if (faqItem.normalizedPrefix && messageNormalized.includes(faqItem.normalizedPrefix)) {
                 score += 20;
             }
 
@@ -762,6 +1040,7 @@ class ConferenceApp {
             } else if (faqAnswer) {
                 console.log('✅ Answered from FAQ (no API call)');
                 this.lastFaqAnswer = faqAnswer;  // Store for context
+                this.localTurn = { question: message, answer: faqAnswer };
                 return faqAnswer;
             }
 
@@ -785,32 +1064,24 @@ class ConferenceApp {
             // STEP 3: Use Claude API for complex questions
             console.log('Using Claude API for complex question...');
 
-            // Detect language and prepare context
+            // Detect language; the server adds the schedule context and earlier turns
             const language = this.detectLanguage(message);
             console.log('Detected language:', language);
-            const conferenceContext = this.buildConferenceContext(language);
-
-            // Add conversation history context
-            let contextPrompt = conferenceContext;
-            if (this.lastFaqAnswer) {
-                contextPrompt += `\n\nPrevious answer given to user: ${this.lastFaqAnswer}`;
-            }
-
-            // Prepare the full prompt
-            const fullPrompt = `${contextPrompt}\n\nConference attendee question: ${message}`;
 
             // Call our backend proxy
-            const response = await fetch('/api/chat', {
+            const response = await fetch('api/chat', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
                 },
                 body: JSON.stringify({
                     message: message,
-                    prompt: fullPrompt,
-                    language: language
+                    language: language,
+                    session_id: this.chatSessionId,
+                    local_turn: this.localTurn
                 })
             });
+            this.localTurn = null;
 
             console.log('Backend response status:', response.status);
 
@@ -828,13 +1099,17 @@ class ConferenceApp {
 
             const data = await response.json();
             console.log('API response received successfully');
+            if (data.session_id) {
+                this.chatSessionId = data.session_id;
+            }
 
             // Track spending after successful API call
-            const cost = data.cost || 0.02;  // Backend sends cost, fallback to estimate
+            const cost = typeof data.cost === 'number' ? data.cost : 0.02;  // Backend sends cost (0 for cached/degraded), fallback to estimate
             this.incrementApiUsage(cost);
             console.log(`💰 This call cost: $${cost.toFixed(4)}, Total spent today: $${this.apiUsageCount.spent.toFixed(4)}`);
 
-            return data.content[0].text;
+            // Compact reply has `answer`; the ?debug=1 passthrough has the raw upstream content
+            return data.answer !== undefined ? data.answer : data.content[0].text;
 
         } catch (error) {
             console.error('Chatbot error:', error);
@@ -884,6 +1159,7 @@ class ConferenceApp {
         return 'en';
     }
     
+    // Chat prompts are built on the server now (prompts.py mirrors this); langid.py still trains on these instructions
     buildConferenceContext(language = 'en') {
         // Build complete session information with descriptions
         const sessionsInfo = this.data.sessions
@@ -1105,8 +1381,13 @@ document.addEventListener('DOMContentLoaded', () => {
 // Service Worker registration for PWA
 if ('serviceWorker' in navigator) {
     window.addEventListener('load', () => {
-        navigator.serviceWorker.register('sw.js')
+        navigator.serviceWorker.register('sw.js', { updateViaCache: 'none' })  // Also re-checks precache-manifest.js
             .then(reg => console.log('Service Worker registered'))
             .catch(err => console.log('Service Worker registration failed'));
     });
+    navigator.serviceWorker.addEventListener('message', event => {
+        if (app && event.data && event.data.type === 'data-updated') {
+            app.applyDataUpdate(event.data.patch, event.data.version);
+        }
+    });
 }
@@ -0,0 +1,710 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the server's hot paths
+Usage: python benchmark.py [name ...]   (runs everything by default)
+"""
+
+import json
+import sys
+import time
+from collections import Counter
+
+BENCHMARKS = {}
+
+
+def benchmark(fn):
+    BENCHMARKS[fn.__name__.replace('bench_', '')] = fn
+    return fn
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def timed(fn, repeat):
+    """Mean seconds per call over `repeat` calls"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+@benchmark
+def bench_routing():
+    """Tier routing accuracy against data/routing_labels.json and cost per decision"""
+    from faq_search import load_faq
+    from router import QuestionRouter
+
+    router = QuestionRouter(load_json('data/conference.json'), load_faq('data/faq.json'))
+    labels = load_json('data/routing_labels.json')
+
+    confusion = Counter()
+    for item in labels:
+        tier, _ = router.route(item['question'], item['language'])
+        confusion[(item['tier'], tier)] += 1
+        if tier != item['tier']:
+            print(f"  miss: {item['question']!r} labelled {item['tier']}, routed {tier}")
+
+    correct = sum(n for (expected, got), n in confusion.items() if expected == got)
+    print(f"  accuracy: {correct}/{len(labels)} ({correct / len(labels):.0%})")
+    for (expected, got), n in sorted(confusion.items()):
+        print(f"  labelled {expected:<8} -> routed {got:<8} {n}")
+
+    per_call = timed(lambda: [router.route(i['question'], i['language']) for i in labels], 20) / len(labels)
+    print(f"  {per_call * 1e6:.0f} µs per routing decision")
+
+
+@benchmark
+def bench_normalize():
+    """Query normalization throughput and FAQ hit rate on time/diacritic variants"""
+    from faq_search import FAQ_MIN_SCORE, load_faq, search_faq
+    from normalize import normalize
+
+    queries = [item['question'] for item in load_json('data/routing_labels.json')] + [
+        "Which sessions start at 1:45 PM?", "Welche Sessions beginnen um 13.45 Uhr?",
+        "Které přednášky začínají ve 13:45?", "What are my options at 9:15am?", "Sessions at 10.30?"
+    ]
+    per_call = timed(lambda: [normalize(q) for q in queries], 200) / len(queries)
+    print(f"  {per_call * 1e6:.1f} µs per query, {60 / per_call / 1e6:.1f}M queries per minute")
+
+    faq = load_faq('data/faq.json')
+    variants = queries[-5:]
+    hits = sum(1 for q in variants if search_faq(faq, q, FAQ_MIN_SCORE)[0])
+    print(f"  FAQ hits on time variants: {hits}/{len(variants)}")
+
+
+SHORT_ENGLISH = ['when is lunch', 'lunch?', 'coffee', 'wifi?', 'dinner?', 'badge', 'hi', 'agenda', 'feedback',
+                 'is there coffee', 'where is Menuett', 'keynote']
+# Sentence-length German and Czech questions must override the English default
+LONG_QUESTIONS = [
+    ("Welche Fabric Sessions empfiehlst du am Nachmittag und warum?", 'de'),
+    ("Gibt es am Vormittag einen Vortrag über Power BI für Einsteiger?", 'de'),
+    ("Welche Sessions über Datenbanken und Performance gibt es nach dem Mittagessen?", 'de'),
+    ("Wann beginnt die Keynote und in welchem Raum findet sie statt?", 'de'),
+    ("Které přednášky o Fabric doporučuješ odpoledne a proč?", 'cs'),
+    ("Je dopoledne nějaká přednáška o Power BI pro začátečníky?", 'cs'),
+    ("Kdy začíná keynote a ve které místnosti se koná?", 'cs'),
+    ("Ktere prednasky o databazich a vykonu jsou po obede?", 'cs'),
+]
+
+
+@benchmark
+def bench_langid():
+    """N-gram language ID vs the app.js regex on labelled questions, and cost per call"""
+    from langid import LanguageIdentifier
+    from normalize import detect_language
+
+    identifier = LanguageIdentifier.load()
+    labels = load_json('data/routing_labels.json')
+    # Short questions from a browser that says English must stay English
+    labels += [{'question': q, 'language': 'en'} for q in SHORT_ENGLISH]
+    labels += [{'question': q, 'language': language} for q, language in LONG_QUESTIONS]
+    ngram = sum(1 for item in labels if identifier.detect(item['question']) == item['language'])
+    regex = sum(1 for item in labels if detect_language(item['question']) == item['language'])
+    print(f"  n-gram model: {ngram}/{len(labels)}, app.js regex: {regex}/{len(labels)}")
+    wrong = [item['question'] for item in labels if identifier.detect(item['question']) != item['language']]
+    if wrong:
+        print(f"  misdetected: {', '.join(wrong)}")
+
+    questions = [item['question'] for item in labels]
+    warm = timed(lambda: [identifier.detect(q) for q in questions], 200) / len(questions)
+    cold = timed(lambda: [LanguageIdentifier(identifier.weights).detect(q) for q in questions], 20) / len(questions)
+    print(f"  {warm * 1e6:.1f} µs per question (word cache warm), {cold * 1e6:.1f} µs cold")
+
+
+@benchmark
+def bench_schedule():
+    """Personal schedule planner on the real event and a synthetic 3-day, 20-track event"""
+    from planner import plan_schedule
+    from synthetic import generate_conference
+
+    for name, data in (('conference.json', load_json('data/conference.json')),
+                       ('3 days x 20 tracks', generate_conference(9, seed=7, days=3))):
+        ids = [s['id'] for s in data['sessions'] if s['speakers']]
+        request = {'interests': ['Fabric', 'AI', 'performance'], 'favorites': ids[5:40:7], 'must_attend': ids[2:3]}
+        plan = plan_schedule(data, **request)
+        per_call = timed(lambda: plan_schedule(data, **request), 20)
+        print(f"  {name}: {len(ids)} talks -> {len(plan['sessions'])} planned, "
+              f"score {plan['score']}, {per_call * 1000:.1f} ms per plan")
+
+
+@benchmark
+def bench_similarity():
+    """TF-IDF neighbor table build time on conference.json and synthetic 1k/10k catalogs"""
+    from similarity import build_similarity
+    from synthetic import generate_conference
+
+    for name, data in (('conference.json', load_json('data/conference.json')),
+                       ('1k sessions', generate_conference(25, seed=11)),
+                       ('10k sessions', generate_conference(250, seed=11))):
+        started = time.perf_counter()
+        table = build_similarity(data)
+        print(f"  {name}: {len(table['sessions'])} sessions, {len(table['speakers'])} speakers "
+              f"in {time.perf_counter() - started:.2f} s")
+
+
+@benchmark
+def bench_model():
+    """Slot-based model vs plain dicts on conference.json at 100x: memory, load and dump time"""
+    import gc
+    import os
+    import tempfile
+    import tracemalloc
+    from model import dump_conference, load_conference
+    from synthetic import generate_conference
+
+    data = generate_conference(100)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'conference.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        print(f"  {len(data['sessions'])} sessions, {len(data['speakers'])} speakers, "
+              f"{os.path.getsize(path) / 1e6:.1f} MB")
+        del data
+
+        def dump_dicts(loaded):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(loaded, f, indent=2, ensure_ascii=False)
+
+        for name, load, dump in (('dicts', lambda: load_json(path), dump_dicts),
+                                 ('model', lambda: load_conference(path), lambda event: dump_conference(event, path))):
+            gc.collect()
+            tracemalloc.start()
+            loaded = load()
+            retained, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            load_time = timed(load, 3)
+            dump_time = timed(lambda: dump(loaded), 3)
+            print(f"  {name}: {retained / 1e6:.1f} MB retained ({peak / 1e6:.1f} MB peak), "
+                  f"load {load_time * 1000:.0f} ms, dump {dump_time * 1000:.0f} ms")
+            del loaded
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+@benchmark
+def bench_events():
+    """50 hosted events: memory once all are loaded, load and request latency, LRU under a memory cap"""
+    import contextlib
+    import io
+    import os
+    import random
+    import tempfile
+    import tracemalloc
+    import server
+    from events import EventRegistry
+    from generate_faq import generate_faq
+    from normalize import normalize_keywords
+    from similarity import build_similarity, save_similarity
+    from synthetic import generate_conference
+
+    count = 50
+    rng = random.Random(5)
+    with tempfile.TemporaryDirectory() as tmp:
+        events_dir = os.path.join(tmp, 'events')
+        ids = [f"day-{i:02d}" for i in range(count)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i, event_id in enumerate(ids):
+                data = generate_conference(1 + 0.5 * (i % 3), seed=i)
+                path = os.path.join(events_dir, event_id)
+                os.makedirs(path)
+                with open(os.path.join(path, 'conference.json'), 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                faq = generate_faq(data)
+                for item in faq:
+                    item['keywords'] = normalize_keywords(item['keywords'])
+                with open(os.path.join(path, 'faq.json'), 'w', encoding='utf-8') as f:
+                    json.dump(faq, f, ensure_ascii=False)
+                save_similarity(build_similarity(data), os.path.join(path, 'similarity.json'))
+
+        def registry(max_bytes):
+            return EventRegistry(ids[0], os.path.join(events_dir, ids[0]), events_dir, max_bytes,
+                                 server.language_id.languages, os.path.join(tmp, 'logs', 'faq_misses.jsonl'))
+
+        events = registry(1 << 40)
+        loads = []
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for event_id in ids:
+                started = time.perf_counter()
+                events.get(event_id)
+                loads.append(time.perf_counter() - started)
+        traced, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {count} events loaded: {traced / 1e6:.1f} MB traced, {events.bytes / 1e6:.1f} MB estimated by the registry "
+              f"({traced / count / 1e6:.2f} MB per event)")
+        print(f"  cold load: mean {sum(loads) / count * 1000:.1f} ms, p95 {percentile(loads, 0.95) * 1000:.1f} ms")
+        warm = timed(lambda: events.get(rng.choice(ids)), 20000)
+        print(f"  warm lookup: {warm * 1e6:.2f} µs")
+
+        # Requests through Flask against random events
+        server.events = events
+        client = server.app.test_client()
+        sessions = {event_id: [s['id'] for s in events.get(event_id).conference_data['sessions'] if s['speakers']]
+                    for event_id in ids}
+        latencies = {'similar': [], 'schedule': []}
+        for _ in range(500):
+            event_id = rng.choice(ids)
+            started = time.perf_counter()
+            client.get(f"/e/{event_id}/api/similar?session={rng.choice(sessions[event_id])}")
+            latencies['similar'].append(time.perf_counter() - started)
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                client.post(f"/e/{event_id}/api/schedule", json={'interests': ['AI', 'Fabric']})
+            latencies['schedule'].append(time.perf_counter() - started)
+        for name, values in latencies.items():
+            print(f"  /e/<event>/api/{name}: p50 {percentile(values, 0.5) * 1000:.2f} ms, "
+                  f"p99 {percentile(values, 0.99) * 1000:.2f} ms")
+
+        # Memory cap holding a quarter of the events: uniform traffic mostly misses
+        capped = registry(events.bytes // 4)
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(1000):
+                capped.get(rng.choice(ids))
+        per_request = (time.perf_counter() - started) / 1000
+        stats = capped.snapshot()
+        print(f"  capped at {stats['max_bytes'] / 1e6:.1f} MB: {len(stats['loaded'])} resident, "
+              f"{stats['hits'] / 1000:.0%} hits, {stats['evictions']} evictions, "
+              f"{per_request * 1000:.2f} ms per lookup")
+
+
+
+@benchmark
+def bench_conversation():
+    """Input tokens per turn over a 20-turn chat: browser-built prompts vs server-side history; store memory"""
+    import tracemalloc
+    from conversations import HISTORY_TOKENS, MAX_CONVERSATIONS, MAX_TURNS, ConversationStore, history_messages
+    from prompts import build_conference_context, build_prompt
+    from server import CACHE_READ_PRICE_FACTOR
+    from tokens import TokenEstimator
+
+    data = load_json('data/conference.json')
+    estimator = TokenEstimator()
+    context = build_conference_context(data)
+    answer = 'The session covers ' + 'lakehouse design, semantic models and governance. ' * 12
+    store = ConversationStore()
+    browser_total = server_total = 0
+    for turn in range(1, 21):
+        question = f"Tell me more about the speakers of the session in block {turn}"
+        browser = estimator.estimate_messages([{'role': 'user', 'content': build_prompt(data, question, 'en', answer)}])
+        messages = history_messages(store.turns('bench'), question, HISTORY_TOKENS, estimator)
+        history = estimator.estimate_messages(messages)
+        system = estimator.estimate(context)
+        # From the second turn on, the system prompt is read from the prompt cache
+        billed = history + system * (CACHE_READ_PRICE_FACTOR if turn > 1 else 1)
+        browser_total += browser
+        server_total += billed
+        store.record('bench', question, answer)
+        if turn in (1, 2, 5, 10, 20):
+            print(f"  turn {turn:>2}: browser prompt {browser} tokens; server {system} system + {history} history "
+                  f"({len(messages) // 2} turns kept), billed as {billed:.0f}")
+    print(f"  20 turns billed: browser {browser_total} tokens, server {server_total:.0f} "
+          f"({server_total / browser_total:.0%})")
+
+    tracemalloc.start()
+    full = ConversationStore()
+    for i in range(MAX_CONVERSATIONS + 500):
+        for turn in range(MAX_TURNS):
+            full.record(f"session-{i:012d}", f"Question {turn} about session {i}", answer)
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = full.snapshot()
+    print(f"  {MAX_CONVERSATIONS + 500} conversations x {MAX_TURNS} turns: {len(full)} kept, "
+          f"{stats['chars'] / 1e6:.1f}M of {stats['max_chars'] / 1e6:.1f}M chars, {traced / 1e6:.1f} MB traced, "
+          f"{stats['evicted']} evicted")
+
+@benchmark
+def bench_faq_batch():
+    """100 questions: one /api/faq/batch call vs 100 single-question calls, and batch vs per-question scoring"""
+    import contextlib
+    import io
+    import random
+    import server
+    from faq_search import load_faq, score_faq, score_faq_batch
+
+    rng = random.Random(3)
+    labels = load_json('data/routing_labels.json')
+    faq = load_faq('data/faq.json')
+    questions = [rng.choice(labels)['question'] for _ in range(50)] + [rng.choice(faq)['question'] for _ in range(50)]
+
+    single = timed(lambda: [score_faq(faq, q) for q in questions], 20)
+    batch = timed(lambda: score_faq_batch(faq, questions), 20)
+    print(f"  scoring: {single * 1000:.1f} ms one by one, {batch * 1000:.1f} ms batched ({single / batch:.1f}x)")
+
+    client = server.app.test_client()
+    with contextlib.redirect_stdout(io.StringIO()):
+        client.post('/api/faq/batch', json={'questions': questions[:1]})  # Load the event
+        one_by_one = timed(lambda: [client.post('/api/faq/batch', json={'questions': [q]}) for q in questions], 5)
+        batched = timed(lambda: client.post('/api/faq/batch', json={'questions': questions}), 5)
+        tiers = Counter(r['tier'] for r in client.post('/api/faq/batch', json={'questions': questions}).get_json()['results'])
+    print(f"  /api/faq/batch: {one_by_one * 1000:.1f} ms for 100 single-question calls, {batched * 1000:.1f} ms for one "
+          f"batch ({len(questions) / batched:.0f} questions/s); tiers {dict(tiers)}")
+
+STARTUP_WORKER = """
+import json, os, sys, time
+started = time.perf_counter()
+from events import EventAccount, EventData
+imported = time.perf_counter()
+event = EventData('bench', sys.argv[1], EventAccount('bench', 1, 1.0), ('en',), os.path.join(sys.argv[1], 'faq_misses.jsonl'))
+loaded = time.perf_counter()
+event.router.route('Which sessions are about Fabric and AI?')
+queried = time.perf_counter()
+print(json.dumps({'import': imported - started, 'load': loaded - imported, 'query': queried - loaded,
+                  'mapped': event.index is not None}), flush=True)
+sys.stdin.readline()
+"""
+
+
+def process_memory(pid):
+    """{'Rss', 'Pss', ...} in kB from /proc/<pid>/smaps_rollup (Pss splits shared pages between processes)"""
+    with open(f"/proc/{pid}/smaps_rollup", 'r') as f:
+        return {line.split(':')[0]: int(line.split()[1]) for line in f if line.split()[-1] == 'kB'}
+
+
+@benchmark
+def bench_startup():
+    """Cold start and per-worker memory: indexes built from JSON at boot vs the mapped search.idx, at 1x and 100x"""
+    import contextlib
+    import io
+    import os
+    import shutil
+    import subprocess
+    import tempfile
+    from binindex import build_index, index_path
+    from generate_faq import generate_faq
+    from normalize import normalize_keywords
+    from similarity import build_similarity, save_similarity
+    from synthetic import generate_conference
+
+    workers = 4
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in (1, 100):
+            json_dir = os.path.join(tmp, f"json-{factor}")
+            os.makedirs(json_dir)
+            if factor == 1:
+                for name in ('conference.json', 'faq.json', 'similarity.json'):
+                    shutil.copy(os.path.join('data', name), json_dir)
+            else:
+                data = generate_conference(factor, seed=factor)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    faq = generate_faq(data)
+                for item in faq:
+                    item['keywords'] = normalize_keywords(item['keywords'])
+                with open(os.path.join(json_dir, 'conference.json'), 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                with open(os.path.join(json_dir, 'faq.json'), 'w', encoding='utf-8') as f:
+                    json.dump(faq, f, ensure_ascii=False)
+                save_similarity(build_similarity(data), os.path.join(json_dir, 'similarity.json'))
+            mapped_dir = shutil.copytree(json_dir, os.path.join(tmp, f"mapped-{factor}"))
+            build_index(mapped_dir)
+            print(f"  {factor}x: faq.json {os.path.getsize(os.path.join(json_dir, 'faq.json')) / 1e6:.1f} MB, "
+                  f"conference.json {os.path.getsize(os.path.join(json_dir, 'conference.json')) / 1e6:.1f} MB, "
+                  f"search.idx {os.path.getsize(index_path(mapped_dir)) / 1e6:.1f} MB")
+
+            for name, data_dir in (('json', json_dir), ('mapped', mapped_dir)):
+                # Several workers up at once, as under gunicorn: mapped pages are shared between them
+                processes = [subprocess.Popen([sys.executable, '-c', STARTUP_WORKER, data_dir], stdin=subprocess.PIPE,
+                                              stdout=subprocess.PIPE, text=True) for _ in range(workers)]
+                timings = [json.loads(p.stdout.readline()) for p in processes]
+                memory = [process_memory(p.pid) for p in processes]
+                for p in processes:
+                    p.communicate('\n')
+                assert all(t['mapped'] == (name == 'mapped') for t in timings)
+                mean = {key: sum(t[key] for t in timings) / workers for key in ('load', 'query')}
+                print(f"    {name:<6} load {mean['load'] * 1000:6.1f} ms, first query {mean['query'] * 1000:6.1f} ms, "
+                      f"per worker: RSS {sum(m['Rss'] for m in memory) / workers / 1024:5.1f} MB, "
+                      f"PSS {sum(m['Pss'] for m in memory) / workers / 1024:5.1f} MB ({workers} workers)")
+
+
+@benchmark
+def bench_suggest():
+    """Per-keystroke /api/suggest lookup time while typing names and titles (some misspelled), at 1x and 100x"""
+    import contextlib
+    import io
+    import random
+    import server
+    from generate_faq import generate_faq
+    from suggest import SuggestIndex
+    from synthetic import generate_conference
+
+    rng = random.Random(5)
+
+    def misspell(text):
+        i = rng.randrange(1, len(text) - 1)
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+
+    for factor in (1, 100):
+        if factor == 1:
+            data, faq = load_json('data/conference.json'), load_json('data/faq.json')
+        else:
+            data = generate_conference(factor, seed=factor)
+            with contextlib.redirect_stdout(io.StringIO()):
+                faq = generate_faq(data)
+        started = time.perf_counter()
+        index = SuggestIndex.build(data, faq)
+        build = time.perf_counter() - started
+        targets = [s['name'] for s in rng.sample(data['speakers'], 20)]
+        targets += [s['title'][:30] for s in rng.sample([s for s in data['sessions'] if s['speakers']], 20)]
+        targets = [misspell(t) if i % 4 == 0 else t for i, t in enumerate(targets)]
+        times = []
+        for target in targets:
+            for end in range(2, len(target) + 1):
+                started = time.perf_counter()
+                index.lookup(target[:end])
+                times.append(time.perf_counter() - started)
+        size = len(json.dumps(index.to_dict(), ensure_ascii=False, separators=(',', ':')).encode())
+        print(f"  {factor:>3}x: {len(index.items)} items, built in {build * 1000:.0f} ms, {size / 1024:.0f} KB exported; "
+              f"{len(times)} keystrokes p50 {percentile(times, 0.5) * 1e6:.0f} µs, "
+              f"p99 {percentile(times, 0.99) * 1e6:.0f} µs, max {max(times) * 1e6:.0f} µs")
+
+    client = server.app.test_client()
+    with contextlib.redirect_stdout(io.StringIO()):
+        client.get('/api/suggest?q=hu')  # Load the event and build its index
+        request = timed(lambda: client.get('/api/suggest?q=hugo%20ko'), 200)
+    print(f"  GET /api/suggest (test client, 1x): {request * 1000:.2f} ms per request")
+
+
+@benchmark
+def bench_search():
+    """Full-text search: index build and query latency (words, phrases, deep pages) at 1x and a 100k-talk catalog"""
+    import random
+    from search import SearchIndex, documents
+    from synthetic import generate_conference
+
+    rng = random.Random(9)
+    for name, data in (('1x', load_json('data/conference.json')), ('100k', generate_conference(2500, seed=11))):
+        docs = documents(data)
+        started = time.perf_counter()
+        index = SearchIndex(docs)
+        build = time.perf_counter() - started
+        stats = index.stats()
+        print(f"  {name}: {stats['documents']} documents, {stats['terms']} terms, {stats['postings']} postings, "
+              f"built in {build:.2f} s")
+
+        titles = [t for t in (s['title'].split() for s in data['sessions'] if s['speakers']) if len(t) >= 3]
+        titles = rng.sample(titles, 30)
+        queries = {
+            'one word': [rng.choice(t) for t in titles],
+            'three words': [' '.join(rng.sample(t, 3)) for t in titles],
+            'phrase': [f'"{" ".join(t[i:i + 2])}"' for t in titles for i in [rng.randrange(len(t) - 1)]],
+            'cs': ['přednášky o Fabricu', 'kdo mluví o SQL Serveru', 'bezpečnost dat v Power BI'],
+        }
+        for label, texts in queries.items():
+            language = 'cs' if label == 'cs' else 'en'
+            times, totals = [], []
+            for text in texts:
+                started = time.perf_counter()
+                total, _ = index.search(text, language)
+                times.append(time.perf_counter() - started)
+                totals.append(total)
+            print(f"    {label:<12} p50 {percentile(times, 0.5) * 1000:6.2f} ms, p99 {percentile(times, 0.99) * 1000:6.2f} ms"
+                  f" (median {sorted(totals)[len(totals) // 2]} matches)")
+        page = timed(lambda: index.search(' '.join(titles[0][:2]), offset=490, limit=10), 5)
+        print(f"    page 50      {page * 1000:6.2f} ms")
+
+
+@benchmark
+def bench_releases():
+    """Bytes a returning visitor downloads after a room swap, a cancellation and a FAQ edit: full files vs patch"""
+    import contextlib
+    import copy
+    import gzip
+    import io
+    import os
+    import shutil
+    import tempfile
+    from generate_faq import assemble_faq
+    from json_patch import apply
+    from releases import make_release, version_info
+
+    def gzipped(value):
+        return len(gzip.compress(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode(), 9))
+
+    def swap_rooms(data):
+        talks = [s for s in data['sessions'] if s['speakers']]
+        a, b = talks[3], talks[-4]
+        for key in ('room', 'room_id'):
+            a[key], b[key] = b[key], a[key]
+
+    def cancel_talk(data):
+        data['sessions'].remove(next(s for s in data['sessions'] if s['speakers']))
+
+    base = load_json('data/conference.json')
+    directory = tempfile.mkdtemp()
+    try:
+        scenarios = [('room swap', swap_rooms), ('cancellation', cancel_talk)]
+        for name, change in scenarios:
+            data = copy.deepcopy(base)
+            with contextlib.redirect_stdout(io.StringIO()):
+                faq = assemble_faq(data)
+            shutil.rmtree(directory)
+            os.makedirs(directory)
+            for file_name, value in (('conference.json', data), ('faq.json', faq)):
+                with open(os.path.join(directory, file_name), 'w', encoding='utf-8') as f:
+                    json.dump(value, f, indent=2, ensure_ascii=False)
+            old = make_release(directory, os.path.join(directory, 'snapshots'))['version']
+            before = {'conference.json': copy.deepcopy(data), 'faq.json': copy.deepcopy(faq)}
+
+            change(data)
+            with contextlib.redirect_stdout(io.StringIO()):
+                faq = assemble_faq(data)
+            for file_name, value in (('conference.json', data), ('faq.json', faq)):
+                with open(os.path.join(directory, file_name), 'w', encoding='utf-8') as f:
+                    json.dump(value, f, indent=2, ensure_ascii=False)
+            started = time.perf_counter()
+            release = make_release(directory, os.path.join(directory, 'snapshots'))
+            elapsed = time.perf_counter() - started
+            info = version_info(release, old)
+            full = sum(gzipped(value) for value in (data, faq))
+            patch = info['patch'] or {}
+            assert all(apply(before[f], ops) == {'conference.json': data, 'faq.json': faq}[f] for f, ops in patch.items())
+            operations = sum(len(ops) for ops in patch.values())
+            print(f"  {name:<13} full {full / 1024:6.1f} KB gzipped, patch {gzipped(info) / 1024:5.1f} KB "
+                  f"({operations} operations on {', '.join(info['changed'])}), released in {elapsed * 1000:.0f} ms")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+@benchmark
+def bench_scaling():
+    """Time and memory curves at 1x, 10x and 100x synthetic events: FAQ generation, prompt, matchers, endpoints"""
+    import contextlib
+    import io
+    import math
+    import os
+    import random
+    import tempfile
+    import tracemalloc
+    import server
+    from events import EventAccount, EventData, EventRegistry
+    from faq_search import load_faq, score_faq
+    from generate_faq import generate_faq
+    from prompts import build_conference_context
+    from router import QuestionRouter
+    from synthetic import generate_conference, write_event
+
+    def traced(fn):
+        """(result, seconds, peak bytes allocated) - timed without tracemalloc, then run again under it"""
+        started = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - started
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result, seconds, peak
+
+    factors = (1, 10, 100)
+    curves = {}  # metric -> {factor: value}
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in factors:
+            rng = random.Random(factor)
+            data = generate_conference(factor, seed=factor)
+            talks = [s for s in data['sessions'] if s['speakers']]
+            questions = ([f"Who is {s['name']}?" for s in rng.sample(data['speakers'], 10)] +
+                         [f"Tell me about {s['title']}" for s in rng.sample(talks, 10)] +
+                         [f"What is on in {r['name']}?" for r in rng.sample(data['rooms'], 5)] +
+                         [f"Which sessions start at {s['start'][11:16]}?" for s in rng.sample(talks, 5)] +
+                         ['Kdy je oběd?', 'Wo ist die Registrierung?', 'Which talks are about Fabric and AI?'])
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, seconds, peak = traced(lambda: generate_faq(data))
+                curves.setdefault('generate_faq (s)', {})[factor] = seconds
+                curves.setdefault('generate_faq peak (MB)', {})[factor] = peak / 1e6
+                _, seconds, _ = traced(lambda: build_conference_context(data, 'en'))
+                curves.setdefault('prompt build (ms)', {})[factor] = seconds * 1000
+                curves.setdefault('prompt tokens (k)', {})[factor] = server.token_estimator.estimate(
+                    build_conference_context(data, 'en')) / 1000
+
+                event_id = f"scale-{factor}x"
+                write_event(data, os.path.join(tmp, event_id), faq=True)
+                faq_path = os.path.join(tmp, event_id, 'faq.json')
+                faq, seconds, peak = traced(lambda: load_faq(faq_path))
+                curves.setdefault('FAQ index build (ms)', {})[factor] = seconds * 1000
+                curves.setdefault('FAQ match (ms/question)', {})[factor] = timed(
+                    lambda: [score_faq(faq, q) for q in questions], 3) / len(questions) * 1000
+                router = QuestionRouter(data, faq)
+                curves.setdefault('route (ms/question)', {})[factor] = timed(
+                    lambda: [router.route(q) for q in questions], 3) / len(questions) * 1000
+
+                miss_log = os.path.join(tmp, 'logs', 'faq_misses.jsonl')
+                _, seconds, peak = traced(lambda: EventData(event_id, os.path.join(tmp, event_id),
+                                                            EventAccount(event_id, 1, 1.0), ('en',), miss_log))
+                curves.setdefault('event load (s)', {})[factor] = seconds
+                curves.setdefault('event load peak (MB)', {})[factor] = peak / 1e6
+                server.events = EventRegistry(event_id, os.path.join(tmp, event_id), tmp, 1 << 40,
+                                              server.language_id.languages, miss_log)
+                client = server.app.test_client()
+                endpoints = {
+                    'POST /api/faq/batch': lambda: client.post('/api/faq/batch', json={'questions': questions}),
+                    'POST /api/schedule': lambda: client.post('/api/schedule', json={'interests': ['Fabric', 'DAX']}),
+                    'GET /api/similar': lambda: client.get(f"/api/similar?session={rng.choice(talks)['id']}"),
+                    'GET /api/suggest': lambda: client.get('/api/suggest?q=Deep%20dive%20into%20po'),
+                    'GET /api/search': lambda: client.get('/api/search?q=%22power%20bi%22%20security&page=2'),
+                }
+                for name, request in endpoints.items():
+                    assert request().status_code == 200, name  # Warm-up builds lazy indexes
+                    curves.setdefault(f"{name} (ms)", {})[factor] = timed(request, 5) * 1000
+            print(f"  {factor:>3}x: {len(talks)} talks, {len(data['speakers'])} speakers, {len(data['rooms'])} rooms, "
+                  f"{len(faq)} FAQ entries")
+
+    # Growth per 10x: 1.0 is linear, 2.0 quadratic
+    print(f"  {'':<28}" + ''.join(f"{f'{f}x':>10}" for f in factors) + f"{'growth':>9}")
+    for metric, values in curves.items():
+        slope = math.log10(values[factors[-1]] / values[factors[0]]) / math.log10(factors[-1] / factors[0]) \
+            if values[factors[0]] > 0 and values[factors[-1]] > 0 else float('nan')
+        print(f"  {metric:<28}" + ''.join(f"{values[f]:>10.2f}" for f in factors) + f"{f'n^{slope:.2f}':>9}")
+
+
+@benchmark
+def bench_ledger():
+    """Budget ledger: request-path cost of record() vs an fsync per call, /api/usage rollups and replay vs ledger size"""
+    import os
+    import tempfile
+    from ledger import BudgetLedger
+
+    def call(ledger, i):
+        ledger.record(f"event-{i % 3}", 'claude-sonnet-4-20250514', 'standard', 3300, 120, 0, 3000, 0.0121, 850.0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'ledger.jsonl')
+        line = '{"ts":"2026-01-23T10:00:00.000+01:00","event":"event-0","cost":0.0121}\n'
+
+        def synchronous():
+            with open(os.path.join(tmp, 'sync.jsonl'), 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        print(f"  append + fsync per call: {timed(synchronous, 200) * 1e6:8.1f} µs")
+
+        for size in (1_000, 10_000, 100_000):
+            ledger = BudgetLedger(path)
+            calls = size - ledger.stats['replayed']
+            started = time.perf_counter()
+            for i in range(calls):
+                call(ledger, i)
+            per_call = (time.perf_counter() - started) / calls
+            ledger.close(timeout=60)
+            usage = timed(lambda: ledger.usage('event-0', hours=24), 1000)
+            started = time.perf_counter()
+            replayed = BudgetLedger(path)
+            replay = time.perf_counter() - started
+            replayed.close()
+            print(f"  {size:>7} records: record() {per_call * 1e6:5.1f} µs, usage() {usage * 1e6:5.1f} µs, "
+                  f"{ledger.stats['batches']} fsyncs, replay {replay * 1000:6.0f} ms "
+                  f"({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (available: {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        print(f"\n== {name} ==")
+        BENCHMARKS[name]()
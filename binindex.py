@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Prebuilt binary search indexes
+The FAQ keyword index and the router's name index are built at build time
+(pipeline.py, generate_faq.py) into <data dir>/search.idx and opened by the
+server with mmap: startup reads one header instead of normalizing every FAQ
+entry, and the pages live in the OS page cache, shared by every worker
+process that maps the same file.
+
+Layout (little-endian):
+    0   8s  magic b'DCAIDX01'
+    8   I   number of sections
+    12  I   reserved
+    16      section table, one (8s name, I offset, I length) per section
+            sections, each starting on an 8-byte boundary
+
+Strings are interned into a UTF-8 'pool' section; string i is
+pool[offsets[i]:offsets[i + 1]]. Every other section is a flat array of
+uint32 (uint64 for 'sources') holding string ids, entry ids or offsets into
+another array; 'sources' holds (size, crc32) of faq.json and conference.json.
+The server only uses an index whose sources still match (a crc32 pass runs
+at about 1 GB/s, far below the cost of parsing the JSON it replaces);
+otherwise it falls back to the JSON files. Rebuilding replaces the file atomically, so running workers keep
+reading the mapping they opened.
+
+Usage:
+    python binindex.py [data_dir ...]    # default: data/
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+INDEX_FILE = 'search.idx'
+MAGIC = b'DCAIDX01'
+HEADER = struct.Struct('<8sII')
+SECTION = struct.Struct('<8sII')
+SOURCES = ('faq.json', 'conference.json')  # Order of the (size, crc32) pairs in the 'sources' section
+TYPECODES = {'sources': 'Q', 'pool': 'B'}  # Every other section holds uint32
+
+
+class IndexWriter:
+    """Collects interned strings and named arrays, then writes them in one file"""
+
+    def __init__(self):
+        self.strings = {}
+        self.sections = {}
+
+    def string(self, text):
+        """Id of a string in the pool (equal strings share one id)"""
+        return self.strings.setdefault(text, len(self.strings))
+
+    def section(self, name, values):
+        self.sections[name] = array(TYPECODES.get(name, 'I'), values)
+
+    def write(self, path):
+        offsets, pool = array('I', [0]), bytearray()
+        for text in self.strings:  # Insertion order is id order
+            pool += text.encode('utf-8')
+            offsets.append(len(pool))
+        sections = dict(self.sections, pool=array('B', pool), offsets=offsets)
+
+        blobs, table = [], []
+        position = HEADER.size + SECTION.size * len(sections)
+        for name, values in sections.items():
+            position += -position % 8
+            if sys.byteorder != 'little':
+                values.byteswap()
+            blob = values.tobytes()
+            table.append(SECTION.pack(name.encode(), position, len(blob)))
+            blobs.append((position, blob))
+            position += len(blob)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(sections), 0))
+            f.write(b''.join(table))
+            for position, blob in blobs:
+                f.write(b'\0' * (position - f.tell()))
+                f.write(blob)
+        os.replace(tmp_path, path)
+
+
+class MappedIndex:
+    """A search.idx opened with mmap; sections are zero-copy views into the mapping"""
+
+    def __init__(self, path):
+        if sys.byteorder != 'little':
+            raise ValueError("mapped indexes need a little-endian machine")
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"not a search index (magic {magic!r})")
+        view = memoryview(self._map)
+        self.sections = {}
+        for i in range(count):
+            name, offset, length = SECTION.unpack_from(self._map, HEADER.size + i * SECTION.size)
+            name = name.rstrip(b'\0').decode()
+            if offset + length > len(self._map):
+                raise ValueError(f"section {name} runs past the end of the file")
+            self.sections[name] = view[offset:offset + length].cast(TYPECODES.get(name, 'I'))
+        self.pool = self.sections['pool']
+        self.offsets = self.sections['offsets']
+
+    def string(self, i):
+        return str(self.pool[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+
+    def strings(self, name):
+        """Decode a section of string ids"""
+        return [self.string(i) for i in self.sections[name]]
+
+
+def index_path(data_dir):
+    return os.path.join(data_dir, INDEX_FILE)
+
+
+def fingerprint(path):
+    """(size, crc32) of a file"""
+    crc = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            crc = zlib.crc32(block, crc)
+    return os.path.getsize(path), crc
+
+
+def open_index(data_dir):
+    """The data directory's MappedIndex, or None if there is none or it does not match the JSON files"""
+    path = index_path(data_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        index = MappedIndex(path)
+        sources = index.sections['sources']
+        for i, name in enumerate(SOURCES):
+            if fingerprint(os.path.join(data_dir, name)) != tuple(sources[2 * i:2 * i + 2]):
+                print(f"⚠️ {path} does not match {name}, building indexes from JSON (run 'python binindex.py {data_dir}')")
+                return None
+        return index
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"⚠️ Could not open {path} ({e}), building indexes from JSON")
+        return None
+
+
+def build_index(data_dir):
+    """Write <data_dir>/search.idx from its faq.json and conference.json"""
+    from faq_search import load_faq, write_faq_index
+    from router import entity_names
+
+    writer = IndexWriter()
+    faq = load_faq(os.path.join(data_dir, 'faq.json'))
+    write_faq_index(writer, faq)
+    with open(os.path.join(data_dir, 'conference.json'), 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    writer.section('names', (writer.string(name) for name in sorted(entity_names(data))))
+    writer.section('sources', (value for name in SOURCES for value in fingerprint(os.path.join(data_dir, name))))
+    writer.write(index_path(data_dir))
+    return writer
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the mmap search index for data directories')
+    parser.add_argument('data_dirs', nargs='*', default=['data'], help='directories with faq.json and conference.json')
+    args = parser.parse_args()
+
+    for data_dir in args.data_dirs:
+        started = time.perf_counter()
+        writer = build_index(data_dir)
+        print(f"✓ {index_path(data_dir)}: {len(writer.strings)} strings, "
+              f"{os.path.getsize(index_path(data_dir)) / 1024:.0f} KB in {(time.perf_counter() - started) * 1000:.0f} ms")
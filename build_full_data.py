@@ -2,9 +2,10 @@
 """
 Parse ALL sessions from Sessionize data
 """
-import json
 import re
 
+from model import Event, dump_conference
+
 # Kompletní seznam všech sessions z konference (z Sessionize API dat)
 COMPLETE_SESSIONS = [
     # 8:00 - Registration
@@ -619,15 +620,13 @@ def create_complete_data():
     }
 
 if __name__ == "__main__":
-    data = create_complete_data()
-    
-    with open('data/conference.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    event = Event.from_dict(create_complete_data())
+    dump_conference(event)
     
-    print(f"✓ Created conference.json with ALL {len(data['sessions'])} sessions!")
-    print(f"✓ {len(data['speakers'])} speakers")
-    print(f"✓ {len(data['rooms'])} rooms")
+    print(f"✓ Created conference.json with ALL {len(event.sessions)} sessions!")
+    print(f"✓ {len(event.speakers)} speakers")
+    print(f"✓ {len(event.rooms)} rooms")
     print(f"\nSession breakdown:")
-    print(f"  - Regular sessions: {len([s for s in data['sessions'] if s['duration'] == 60 and len(s['speakers']) > 0])}")
-    print(f"  - Lightning talks: {len([s for s in data['sessions'] if s['duration'] == 10])}")
-    print(f"  - Breaks/Service: {len([s for s in data['sessions'] if len(s['speakers']) == 0])}")
+    print(f"  - Regular sessions: {len([s for s in event.sessions if s.duration == 60 and s.speakers])}")
+    print(f"  - Lightning talks: {len([s for s in event.sessions if s.duration == 10])}")
+    print(f"  - Breaks/Service: {len([s for s in event.sessions if not s.speakers])}")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Circuit breaker for the upstream Claude API
+Trips on a high error rate or too many slow calls, fails fast while open and
+recovers through a limited number of half-open probe calls
+"""
+
+import threading
+import time
+from collections import deque
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Sliding-window circuit breaker
+
+    Every finished call is recorded as (failed, duration). Once the window
+    holds at least `min_calls` outcomes, the breaker opens when the share of
+    failures reaches `error_rate` or the share of calls slower than
+    `slow_call_seconds` reaches `slow_rate`. After `open_seconds` it lets
+    `half_open_probes` calls through; if they all succeed it closes again,
+    any failure re-opens it.
+    """
+
+    def __init__(self, window=20, min_calls=5, error_rate=0.5, slow_call_seconds=10.0,
+                 slow_rate=0.5, open_seconds=30.0, half_open_probes=1, on_transition=None):
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.on_transition = on_transition
+
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._outcomes = deque(maxlen=window)
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    def _transition(self, new_state):
+        old_state = self.state
+        if old_state == new_state:
+            return
+        self.state = new_state
+        if new_state == OPEN:
+            self.opened_at = time.monotonic()
+        if new_state != CLOSED:
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        if new_state == CLOSED:
+            self._outcomes.clear()
+        if self.on_transition:
+            self.on_transition(old_state, new_state)
+
+    def allow(self):
+        """Return True if a call may go upstream right now"""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.open_seconds:
+                    return False
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_probes:
+                    return False
+                self._probes_in_flight += 1
+            return True
+
+    def cancel(self):
+        """Give back a probe slot for a call that never went upstream"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record(self, success, duration):
+        """Record the outcome of a call that allow() let through"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if not success or duration >= self.slow_call_seconds:
+                    self._transition(OPEN)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self._transition(CLOSED)
+                return
+
+            if self.state == OPEN:
+                return  # Late result from a call started before the breaker opened
+
+            self._outcomes.append((not success, duration >= self.slow_call_seconds))
+            if len(self._outcomes) < self.min_calls:
+                return
+            failures = sum(1 for failed, _ in self._outcomes if failed)
+            slow = sum(1 for _, was_slow in self._outcomes if was_slow)
+            if (failures / len(self._outcomes) >= self.error_rate or
+                    slow / len(self._outcomes) >= self.slow_rate):
+                self._transition(OPEN)
+
+    def snapshot(self):
+        """Current state for the metrics endpoint"""
+        with self._lock:
+            failures = sum(1 for failed, _ in self._outcomes if failed)
+            return {
+                'state': self.state,
+                'window_calls': len(self._outcomes),
+                'window_failures': failures,
+                'open_for_seconds': round(time.monotonic() - self.opened_at, 1) if self.state != CLOSED else 0
+            }
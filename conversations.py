@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Server-side conversation state for chat follow-ups
+The browser used to rebuild the full schedule prompt on every turn and append
+the previous answer, so each follow-up paid for the whole context again plus a
+growing tail. Now the server keeps a short history per session id: the
+schedule goes in the system prompt (marked cacheable, identical for every turn
+and every attendee of an event) and the messages carry only recent turns,
+compacted to a fixed token budget, so input tokens per turn stay flat.
+
+Histories live in an LRU bounded by count and by stored characters, expire
+after a period of inactivity and keep at most MAX_TURNS clipped turns each,
+so memory is bounded however many attendees chat.
+"""
+
+import os
+import re
+import secrets
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from tokens import MESSAGE_OVERHEAD_TOKENS
+
+CONVERSATION_TTL = float(os.environ.get('CONVERSATION_TTL', '1800'))  # Seconds of inactivity before a history is dropped
+MAX_CONVERSATIONS = int(os.environ.get('MAX_CONVERSATIONS', '5000'))  # Per event; least recently used dropped first
+MAX_CONVERSATION_CHARS = int(float(os.environ.get('CONVERSATION_MB', '16')) * 1024 * 1024)  # Stored text per event
+HISTORY_TOKENS = int(os.environ.get('HISTORY_TOKENS', '1500'))  # Past turns plus the new question
+MAX_TURNS = 10          # Turns kept per conversation (older ones could never fit the budget anyway)
+MAX_TURN_CHARS = 2000   # Stored questions/answers are cut to this
+SUMMARY_CHARS = 160     # Turns that no longer fit verbatim are kept as one clipped line each
+
+SESSION_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]{16,64}')
+QUESTION_PREFIX = 'Conference attendee question: '
+SUMMARY_HEADER = 'Earlier in this conversation:'
+
+
+def clip(text, limit):
+    text = ' '.join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + '…'
+
+
+class ConversationStore:
+    """Recent (question, answer) turns per session id, in a TTL + LRU bounded table"""
+
+    def __init__(self, max_conversations=MAX_CONVERSATIONS, ttl_seconds=CONVERSATION_TTL, max_turns=MAX_TURNS,
+                 max_chars=MAX_CONVERSATION_CHARS):
+        self.max_conversations = max_conversations
+        self.ttl_seconds = ttl_seconds
+        self.max_turns = max_turns
+        self.max_chars = max_chars
+        self.chars = 0
+        self._conversations = OrderedDict()  # session id -> (last used, [(question, answer)]), oldest first
+        self._lock = threading.Lock()
+        self.stats = Counter()
+
+    @staticmethod
+    def session_id(requested):
+        """The client's session id if it is well-formed, else a new one"""
+        if isinstance(requested, str) and SESSION_ID_PATTERN.fullmatch(requested):
+            return requested
+        return secrets.token_urlsafe(16)
+
+    @staticmethod
+    def _size(turns):
+        return sum(len(q) + len(a) for q, a in turns)
+
+    def _expire(self, now):
+        while self._conversations:
+            session_id, (last_used, turns) = next(iter(self._conversations.items()))
+            if now - last_used <= self.ttl_seconds:
+                break
+            del self._conversations[session_id]
+            self.chars -= self._size(turns)
+            self.stats['expired'] += 1
+
+    def turns(self, session_id):
+        """The session's turns, oldest first (empty for unknown or expired sessions)"""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._conversations.get(session_id)
+            return list(entry[1]) if entry else []
+
+    def record(self, session_id, question, answer):
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._conversations.pop(session_id, None)
+            turns = entry[1] if entry else []
+            if entry is None:
+                self.stats['started'] += 1
+            self.chars -= self._size(turns)
+            turns.append((clip(question, MAX_TURN_CHARS), clip(answer, MAX_TURN_CHARS)))
+            del turns[:-self.max_turns]
+            self.chars += self._size(turns)
+            self._conversations[session_id] = (now, turns)
+            while len(self._conversations) > 1 and (len(self._conversations) > self.max_conversations
+                                                    or self.chars > self.max_chars):
+                _, (_, dropped) = self._conversations.popitem(last=False)
+                self.chars -= self._size(dropped)
+                self.stats['evicted'] += 1
+
+    def __len__(self):
+        return len(self._conversations)
+
+    def snapshot(self):
+        with self._lock:
+            self._expire(time.monotonic())
+            return {'active': len(self._conversations), 'max': self.max_conversations,
+                    'chars': self.chars, 'max_chars': self.max_chars, **self.stats}
+
+
+def history_messages(turns, question, budget, estimator):
+    """Messages API `messages` for a new question after `turns`, within `budget` estimated tokens
+
+    The newest turns are kept verbatim; older ones become one clipped line
+    each in a summary at the start of the first user message, newest first
+    until the budget runs out. Returns None if the question alone does not fit.
+    """
+    def cost(text):
+        return estimator.estimate(text) + MESSAGE_OVERHEAD_TOKENS
+
+    current = QUESTION_PREFIX + question
+    remaining = budget - cost(current)
+    if remaining < 0:
+        return None
+
+    verbatim = []
+    older = list(turns)
+    while older:
+        q, a = older[-1]
+        needed = cost(QUESTION_PREFIX + q) + cost(a)
+        if needed > remaining:
+            break
+        remaining -= needed
+        verbatim.insert(0, older.pop())
+
+    summary = []
+    remaining -= estimator.estimate(SUMMARY_HEADER + '\n\n')
+    for q, a in reversed(older):
+        line = f"- Q: {clip(q, SUMMARY_CHARS)} A: {clip(a, SUMMARY_CHARS)}"
+        size = estimator.estimate(line + '\n')
+        if size > remaining:
+            break
+        remaining -= size
+        summary.insert(0, line)
+
+    messages = []
+    for q, a in verbatim:
+        messages.append({'role': 'user', 'content': QUESTION_PREFIX + q})
+        messages.append({'role': 'assistant', 'content': a})
+    messages.append({'role': 'user', 'content': current})
+    if summary:
+        messages[0]['content'] = '\n'.join([SUMMARY_HEADER] + summary) + '\n\n' + messages[0]['content']
+    return messages
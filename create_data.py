@@ -2,10 +2,11 @@
 """
 Parse complete Sessionize data and create structured JSON
 """
-import json
 import re
 from datetime import datetime
 
+from model import Event, dump_conference
+
 # Všechna data ze Sessionize Sessions API (z toho, co jsme získali)
 SESSIONS_RAW = """
 Building performance engineering culture: scaling optimization practices in Spark Data Engineering
@@ -197,6 +198,27 @@ def create_full_conference_data():
             "title": "Data Platform Consultant at Axians Business Analytics, Microsoft MVP and MCT",
             "bio": "",
             "photo": "https://sessionize.com/image/3717-200o200o2-KqKqkDXqA9GynTq1BB67VJ.jpg"
+        },
+        {
+            "id": "olivier-van-steenlandt",
+            "name": "Olivier Van Steenlandt",
+            "title": "Expert @ Datashift",
+            "bio": "",
+            "photo": "https://sessionize.com/image/7e20-200o200o2-QuoP9wdmChk3SQDNM1k8pQ.jpg"
+        },
+        {
+            "id": "tomaz-kastrun",
+            "name": "Tomaž Kaštrun",
+            "title": "SQL Server developer and data scientist",
+            "bio": "",
+            "photo": "https://sessionize.com/image/5954-200o200o2-11-bb63-4b2a-9d0b-fc6a1a633191.27a89be4-f000-49a5-99de-45683c3e8289.png"
+        },
+        {
+            "id": "benni-de-jagere",
+            "name": "Benni De Jagere",
+            "title": "No coffee? No insights!",
+            "bio": "",
+            "photo": "https://sessionize.com/image/3241-200o200o2-V3z1RvRorEUwyHm9dx76wS.png"
         }
     ]
     
@@ -223,11 +245,10 @@ def create_full_conference_data():
     }
 
 if __name__ == "__main__":
-    data = create_full_conference_data()
+    event = Event.from_dict(create_full_conference_data())
     
-    with open('data/conference.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    dump_conference(event)
     
-    print(f"✓ Created conference.json with {len(data['sessions'])} sessions")
-    print(f"✓ {len(data['speakers'])} speakers")
-    print(f"✓ {len(data['rooms'])} rooms")
+    print(f"✓ Created conference.json with {len(event.sessions)} sessions")
+    print(f"✓ {len(event.speakers)} speakers")
+    print(f"✓ {len(event.rooms)} rooms")
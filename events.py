@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Multi-event hosting
+One server process serves several community days. The default event lives in
+data/ and answers on /api/...; every other event has its own directory
+(events/<event-id>/ with conference.json, faq.json and optionally
+similarity.json, settings.json and a prebuilt search.idx) and answers on /e/<event-id>/api/....
+
+Event data (conference, FAQ index, router, similarity table, prompt contexts,
+response cache, conversations, autocomplete and search indexes and miss log) is loaded on first use and kept
+in an LRU bounded by approximate memory size. Budgets and metrics are small
+and never evicted, so an event that drops out of memory keeps its daily spend.
+An event whose files change on disk (a new data release) is reloaded on its
+next request, keeping its conversations and miss log.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime
+
+from binindex import INDEX_FILE, open_index
+from conversations import ConversationStore
+from fallback import event_timezone
+from faq_search import load_faq
+from miss_log import MissLog
+from prompts import build_conference_context
+from releases import RELEASE_FILES, RELEASES_FILE, load_releases, unreleased
+from response_cache import ResponseCache
+from router import MODEL_TIERS, QuestionRouter
+from search import SearchIndex
+from similarity import load_similarity
+from suggest import SuggestIndex
+
+DEFAULT_EVENT = os.environ.get('DEFAULT_EVENT', 'dca-2026')
+EVENTS_DIR = os.environ.get('EVENTS_DIR', 'events')
+EVENT_CACHE_BYTES = int(float(os.environ.get('EVENT_CACHE_MB', '256')) * 1024 * 1024)
+RELOAD_CHECK_SECONDS = 2.0  # How often a loaded event looks for changed files
+
+EVENT_ID_PATTERN = re.compile(r'[a-z0-9][a-z0-9-]{0,63}')
+SETTINGS = ('max_daily_requests', 'max_daily_cost')  # Keys allowed in an event's settings.json
+DATA_FILES = ('conference.json', 'faq.json', 'similarity.json')
+# Python objects loaded from JSON (plus the FAQ index and prompt contexts) take about
+# this many bytes per byte of file; `benchmark.py events` compares it with tracemalloc
+MEMORY_PER_FILE_BYTE = 3.0
+
+
+def data_stamp(data_dir):
+    """Modification times of the files EventData is built from (None for missing ones)"""
+    paths = [os.path.join(data_dir, name) for name in DATA_FILES + (INDEX_FILE,)]
+    return tuple(os.path.getmtime(path) if os.path.exists(path) else None for path in paths)
+
+
+class EventAccount:
+    """Per-event daily budget and metrics; stays resident while the event's data comes and goes"""
+
+    def __init__(self, event_id, max_daily_requests, max_daily_cost):
+        self.event_id = event_id
+        self.max_daily_requests = max_daily_requests
+        self.max_daily_cost = max_daily_cost
+        self.lock = threading.Lock()
+        self.usage = self._fresh_usage()
+        self.metrics = {
+            'degraded_responses': Counter(),
+            'cache_hits': 0,
+            'tiers': {tier: Counter() for tier in MODEL_TIERS}
+        }
+
+    @staticmethod
+    def _fresh_usage():
+        return {'today': datetime.now().strftime('%Y-%m-%d'), 'count': 0, 'estimated_cost': 0.0, 'reserved': 0.0}
+
+    def roll_day(self):
+        """Reset the counters when a new day starts (calls in flight keep their reservation)"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        with self.lock:
+            if self.usage['today'] != today:
+                reserved = self.usage['reserved']
+                self.usage = self._fresh_usage()
+                self.usage['reserved'] = reserved
+
+    def snapshot(self):
+        return {
+            'degraded_responses': dict(self.metrics['degraded_responses']),
+            'cache_hits': self.metrics['cache_hits'],
+            'tiers': {tier: dict(counts, cost=round(counts['cost'], 4))
+                      for tier, counts in self.metrics['tiers'].items()}
+        }
+
+
+class EventData:
+    """Everything loaded from an event's data directory"""
+
+    def __init__(self, event_id, data_dir, account, languages, miss_log_path):
+        self.event_id = event_id
+        self.data_dir = data_dir
+        self.account = account
+        self.stamp = data_stamp(data_dir)  # Before reading, so a change during the load is seen later
+        self._checked = time.monotonic()
+        with open(os.path.join(data_dir, 'conference.json'), 'r', encoding='utf-8') as f:
+            self.conference_data = json.load(f)
+        # A prebuilt search.idx is mapped instead of indexing faq.json here
+        self.index = open_index(data_dir)
+        self.faq = load_faq(os.path.join(data_dir, 'faq.json'), self.index)
+        self.router = QuestionRouter(self.conference_data, self.faq,
+                                     self.index.strings('names') if self.index else None)
+        self.similarity_table = load_similarity(self.conference_data, os.path.join(data_dir, 'similarity.json'))
+        self.conference_contexts = {lang: build_conference_context(self.conference_data, lang) for lang in languages}
+        self.response_cache = ResponseCache()
+        self.conversations = ConversationStore()
+        self.miss_log = MissLog(miss_log_path)
+        self._suggest_index = None  # Built on the first /api/suggest call
+        self._suggest_lock = threading.Lock()
+        self._search_index = None  # Built on the first /api/search call
+        self._search_lock = threading.Lock()
+        self._release = (None, None)  # (file mtimes, release record) for /api/data/version
+        self._release_lock = threading.Lock()
+        self.closes_on = self._last_day()
+        # Mapped index pages sit in the shared page cache, not in this process's heap
+        resident = [name for name in DATA_FILES if not (self.index and name == 'faq.json')]
+        self.size = int(MEMORY_PER_FILE_BYTE * sum(os.path.getsize(os.path.join(data_dir, name))
+                                                   for name in resident if os.path.exists(os.path.join(data_dir, name))))
+
+    def _last_day(self):
+        """Local date of the last session end (chat closes after it); the event date if there are no sessions"""
+        tz = event_timezone(self.conference_data)
+        ends = [s['end'] for s in self.conference_data.get('sessions', []) if s.get('end')]
+        if ends:
+            return max(datetime.fromisoformat(end.replace('Z', '+00:00')).astimezone(tz).date() for end in ends)
+        return datetime.fromisoformat(self.conference_data['event']['date']).date()
+
+    def suggest_index(self):
+        with self._suggest_lock:
+            if self._suggest_index is None:
+                self._suggest_index = SuggestIndex.build(self.conference_data, self.faq)
+            return self._suggest_index
+
+    def search_index(self):
+        with self._search_lock:
+            if self._search_index is None:
+                self._search_index = SearchIndex.build(self.conference_data,
+                                                       self.conference_data['event'].get('language', 'en'))
+            return self._search_index
+
+    def release(self):
+        """The data release as clients download it: re-read whenever the files on disk change"""
+        paths = [os.path.join(self.data_dir, name) for name in RELEASE_FILES + (RELEASES_FILE,)]
+        stamp = tuple(os.path.getmtime(path) if os.path.exists(path) else None for path in paths)
+        with self._release_lock:
+            if self._release[0] != stamp:
+                release = load_releases(self.data_dir)
+                # No releases.json (or one older than the data): the version only, no patches
+                current = unreleased(self.data_dir)
+                if release is None or release['version'] != current['version']:
+                    release = current
+                self._release = (stamp, release)
+            return self._release[1]
+
+    def changed(self):
+        """Whether the files on disk differ from the loaded ones (checked at most every RELOAD_CHECK_SECONDS)"""
+        now = time.monotonic()
+        if now - self._checked < RELOAD_CHECK_SECONDS:
+            return False
+        self._checked = now
+        return data_stamp(self.data_dir) != self.stamp
+
+    def is_over(self):
+        return datetime.now(event_timezone(self.conference_data)).date() > self.closes_on
+
+
+class EventRegistry:
+    """Lazily loaded events in a memory-bounded LRU, plus their resident accounts"""
+
+    def __init__(self, default_event=DEFAULT_EVENT, default_dir='data', events_dir=EVENTS_DIR,
+                 max_bytes=EVENT_CACHE_BYTES, languages=('en',), default_miss_log='logs/faq_misses.jsonl',
+                 max_daily_requests=200, max_daily_cost=30.0, ledger=None):
+        self.default_event = default_event
+        self.default_dir = default_dir
+        self.events_dir = events_dir
+        self.max_bytes = max_bytes
+        self.languages = tuple(languages)
+        self.default_miss_log = default_miss_log
+        self.limits = {'max_daily_requests': max_daily_requests, 'max_daily_cost': max_daily_cost}
+        self.ledger = ledger  # BudgetLedger: today's spend so far, for accounts created after a restart
+        self.loaded = OrderedDict()  # event id -> EventData, least recently used first
+        self.accounts = {}
+        self.bytes = 0
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._loading = {}  # event id -> lock held while that event loads
+
+    def data_dir(self, event_id):
+        """Directory of an event, or None for ids that are not hosted here"""
+        if event_id == self.default_event:
+            return self.default_dir
+        if not EVENT_ID_PATTERN.fullmatch(event_id or ''):
+            return None
+        path = os.path.join(self.events_dir, event_id)
+        return path if os.path.isfile(os.path.join(path, 'conference.json')) else None
+
+    def account(self, event_id, data_dir):
+        with self._lock:
+            account = self.accounts.get(event_id)
+            if account is None:
+                limits = dict(self.limits)
+                try:
+                    with open(os.path.join(data_dir, 'settings.json'), 'r', encoding='utf-8') as f:
+                        limits.update((k, v) for k, v in json.load(f).items() if k in SETTINGS)
+                except FileNotFoundError:
+                    pass
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Ignoring settings for event {event_id}: {e}")
+                account = self.accounts[event_id] = EventAccount(event_id, **limits)
+                if self.ledger is not None:
+                    today = self.ledger.day(event_id, account.usage['today'])
+                    account.usage['count'], account.usage['estimated_cost'] = today['requests'], today['cost']
+            return account
+
+    def get(self, event_id=None):
+        """EventData for an event (loading it if needed), or None if the event is not hosted here"""
+        event_id = event_id or self.default_event
+        previous = None
+        with self._lock:
+            event = self.loaded.get(event_id)
+            if event is not None and event.changed():
+                # New data on disk: requests in flight finish with the old copy, this one loads the new files
+                previous = self.loaded.pop(event_id)
+                self.bytes -= previous.size
+                self.stats['reloads'] += 1
+            elif event is not None:
+                self.loaded.move_to_end(event_id)
+                self.stats['hits'] += 1
+                return event
+            loading = self._loading.setdefault(event_id, threading.Lock())
+
+        # One thread loads; concurrent requests for the same event wait for it
+        with loading:
+            with self._lock:
+                event = self.loaded.get(event_id)
+                if event is not None:
+                    self.stats['hits'] += 1
+                    return event
+            data_dir = self.data_dir(event_id)
+            if data_dir is None:
+                with self._lock:
+                    self._loading.pop(event_id, None)
+                if previous is not None:
+                    previous.miss_log.flush()
+                return None
+            started = time.perf_counter()
+            miss_log = (self.default_miss_log if event_id == self.default_event
+                        else os.path.join(os.path.dirname(self.default_miss_log), event_id, 'faq_misses.jsonl'))
+            event = EventData(event_id, data_dir, self.account(event_id, data_dir), self.languages, miss_log)
+            elapsed = time.perf_counter() - started
+            if previous is not None:
+                # Conversations and unanswered questions outlive a data release; cached answers do not
+                event.conversations = previous.conversations
+                event.miss_log = previous.miss_log
+
+            with self._lock:
+                self.loaded[event_id] = event
+                self.bytes += event.size
+                self.stats['loads'] += 1
+                self.stats['load_seconds'] += elapsed
+                evicted = []
+                while self.bytes > self.max_bytes and len(self.loaded) > 1:
+                    old_id, old = self.loaded.popitem(last=False)
+                    self.bytes -= old.size
+                    self.stats['evictions'] += 1
+                    evicted.append(old)
+            for old in evicted:
+                old.miss_log.flush()
+            print(f"📂 {'Reloaded' if previous is not None else 'Loaded'} event {event_id} in {elapsed * 1000:.0f} ms (~{event.size / 1e6:.1f} MB"
+                  f"{f', evicted {len(evicted)}' if evicted else ''})")
+            return event
+
+    def flush(self):
+        """Write every loaded event's miss log (atexit)"""
+        with self._lock:
+            events = list(self.loaded.values())
+        for event in events:
+            event.miss_log.flush()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'loaded': list(self.loaded),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.stats['hits'],
+                'loads': self.stats['loads'],
+                'evictions': self.stats['evictions'],
+                'reloads': self.stats['reloads'],
+                'mean_load_ms': round(self.stats['load_seconds'] / self.stats['loads'] * 1000, 1)
+                if self.stats['loads'] else None
+            }
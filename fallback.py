@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Degraded-mode answers used while the upstream model is unavailable
+Builds replies from the response cache, the FAQ or a schedule template so
+attendees get an instant answer instead of waiting for a timeout
+"""
+
+from datetime import datetime, timezone
+
+from faq_search import search_faq
+from normalize import find_times
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+
+DEGRADED_NOTICE = {
+    'en': "⚠️ The AI assistant is busy right now, so here is a quick answer from the schedule:",
+    'cs': "⚠️ AI asistent je právě vytížený, tady je rychlá odpověď z programu:",
+    'de': "⚠️ Der KI-Assistent ist gerade ausgelastet, hier ist eine schnelle Antwort aus dem Programm:"
+}
+
+SCHEDULE_TEMPLATES = {
+    'en': {'at': "Sessions starting at {time}:", 'now': "Happening now:", 'next': "Coming up at {time}:",
+           'none': "I couldn't find a session for that time. Please check the Schedule tab."},
+    'cs': {'at': "Sessions začínající v {time}:", 'now': "Právě probíhá:", 'next': "Následuje v {time}:",
+           'none': "Pro tento čas jsem nenašel žádnou session. Podívej se prosím do programu."},
+    'de': {'at': "Sessions um {time}:", 'now': "Läuft gerade:", 'next': "Als Nächstes um {time}:",
+           'none': "Ich habe für diese Zeit keine Session gefunden. Bitte schau in den Zeitplan."}
+}
+
+
+def event_timezone(data):
+    """Timezone of the event, falling back to UTC"""
+    name = data.get('event', {}).get('timezone')
+    if ZoneInfo and name:
+        try:
+            return ZoneInfo(name)
+        except Exception:
+            pass
+    return timezone.utc
+
+
+def local_start(session, tz):
+    return datetime.fromisoformat(session['start'].replace('Z', '+00:00')).astimezone(tz)
+
+
+def format_sessions(sessions, tz):
+    return '\n'.join(
+        f"• {local_start(s, tz).strftime('%H:%M')} - {s['title']} ({s['room']})"
+        + (f" by {', '.join(s['speakers'])}" if s['speakers'] else '')
+        for s in sessions
+    )
+
+
+def schedule_answer(data, question, language='en', now=None):
+    """Answer from the schedule: sessions at a mentioned time, else what's on now/next"""
+    templates = SCHEDULE_TEMPLATES.get(language, SCHEDULE_TEMPLATES['en'])
+    tz = event_timezone(data)
+    sessions = sorted(data.get('sessions', []), key=lambda s: s['start'])
+
+    times = find_times(question)
+    if times:
+        time_str = times[0]
+        at_time = [s for s in sessions if local_start(s, tz).strftime('%H:%M') == time_str]
+        if at_time:
+            return f"{templates['at'].format(time=time_str)}\n{format_sessions(at_time, tz)}"
+        return templates['none']
+
+    now = now or datetime.now(tz)
+    running = [s for s in sessions if local_start(s, tz) <= now < datetime.fromisoformat(
+        s['end'].replace('Z', '+00:00')).astimezone(tz)]
+    upcoming = [s for s in sessions if local_start(s, tz) > now]
+
+    parts = []
+    if running:
+        parts.append(f"{templates['now']}\n{format_sessions(running, tz)}")
+    if upcoming:
+        next_start = local_start(upcoming[0], tz)
+        next_block = [s for s in upcoming if local_start(s, tz) == next_start]
+        parts.append(f"{templates['next'].format(time=next_start.strftime('%H:%M'))}\n{format_sessions(next_block, tz)}")
+    if not parts:
+        # Event is over: show the opening block of talks
+        talks = [s for s in sessions if s['speakers']]
+        if not talks:
+            return templates['none']
+        first_block = [s for s in talks if s['start'] == talks[0]['start']]
+        block_time = local_start(talks[0], tz).strftime('%H:%M')
+        parts.append(f"{templates['at'].format(time=block_time)}\n{format_sessions(first_block, tz)}")
+    return '\n\n'.join(parts)
+
+
+def degraded_answer(message, language, cache, faq, data):
+    """Best instant answer: cached model answer, FAQ match, then schedule template
+
+    Returns (answer_text, source).
+    """
+    notice = DEGRADED_NOTICE.get(language, DEGRADED_NOTICE['en'])
+
+    cached = cache.lookup_question(message, language)
+    if cached:
+        return cached, 'cache'
+
+    faq_item, _ = search_faq(faq, message, min_score=10, language=language)
+    if faq_item:
+        return f"{notice}\n\n{faq_item['answer']}", 'faq'
+
+    return f"{notice}\n\n{schedule_answer(data, message, language)}", 'schedule'
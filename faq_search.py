@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Server-side FAQ matching
+Uses the same scoring as searchFAQ in app.js so the server and the browser
+agree on what the FAQ can answer
+"""
+
+import json
+from bisect import bisect_right
+from collections.abc import Sequence
+
+from normalize import normalize, normalize_keywords
+
+FAQ_MIN_SCORE = 15  # app.js only answers from FAQ at this score or higher
+KEYWORD_SCORE = 10  # Per keyword contained in the question
+PREFIX_SCORE = 20   # Question contains the start of the FAQ question
+
+
+class FAQ(list):
+    """FAQ entries that carry their own normalized index (one per loaded FAQ, e.g. per event)"""
+    __slots__ = ('index', 'postings')
+
+    def __init__(self, entries=()):
+        super().__init__(entries)
+        self.index = None
+        self.postings = None
+
+
+class MappedFAQ(Sequence):
+    """FAQ entries and their keyword postings read from a mapped search.idx (binindex.py)
+
+    Scoring checks each distinct keyword once and adds it to the entries in
+    its postings. Only the keywords and question prefixes are decoded (on the
+    first query); questions and answers stay in the mapping until an entry is
+    returned.
+    """
+
+    def __init__(self, index):
+        self.mapped = index
+        self.entries = index.sections['entries']  # question, answer, category, keywords start, end
+        self.keywords = index.sections['keywords']
+        self.postings = index.sections['postings']
+        self.posting_starts = index.sections['postoffs']
+        self.terms = None  # (keywords, prefixes) as str: containment checks on str are several times faster than on bytes
+
+    def __len__(self):
+        return len(self.entries) // 5
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('FAQ entry out of range')
+        question, answer, category, start, end = self.entries[5 * i:5 * i + 5]
+        string = self.mapped.string
+        return {'question': string(question), 'answer': string(answer),
+                'keywords': [string(k) for k in self.keywords[start:end]], 'category': string(category)}
+
+    def keyword_postings(self):
+        """(keywords, entry ids per keyword, question prefixes), decoded on first use"""
+        if self.terms is None:
+            self.terms = (self.mapped.strings('terms'), self.mapped.strings('prefixes'))
+        starts = self.posting_starts
+        return self.terms[0], [self.postings[starts[t]:starts[t + 1]] for t in range(len(starts) - 1)], self.terms[1]
+
+    def matches(self, question_normalized):
+        """(score, entry) for every entry scoring above zero, in FAQ order"""
+        if self.terms is None:
+            self.terms = (self.mapped.strings('terms'), self.mapped.strings('prefixes'))
+        keywords, prefixes = self.terms
+        postings, posting_starts = self.postings, self.posting_starts
+        scores = [0] * len(self)
+        for term, keyword in enumerate(keywords):
+            if keyword in question_normalized:
+                for entry in postings[posting_starts[term]:posting_starts[term + 1]]:
+                    scores[entry] += KEYWORD_SCORE
+        for entry, prefix in enumerate(prefixes):
+            if prefix and prefix in question_normalized:
+                scores[entry] += PREFIX_SCORE
+        return [(score, self[i]) for i, score in enumerate(scores) if score > 0]
+
+
+def load_faq(path='data/faq.json', index=None):
+    """Load FAQ entries (from a mapped search index when one is given), returning an empty list if the file is missing"""
+    if index is not None:
+        return MappedFAQ(index)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return FAQ(json.load(f))
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not load FAQ from {path}: {e}")
+        return FAQ()
+
+
+_index = (None, [])  # (faq list, normalized entries) for the last plain list scored
+
+
+def build_index(faq):
+    return [(normalize_keywords(item['keywords']), normalize(item['question'], 'any')[:20], item) for item in faq]
+
+
+def faq_index(faq):
+    """Normalized keywords and question prefix per entry, built once per FAQ list"""
+    global _index
+    if isinstance(faq, FAQ):
+        if faq.index is None:
+            faq.index = build_index(faq)
+        return faq.index
+    if _index[0] is not faq:
+        _index = (faq, build_index(faq))
+    return _index[1]
+
+
+_postings = (None, None)  # (faq list, keyword postings) for the last plain list batch-scored
+
+
+def keyword_postings(faq):
+    """(distinct keywords, entry ids per keyword, question prefix per entry) for batch scoring
+
+    An entry that lists a keyword twice appears twice in its postings, so it
+    scores twice as in score_faq.
+    """
+    global _postings
+    if isinstance(faq, MappedFAQ):
+        return faq.keyword_postings()
+    if isinstance(faq, FAQ) and faq.postings is not None:
+        return faq.postings
+    if not isinstance(faq, FAQ) and _postings[0] is faq:
+        return _postings[1]
+    by_keyword = {}
+    prefixes = []
+    for i, (keywords, prefix, _) in enumerate(faq_index(faq)):
+        prefixes.append(prefix)
+        for keyword in keywords:
+            by_keyword.setdefault(keyword, []).append(i)
+    postings = (list(by_keyword), list(by_keyword.values()), prefixes)
+    if isinstance(faq, FAQ):
+        faq.postings = postings
+    else:
+        _postings = (faq, postings)
+    return postings
+
+
+def write_faq_index(writer, faq):
+    """Add the FAQ entries, keyword postings and question prefixes to a binindex.IndexWriter"""
+    entries, keywords, prefixes, postings = [], [], [], {}
+    for i, (normalized, prefix, item) in enumerate(build_index(faq)):
+        entries += [writer.string(item['question']), writer.string(item['answer']),
+                    writer.string(item.get('category', '')), len(keywords), len(keywords) + len(normalized)]
+        prefixes.append(writer.string(prefix))
+        for keyword in normalized:
+            term = writer.string(keyword)
+            keywords.append(term)
+            postings.setdefault(term, []).append(i)  # Repeated keywords count twice, as in score_faq
+    starts, flat = [0], []
+    for entry_ids in postings.values():
+        flat += entry_ids
+        starts.append(len(flat))
+    writer.section('entries', entries)
+    writer.section('keywords', keywords)
+    writer.section('terms', postings)
+    writer.section('postoffs', starts)
+    writer.section('postings', flat)
+    writer.section('prefixes', prefixes)
+
+
+def score_faq(faq, question, language=None):
+    """Score every FAQ entry against a question, best first"""
+    question_normalized = normalize(question, language)
+    if isinstance(faq, MappedFAQ):
+        matches = faq.matches(question_normalized)
+        matches.sort(key=lambda m: m[0], reverse=True)
+        return matches
+    matches = []
+
+    for keywords, prefix, faq_item in faq_index(faq):
+        score = 0
+        # Each keyword contained in the question counts
+        for keyword in keywords:
+            if keyword in question_normalized:
+                score += KEYWORD_SCORE
+        # Question starts like the FAQ question
+        if prefix and prefix in question_normalized:
+            score += PREFIX_SCORE
+        if score > 0:
+            matches.append((score, faq_item))
+
+    matches.sort(key=lambda m: m[0], reverse=True)
+    return matches
+
+
+def score_faq_batch(faq, questions, languages=None):
+    """score_faq for many questions in one pass over the FAQ's keywords
+
+    The normalized questions are joined into one text, so a keyword that none
+    of them contains (most of them) is ruled out with a single substring
+    search instead of one per question; hits are mapped back to their
+    question by offset. Returns one best-first match list per question.
+    """
+    languages = languages or [None] * len(questions)
+    normalized = [normalize(question, language) for question, language in zip(questions, languages)]
+    starts, position = [], 0
+    for text in normalized:
+        starts.append(position)
+        position += len(text) + 1
+    text = '\n'.join(normalized)  # Normalized text and keywords never contain a newline
+
+    keywords, postings, prefixes = keyword_postings(faq)
+    scores = [{} for _ in questions]
+
+    def questions_containing(term):
+        found = []
+        position = text.find(term)
+        while position >= 0:
+            q = bisect_right(starts, position) - 1
+            found.append(q)
+            if q + 1 == len(starts):
+                break
+            position = text.find(term, starts[q + 1])
+        return found
+
+    for keyword, entries in zip(keywords, postings):
+        for q in questions_containing(keyword):
+            question_scores = scores[q]
+            for entry in entries:
+                question_scores[entry] = question_scores.get(entry, 0) + KEYWORD_SCORE
+    for entry, prefix in enumerate(prefixes):
+        if prefix:
+            for q in questions_containing(prefix):
+                scores[q][entry] = scores[q].get(entry, 0) + PREFIX_SCORE
+
+    items = faq if isinstance(faq, MappedFAQ) else [item for _, _, item in faq_index(faq)]
+    results = []
+    for question_scores in scores:
+        matches = [(question_scores[entry], items[entry]) for entry in sorted(question_scores)]
+        matches.sort(key=lambda m: m[0], reverse=True)
+        results.append(matches)
+    return results
+
+
+def search_faq(faq, question, min_score=FAQ_MIN_SCORE, language=None):
+    """Return (faq_item, score) for the best match, or (None, best_score)"""
+    matches = score_faq(faq, question, language)
+    if not matches:
+        return None, 0
+    score, faq_item = matches[0]
+    if score < min_score:
+        return None, score
+    return faq_item, score
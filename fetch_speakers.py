@@ -3,78 +3,90 @@
 Fetch speaker bios from Sessionize API and update conference.json
 """
 
-import json
 import requests
 
+from model import dump_conference, load_conference
+
 # Sessionize API endpoint
 SESSIONIZE_API = "https://sessionize.com/api/v2/q7xnnhex/view/All"
 
-print("Fetching data from Sessionize API...")
-response = requests.get(SESSIONIZE_API)
-
-if response.status_code != 200:
-    print(f"Error: Failed to fetch data (status {response.status_code})")
-    exit(1)
-
-sessionize_data = response.json()
-print(f"✓ Fetched data successfully")
-
-# Load current conference.json
-print("\nLoading current conference.json...")
-with open('data/conference.json', 'r', encoding='utf-8') as f:
-    conference_data = json.load(f)
-
-print(f"Current speakers: {len(conference_data['speakers'])}")
-
-# Create mapping of speaker names to sessionize data
-sessionize_speakers = {}
-
-# Find speakers in sessionize data
-if isinstance(sessionize_data, list):
-    for item in sessionize_data:
-        if 'speakers' in item:
-            for speaker in item['speakers']:
-                name = speaker.get('fullName') or speaker.get('name')
-                if name:
-                    sessionize_speakers[name] = speaker
-        if 'sessions' in item:
-            for session in item['sessions']:
-                if 'speakers' in session:
-                    for speaker in session['speakers']:
-                        name = speaker.get('fullName') or speaker.get('name')
-                        if name:
-                            sessionize_speakers[name] = speaker
-
-print(f"Found {len(sessionize_speakers)} speakers in Sessionize data")
-
-# Update bios
-updated_count = 0
-for speaker in conference_data['speakers']:
-    name = speaker['name']
-    if name in sessionize_speakers:
-        sessionize_speaker = sessionize_speakers[name]
-
-        # Update bio if available
-        bio = sessionize_speaker.get('bio') or sessionize_speaker.get('biography') or ""
-        if bio and bio != speaker.get('bio', ''):
-            print(f"\n✓ Updating bio for: {name}")
-            print(f"  Bio length: {len(bio)} characters")
-            speaker['bio'] = bio
-            updated_count += 1
-
-        # Update title if different
-        tagline = sessionize_speaker.get('tagLine') or sessionize_speaker.get('title')
-        if tagline and tagline != speaker.get('title', ''):
-            print(f"  Updating tagline: {tagline}")
-            speaker['title'] = tagline
-
-print(f"\n{'='*60}")
-print(f"Updated {updated_count} speaker bios")
-
-# Save updated conference.json
-print("\nSaving updated conference.json...")
-with open('data/conference.json', 'w', encoding='utf-8') as f:
-    json.dump(conference_data, f, indent=2, ensure_ascii=False)
-
-print("✓ Conference data updated successfully!")
-print("\nNext step: Run 'python generate_faq.py' to regenerate FAQ with bios")
+
+def fetch_sessionize_speakers(url=SESSIONIZE_API):
+    """{speaker name: Sessionize speaker object} from the Sessionize API"""
+    response = requests.get(url, timeout=30)
+    if response.status_code != 200:
+        raise RuntimeError(f"Failed to fetch data (status {response.status_code})")
+    sessionize_data = response.json()
+
+    # Find speakers in sessionize data
+    sessionize_speakers = {}
+    if isinstance(sessionize_data, list):
+        for item in sessionize_data:
+            if 'speakers' in item:
+                for speaker in item['speakers']:
+                    name = speaker.get('fullName') or speaker.get('name')
+                    if name:
+                        sessionize_speakers[name] = speaker
+            if 'sessions' in item:
+                for session in item['sessions']:
+                    if 'speakers' in session:
+                        for speaker in session['speakers']:
+                            name = speaker.get('fullName') or speaker.get('name')
+                            if name:
+                                sessionize_speakers[name] = speaker
+    return sessionize_speakers
+
+
+def apply_sessionize(event, sessionize_speakers, verbose=True):
+    """Copy bios and taglines onto the event's speakers; returns how many bios changed"""
+    updated_count = 0
+    for speaker in event.speakers:
+        name = speaker.name
+        if name in sessionize_speakers:
+            sessionize_speaker = sessionize_speakers[name]
+
+            # Update bio if available
+            bio = sessionize_speaker.get('bio') or sessionize_speaker.get('biography') or ""
+            if bio and bio != speaker.bio:
+                if verbose:
+                    print(f"\n✓ Updating bio for: {name}")
+                    print(f"  Bio length: {len(bio)} characters")
+                speaker.bio = bio
+                updated_count += 1
+
+            # Update title if different
+            tagline = sessionize_speaker.get('tagLine') or sessionize_speaker.get('title')
+            if tagline and tagline != speaker.title:
+                if verbose:
+                    print(f"  Updating tagline: {tagline}")
+                speaker.title = tagline
+    return updated_count
+
+
+if __name__ == '__main__':
+    print("Fetching data from Sessionize API...")
+    try:
+        sessionize_speakers = fetch_sessionize_speakers()
+    except (requests.exceptions.RequestException, RuntimeError, ValueError) as e:
+        print(f"Error: {e}")
+        exit(1)
+    print(f"✓ Fetched data successfully")
+
+    # Load current conference.json
+    print("\nLoading current conference.json...")
+    conference = load_conference()
+
+    print(f"Current speakers: {len(conference.speakers)}")
+    print(f"Found {len(sessionize_speakers)} speakers in Sessionize data")
+
+    updated_count = apply_sessionize(conference, sessionize_speakers)
+
+    print(f"\n{'='*60}")
+    print(f"Updated {updated_count} speaker bios")
+
+    # Save updated conference.json
+    print("\nSaving updated conference.json...")
+    dump_conference(conference)
+
+    print("✓ Conference data updated successfully!")
+    print("\nNext step: Run 'python pipeline.py' (or 'python generate_faq.py') to regenerate FAQ with bios")
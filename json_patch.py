@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+JSON Patch (RFC 6902) between two versions of a JSON document
+`diff` walks both documents and emits add/remove/replace operations for what
+changed: objects key by key, lists by trimming the common head and tail and
+lining up the unchanged items in between, so a room swap is one "replace" of
+a string and a cancelled talk is one "remove" instead of a new copy of the file.
+`apply` is the inverse (jsonpatch.js does the same in the browser).
+"""
+
+import copy
+import json
+from difflib import SequenceMatcher
+
+
+def escape(key):
+    """A JSON Pointer reference token (RFC 6901)"""
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def unescape(token):
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def diff(old, new, path=''):
+    """Operations turning `old` into `new`"""
+    if type(old) is not type(new):
+        return [{'op': 'replace', 'path': path, 'value': new}]
+    if isinstance(old, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': f"{path}/{escape(key)}"})
+            elif old[key] != new[key]:
+                ops.extend(diff(old[key], new[key], f"{path}/{escape(key)}"))
+        for key in new:
+            if key not in old:
+                ops.append({'op': 'add', 'path': f"{path}/{escape(key)}", 'value': new[key]})
+        return ops
+    if isinstance(old, list):
+        return _diff_list(old, new, path)
+    return [] if old == new else [{'op': 'replace', 'path': path, 'value': new}]
+
+
+def _diff_list(old, new, path):
+    head = 0
+    while head < min(len(old), len(new)) and old[head] == new[head]:
+        head += 1
+    tail = 0
+    while tail < min(len(old), len(new)) - head and old[-1 - tail] == new[-1 - tail]:
+        tail += 1
+    removed, added = old[head:len(old) - tail], new[head:len(new) - tail]
+    if len(removed) == len(added):
+        blocks = [('replace', 0, len(removed), 0, len(added))]
+    else:
+        # Items were inserted or removed: line up the unchanged ones so the rest is not diffed off by one
+        blocks = SequenceMatcher(None, [_key(item) for item in removed], [_key(item) for item in added],
+                                 autojunk=False).get_opcodes()
+    ops = []
+    # Blocks from the end backwards, so the indexes of earlier items still hold
+    for tag, i1, i2, j1, j2 in reversed(blocks):
+        if tag == 'equal':
+            continue
+        block = []
+        for k in range(min(i2 - i1, j2 - j1)):
+            block.extend(diff(removed[i1 + k], added[j1 + k], f"{path}/{head + i1 + k}"))
+        for i in reversed(range(i1 + j2 - j1, i2)):
+            block.append({'op': 'remove', 'path': f"{path}/{head + i}"})
+        for j in range(j1 + i2 - i1, j2):
+            block.append({'op': 'add', 'path': f"{path}/{head + i1 + j - j1}", 'value': added[j]})
+        ops.extend(block)
+    return ops
+
+
+def _key(item):
+    return json.dumps(item, sort_keys=True, ensure_ascii=False)
+
+
+def _parent(doc, path):
+    """(container, last reference token) for a JSON Pointer"""
+    if not path.startswith('/'):
+        raise ValueError(f"Invalid JSON Pointer: {path!r}")
+    tokens = [unescape(token) for token in path[1:].split('/')]
+    target = doc
+    for token in tokens[:-1]:
+        target = target[int(token)] if isinstance(target, list) else target[token]
+    return target, tokens[-1]
+
+
+def apply(doc, ops):
+    """`doc` with the operations applied (a new document; `doc` is not modified)"""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        kind, path = op['op'], op['path']
+        if kind not in ('add', 'remove', 'replace', 'test'):
+            raise ValueError(f"Unsupported operation: {kind}")
+        if path == '':
+            if kind == 'test':
+                if doc != op['value']:
+                    raise ValueError('Test failed at the document root')
+                continue
+            doc = None if kind == 'remove' else copy.deepcopy(op['value'])
+            continue
+        try:
+            parent, token = _parent(doc, path)
+            if isinstance(parent, list):
+                if not (token.isdigit() or token == '-' and kind == 'add'):
+                    raise IndexError(token)
+                index = len(parent) if token == '-' and kind == 'add' else int(token)
+                if kind == 'add':
+                    if not 0 <= index <= len(parent):
+                        raise IndexError(index)
+                    parent.insert(index, copy.deepcopy(op['value']))
+                elif kind == 'remove':
+                    del parent[index]
+                elif kind == 'replace':
+                    parent[index] = copy.deepcopy(op['value'])
+                elif parent[index] != op['value']:
+                    raise ValueError(f"Test failed at {path}")
+            else:
+                if kind in ('remove', 'replace', 'test') and token not in parent:
+                    raise KeyError(token)
+                if kind == 'remove':
+                    del parent[token]
+                elif kind == 'test':
+                    if parent[token] != op['value']:
+                        raise ValueError(f"Test failed at {path}")
+                else:
+                    parent[token] = copy.deepcopy(op['value'])
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"Cannot {kind} {path}: {e!r}") from None
+    return doc
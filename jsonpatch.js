@@ -0,0 +1,49 @@
+// === JSON Patch (RFC 6902), mirrors json_patch.apply ===
+// Shared by sw.js (patches its cached data files) and app.js (patches the data in memory).
+
+function applyJsonPatch(doc, ops) {
+    let result = JSON.parse(JSON.stringify(doc));
+    for (const op of ops) {
+        if (!['add', 'remove', 'replace', 'test'].includes(op.op)) {
+            throw new Error(`Unsupported operation: ${op.op}`);
+        }
+        if (op.path === '') {
+            if (op.op === 'test') {
+                if (JSON.stringify(result) !== JSON.stringify(op.value)) throw new Error('Test failed at the document root');
+            } else {
+                result = op.op === 'remove' ? null : JSON.parse(JSON.stringify(op.value));
+            }
+            continue;
+        }
+        if (!op.path.startsWith('/')) throw new Error(`Invalid JSON Pointer: ${op.path}`);
+        const tokens = op.path.slice(1).split('/').map(t => t.replace(/~1/g, '/').replace(/~0/g, '~'));
+        const last = tokens.pop();
+        let parent = result;
+        for (const token of tokens) {
+            parent = Array.isArray(parent) ? parent[parseInt(token, 10)] : parent[token];
+            if (parent === null || typeof parent !== 'object') throw new Error(`Cannot ${op.op} ${op.path}`);
+        }
+        const value = op.value === undefined ? undefined : JSON.parse(JSON.stringify(op.value));
+        if (Array.isArray(parent)) {
+            const append = last === '-' && op.op === 'add';
+            if (!append && !/^\d+$/.test(last)) throw new Error(`Cannot ${op.op} ${op.path}`);
+            const index = append ? parent.length : parseInt(last, 10);
+            if (index > parent.length || (op.op !== 'add' && index >= parent.length)) {
+                throw new Error(`Cannot ${op.op} ${op.path}`);
+            }
+            if (op.op === 'add') parent.splice(index, 0, value);
+            else if (op.op === 'remove') parent.splice(index, 1);
+            else if (op.op === 'replace') parent[index] = value;
+            else if (JSON.stringify(parent[index]) !== JSON.stringify(value)) throw new Error(`Test failed at ${op.path}`);
+        } else {
+            if (op.op !== 'add' && !Object.prototype.hasOwnProperty.call(parent, last)) {
+                throw new Error(`Cannot ${op.op} ${op.path}`);
+            }
+            if (op.op === 'remove') delete parent[last];
+            else if (op.op === 'test') {
+                if (JSON.stringify(parent[last]) !== JSON.stringify(value)) throw new Error(`Test failed at ${op.path}`);
+            } else parent[last] = value;
+        }
+    }
+    return result;
+}
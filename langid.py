@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Character n-gram language identification (en/cs/de)
+A naive Bayes model over hashed character 1-3-grams. The profile is a flat
+int16 array (bucket-major, one log-probability per language) stored in
+data/langid_profile.json, so loading is a single base64 decode and
+classification is table lookups.
+
+Training uses the strings already in the repo: the en/cs/de messages and
+instructions in app.js and the keywords in faq.json (labelled by the first
+model, kept only when confident).
+
+Usage:
+    python langid.py                         # train and write data/langid_profile.json
+    python langid.py "Kdy začíná keynote?"   # classify
+"""
+
+import base64
+import json
+import math
+import re
+import sys
+import zlib
+from array import array
+
+from normalize import fold_diacritics
+
+LANGUAGES = ('en', 'cs', 'de')
+NUM_BUCKETS = 4096
+MAX_N = 3
+SCALE = 1000  # Log-probabilities are stored as int16 in thousandths
+MIN_MARGIN = 0.1  # Per-n-gram score margin for confidently labelled training keywords (x2)
+OVERRIDE_MARGIN = 0.3  # Per-n-gram margin over the caller's default needed to override it at MIN_NGRAMS
+MIN_NGRAMS = 20  # Shorter texts keep the default: single English words ("coffee", "lunch?") often score as German
+PROFILE_PATH = 'data/langid_profile.json'
+
+NON_LETTERS = re.compile(r'[^\w]+|[\d_]+')
+
+
+def char_ngrams(word):
+    """1- to MAX_N-grams of a word padded with spaces, so word edges count"""
+    padded = f" {word} "
+    return [padded[i:i + n] for n in range(1, MAX_N + 1) for i in range(len(padded) - n + 1)
+            if padded[i:i + n] != ' ']
+
+
+def words(text):
+    return NON_LETTERS.sub(' ', text.lower()).split()
+
+
+def bucket(gram):
+    return zlib.crc32(gram.encode('utf-8')) % NUM_BUCKETS
+
+
+class LanguageIdentifier:
+    """Classifies text with an array-backed n-gram profile"""
+
+    def __init__(self, weights, languages=LANGUAGES, min_margin=OVERRIDE_MARGIN, min_ngrams=MIN_NGRAMS,
+                 cache_size=20000):
+        self.weights = weights
+        self.languages = languages
+        self.min_margin = min_margin
+        self.min_ngrams = min_ngrams
+        self.cache_size = cache_size
+        self._word_cache = {}
+
+    @classmethod
+    def load(cls, path=PROFILE_PATH, **kwargs):
+        with open(path, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+        weights = array('h')
+        weights.frombytes(base64.b64decode(profile['weights']))
+        if sys.byteorder != 'little':
+            weights.byteswap()
+        return cls(weights, tuple(profile['languages']), **kwargs)
+
+    def save(self, path=PROFILE_PATH):
+        weights = array('h', self.weights)
+        if sys.byteorder != 'little':
+            weights.byteswap()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'languages': list(self.languages),
+                'buckets': NUM_BUCKETS,
+                'max_n': MAX_N,
+                'scale': SCALE,
+                'weights': base64.b64encode(weights.tobytes()).decode('ascii')
+            }, f, indent=1)
+
+    def _word_scores(self, word):
+        """Summed log-probabilities and n-gram count for one word (cached)"""
+        scores = self._word_cache.get(word)
+        if scores is None:
+            k = len(self.languages)
+            weights = self.weights
+            totals = [0] * k
+            grams = char_ngrams(word)
+            for gram in grams:
+                base = bucket(gram) * k
+                for lang in range(k):
+                    totals[lang] += weights[base + lang]
+            scores = (totals, len(grams))
+            if len(self._word_cache) >= self.cache_size:
+                self._word_cache.clear()
+            self._word_cache[word] = scores
+        return scores
+
+    def scores(self, text):
+        """({language: mean log-probability per n-gram}, n-gram count)"""
+        k = len(self.languages)
+        totals = [0] * k
+        count = 0
+        for word in words(text):
+            word_totals, n = self._word_scores(word)
+            count += n
+            for lang in range(k):
+                totals[lang] += word_totals[lang]
+        if not count:
+            return {}, 0
+        return {lang: totals[i] / count / SCALE for i, lang in enumerate(self.languages)}, count
+
+    def detect(self, text, default='en'):
+        """Most likely language, or `default` unless the text is long enough and clearly another language"""
+        scores, count = self.scores(text)
+        if not scores:
+            return default
+        best = max(scores, key=scores.get)
+        if default not in scores:
+            return best
+        if count < self.min_ngrams:
+            return default
+        # A mean over more n-grams is less noisy: the margin shrinks with 1/sqrt(count)
+        if scores[best] - scores[default] < self.min_margin * math.sqrt(self.min_ngrams / count):
+            return default
+        return best
+
+
+def train(samples, alpha=0.5):
+    """Profile from (text, language) pairs: smoothed per-language bucket log-probabilities"""
+    counts = {lang: [0] * NUM_BUCKETS for lang in LANGUAGES}
+    for text, lang in samples:
+        table = counts[lang]
+        for word in words(text):
+            for gram in char_ngrams(word):
+                table[bucket(gram)] += 1
+
+    weights = array('h', [0] * (NUM_BUCKETS * len(LANGUAGES)))
+    for i, lang in enumerate(LANGUAGES):
+        table = counts[lang]
+        total = sum(table) + alpha * NUM_BUCKETS
+        for b in range(NUM_BUCKETS):
+            log_prob = math.log((table[b] + alpha) / total)
+            weights[b * len(LANGUAGES) + i] = max(-32768, round(log_prob * SCALE))
+    return LanguageIdentifier(weights)
+
+
+def _read_literal(src, i):
+    """Text of the JS string literal starting at src[i]; returns (text, end)"""
+    quote, i, parts = src[i], i + 1, []
+    while src[i] != quote:
+        if src[i] == '\\':
+            parts.append({'n': '\n', 't': ' '}.get(src[i + 1], src[i + 1]))
+            i += 2
+        elif quote == '`' and src.startswith('${', i):
+            i = _skip_block(src, i + 1)  # Interpolation: not part of the language sample
+            parts.append(' ')
+        else:
+            parts.append(src[i])
+            i += 1
+    return ''.join(parts), i + 1
+
+
+def _skip_block(src, i, collect=None):
+    """Index after the {...} block starting at src[i], collecting its string literals"""
+    depth = 0
+    while True:
+        char = src[i]
+        if char in '\'"`':
+            text, i = _read_literal(src, i)
+            if collect is not None:
+                collect.append(text)
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+
+
+def app_js_samples(path='app.js'):
+    """(text, language) pairs from `en:`/`cs:`/`de:` entries in app.js"""
+    with open(path, 'r', encoding='utf-8') as f:
+        src = f.read()
+    samples = []
+    for match in re.finditer(r'\b(en|cs|de):\s*([`\'"{])', src):
+        lang, start = match.group(1), match.start(2)
+        if match.group(2) == '{':
+            texts = []
+            _skip_block(src, start, texts)
+        else:
+            texts = [_read_literal(src, start)[0]]
+        samples.extend((text, lang) for text in texts)
+    return samples
+
+
+def training_samples(app_js='app.js', faq_path='data/faq.json'):
+    """app.js messages (with diacritic-free copies) plus confidently labelled FAQ keywords"""
+    samples = app_js_samples(app_js)
+    samples += [(fold_diacritics(text), lang) for text, lang in samples if lang != 'en']
+
+    seed = train(samples)
+    with open(faq_path, 'r', encoding='utf-8') as f:
+        faq = json.load(f)
+    for item in faq:
+        for keyword in item['keywords']:
+            scores, count = seed.scores(keyword)
+            if count >= 6:
+                ranked = sorted(scores, key=scores.get, reverse=True)
+                if scores[ranked[0]] - scores[ranked[1]] >= 2 * MIN_MARGIN:
+                    samples.append((keyword, ranked[0]))
+    return samples
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        identifier = LanguageIdentifier.load()
+        text = ' '.join(sys.argv[1:])
+        scores, count = identifier.scores(text)
+        print(f"{identifier.detect(text)}  ({count} n-grams: "
+              f"{', '.join(f'{lang} {score:.2f}' for lang, score in scores.items())})")
+        sys.exit(0)
+
+    samples = training_samples()
+    identifier = train(samples)
+    identifier.save()
+    by_language = {lang: sum(1 for _, l in samples if l == lang) for lang in LANGUAGES}
+    print(f"Trained on {len(samples)} strings ({by_language})")
+    print(f"Saved profile to: {PROFILE_PATH}")
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Append-only budget ledger of upstream calls
+Every call to the Claude API (successful or not) becomes one JSON line in
+logs/ledger.jsonl: event, model, tier, tokens, cost, latency and status. The
+request thread only updates in-memory rollups and queues the line; a
+background writer appends queued lines in batches and fsyncs once per batch,
+so disk latency never reaches an attendee's request.
+
+Hourly and daily rollups per event are updated as records arrive (and
+rebuilt from the file on startup), so /api/usage reads a few dict entries
+whatever the size of the ledger, and today's spend survives a restart.
+
+Usage:
+    python ledger.py                    # daily totals per event from logs/ledger.jsonl
+    python ledger.py --hourly --event dca-2026
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from datetime import datetime
+
+LEDGER_PATH = os.environ.get('LEDGER_PATH', 'logs/ledger.jsonl')
+LEDGER_FLUSH_SECONDS = float(os.environ.get('LEDGER_FLUSH_SECONDS', '1.0'))  # Longest a record waits for its fsync
+LEDGER_BATCH = 256  # Records written per batch at most (a full batch is written at once)
+ROLLUP_HOURS = 14 * 24  # Hourly rollups kept per event
+TOTALS = ('requests', 'errors', 'input_tokens', 'output_tokens', 'cache_write_tokens', 'cache_read_tokens',
+          'cost', 'latency_ms')
+
+
+def empty_totals():
+    return dict.fromkeys(TOTALS, 0) | {'tiers': {}}
+
+
+def add_to(totals, entry):
+    ok = entry['status'] == 200
+    totals['requests' if ok else 'errors'] += 1
+    for key in TOTALS[2:]:
+        totals[key] += entry[key]
+    tier = totals['tiers'].setdefault(entry['tier'], {'requests': 0, 'cost': 0})
+    tier['requests'] += ok
+    tier['cost'] += entry['cost']
+
+
+def rounded(totals):
+    """A copy of rollup totals for JSON (costs to 6 decimals, mean latency)"""
+    calls = totals['requests'] + totals['errors']
+    out = {key: totals[key] for key in TOTALS if key not in ('cost', 'latency_ms')}
+    out['cost'] = round(totals['cost'], 6)
+    out['mean_latency_ms'] = round(totals['latency_ms'] / calls, 1) if calls else None
+    out['tiers'] = {tier: {'requests': t['requests'], 'cost': round(t['cost'], 6)} for tier, t in totals['tiers'].items()}
+    return out
+
+
+class BudgetLedger:
+    """Upstream calls appended to a JSONL file by a background writer, with hourly and daily rollups"""
+
+    def __init__(self, path=LEDGER_PATH, flush_seconds=LEDGER_FLUSH_SECONDS, batch=LEDGER_BATCH):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.batch = batch
+        self.hours = {}  # event id -> OrderedDict(hour 'YYYY-MM-DDTHH' -> totals), oldest first
+        self.days = {}   # event id -> {day 'YYYY-MM-DD' -> totals}
+        self.stats = Counter()
+        self._lock = threading.Lock()  # Rollups
+        self._queued = threading.Condition()
+        self._pending = deque()  # JSON lines not yet written
+        self._closed = False
+        self._replay()
+        self._writer = threading.Thread(target=self._write_loop, name='ledger-writer', daemon=True)
+        self._writer.start()
+
+    def _replay(self):
+        """Rebuild the rollups from the file (a torn last line from a crash is skipped)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._add(json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        self.stats['skipped'] += 1
+                        continue
+                    self.stats['replayed'] += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"⚠️ Could not read budget ledger {self.path}: {e}")
+
+    def _add(self, entry):
+        # Timestamps are local time with their offset, so the first 10/13 characters are the local day/hour
+        day, hour = entry['ts'][:10], entry['ts'][:13]
+        with self._lock:
+            hours = self.hours.setdefault(entry['event'], OrderedDict())
+            totals = hours.get(hour)
+            if totals is None:
+                totals = hours[hour] = empty_totals()
+                while len(hours) > ROLLUP_HOURS:
+                    hours.popitem(last=False)
+            add_to(totals, entry)
+            add_to(self.days.setdefault(entry['event'], {}).setdefault(day, empty_totals()), entry)
+
+    def record(self, event_id, model, tier, input_tokens=0, output_tokens=0, cache_write_tokens=0,
+               cache_read_tokens=0, cost=0.0, latency_ms=0.0, status=200):
+        """Account for one upstream call (never blocks on disk)"""
+        entry = {'ts': datetime.now().astimezone().isoformat(timespec='milliseconds'), 'event': event_id,
+                 'model': model, 'tier': tier, 'status': status, 'input_tokens': input_tokens,
+                 'output_tokens': output_tokens, 'cache_write_tokens': cache_write_tokens,
+                 'cache_read_tokens': cache_read_tokens, 'cost': round(cost, 8), 'latency_ms': round(latency_ms, 1)}
+        self._add(entry)
+        line = json.dumps(entry, separators=(',', ':')) + '\n'
+        with self._queued:
+            self._pending.append(line)
+            if len(self._pending) >= self.batch:
+                self._queued.notify()
+
+    def _write_loop(self):
+        while True:
+            with self._queued:
+                self._queued.wait_for(lambda: self._closed or len(self._pending) >= self.batch, self.flush_seconds)
+                lines = [self._pending.popleft() for _ in range(min(len(self._pending), self.batch))]
+                done = self._closed and not self._pending
+            if lines:
+                self._append(lines)
+            if done:
+                return
+
+    def _append(self, lines):
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(''.join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+            self.stats['written'] += len(lines)
+            self.stats['batches'] += 1
+        except OSError as e:
+            self.stats['write_errors'] += 1
+            print(f"⚠️ Could not append {len(lines)} records to the budget ledger: {e}")
+
+    def close(self, timeout=5.0):
+        """Write everything still queued (atexit)"""
+        with self._queued:
+            self._closed = True
+            self._queued.notify()
+        self._writer.join(timeout)
+
+    def day(self, event_id, day=None):
+        """Rollup totals of one day (default: today), as stored"""
+        day = day or datetime.now().strftime('%Y-%m-%d')
+        with self._lock:
+            return self.days.get(event_id, {}).get(day) or empty_totals()
+
+    def usage(self, event_id, hours=24):
+        """Today's and this hour's rollups plus the last `hours` hourly rollups, for /api/usage"""
+        now = datetime.now()
+        today, this_hour = now.strftime('%Y-%m-%d'), now.strftime('%Y-%m-%dT%H')
+        with self._lock:
+            event_hours = self.hours.get(event_id, {})
+            recent = list(event_hours.items())[-hours:] if hours else []
+            return {
+                'today': rounded(self.days.get(event_id, {}).get(today) or empty_totals()),
+                'this_hour': rounded(event_hours.get(this_hour) or empty_totals()),
+                'hours': [dict(rounded(totals), hour=hour) for hour, totals in recent]
+            }
+
+    def snapshot(self):
+        with self._queued:
+            pending = len(self._pending)
+        return {'path': self.path, 'pending': pending, **self.stats}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Totals from the append-only budget ledger')
+    parser.add_argument('--path', default=LEDGER_PATH)
+    parser.add_argument('--event', help='only this event')
+    parser.add_argument('--hourly', action='store_true', help='per hour instead of per day')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    ledger = BudgetLedger(args.path)
+    ledger.close()
+    print(f"Replayed {ledger.stats['replayed']} records in {(time.perf_counter() - started) * 1000:.0f} ms")
+    if ledger.stats['skipped']:
+        print(f"⚠️  Skipped {ledger.stats['skipped']} unreadable lines")
+    rollups = ledger.hours if args.hourly else ledger.days
+    for event_id in sorted(rollups):
+        if args.event and event_id != args.event:
+            continue
+        print(f"\n{event_id}")
+        for period, totals in sorted(rollups[event_id].items()):
+            t = rounded(totals)
+            print(f"  {period:<13} {t['requests']:>6} calls {t['errors']:>4} errors  "
+                  f"{t['input_tokens']:>9} in {t['output_tokens']:>8} out  ${t['cost']:>9.4f}  "
+                  f"{t['mean_latency_ms'] or 0:>7.0f} ms")
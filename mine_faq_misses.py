@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Mine the FAQ miss log for new FAQ entries
+Clusters near-duplicate questions from logs/faq_misses.jsonl with MinHash/LSH,
+ranks the clusters by how often they were asked and writes candidate entries
+(question, keywords, draft answer) to data/faq_candidates.json.
+
+Review the candidates, fix the answers, set "accepted": true and run
+generate_faq.py to merge them into faq.json.
+
+Usage:
+    python mine_faq_misses.py [--misses logs/faq_misses.jsonl] [--threshold 0.5] [--top 50]
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+from collections import Counter, defaultdict
+
+from miss_log import load_misses
+from normalize import normalize
+
+# Question words carry intent for FAQ matching but only add noise when clustering
+QUESTION_WORDS = {'what', 'which', 'who', 'how', 'where', 'when', 'co', 'ktery', 'ktera', 'ktere', 'jak', 'kde',
+                  'kdy', 'was', 'welche', 'welcher', 'wie', 'wo', 'wann'}
+
+NUM_PERM = 64       # MinHash signature length
+BANDS = 32          # LSH bands (rows per band = NUM_PERM / BANDS); high recall, pairs are verified
+MERSENNE = (1 << 61) - 1
+
+
+def tokens(text):
+    return [t for t in normalize(text, 'any').split() if t not in QUESTION_WORDS]
+
+
+def shingles(words):
+    """Words, plus word bigrams for longer questions so word order matters a little"""
+    if len(words) <= 3:
+        return set(words)
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def stable_hash(value):
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class MinHasher:
+    """MinHash signatures with a fixed, seeded family of hash permutations"""
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        self.params = [(stable_hash(f"a{seed}:{i}") % (MERSENNE - 1) + 1, stable_hash(f"b{seed}:{i}") % MERSENNE)
+                       for i in range(num_perm)]
+
+    def signature(self, items):
+        hashes = [stable_hash(item) for item in items] or [0]
+        return tuple(min((a * h + b) % MERSENNE for h in hashes) for a, b in self.params)
+
+
+def lsh_candidate_pairs(signatures, bands=BANDS):
+    """Pairs of items that share at least one identical band"""
+    rows = len(signatures[0]) // bands
+    pairs = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        for idx, sig in enumerate(signatures):
+            buckets[sig[band * rows:(band + 1) * rows]].append(idx)
+        for members in buckets.values():
+            if 1 < len(members) <= 200:  # Huge buckets are degenerate (empty questions)
+                for i in range(len(members)):
+                    for j in range(i + 1, len(members)):
+                        pairs.add((members[i], members[j]))
+    return pairs
+
+
+def cluster_misses(misses, threshold=0.5):
+    """Group near-duplicate questions; returns lists of miss records"""
+    words = [tokens(m['normalized']) for m in misses]
+    hasher = MinHasher()
+    signatures = [hasher.signature(shingles(w)) for w in words]
+
+    parent = list(range(len(misses)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in lsh_candidate_pairs(signatures):
+        agreement = sum(1 for a, b in zip(signatures[i], signatures[j]) if a == b) / len(signatures[i])
+        if agreement >= threshold:
+            parent[find(i)] = find(j)
+
+    clusters = defaultdict(list)
+    for idx, miss in enumerate(misses):
+        clusters[find(idx)].append(miss)
+    return list(clusters.values())
+
+
+def cluster_keywords(cluster, document_frequency, total_docs, limit=6):
+    """Most distinctive words and bigrams of a cluster (TF-IDF over the miss log)"""
+    weights = Counter()
+    for miss in cluster:
+        words = tokens(miss['normalized'])
+        for term in shingles(words):
+            idf = math.log((1 + total_docs) / (1 + document_frequency[term])) + 1
+            weights[term] += miss['count'] * idf * (1.5 if ' ' in term else 1.0)
+    return [term for term, _ in weights.most_common(limit)]
+
+
+def mine(misses, threshold=0.5, top=50, min_count=2):
+    """Ranked FAQ candidates from the miss log"""
+    document_frequency = Counter()
+    for miss in misses:
+        document_frequency.update(shingles(tokens(miss['normalized'])))
+
+    candidates = []
+    for cluster in cluster_misses(misses, threshold):
+        total = sum(m['count'] for m in cluster)
+        if total < min_count:
+            continue
+        cluster.sort(key=lambda m: m['count'], reverse=True)
+        answered = [m for m in cluster if m.get('answer')]
+        candidates.append({
+            "question": cluster[0]['example'],
+            "answer": answered[0]['answer'] if answered else "",
+            "keywords": cluster_keywords(cluster, document_frequency, len(misses)),
+            "category": "mined",
+            "count": total,
+            "examples": [m['example'] for m in cluster[:10]],
+            "accepted": False
+        })
+
+    candidates.sort(key=lambda c: c['count'], reverse=True)
+    return candidates[:top]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Propose FAQ entries from questions the FAQ missed')
+    parser.add_argument('--misses', default='logs/faq_misses.jsonl')
+    parser.add_argument('--output', default='data/faq_candidates.json')
+    parser.add_argument('--threshold', type=float, default=0.5, help='estimated Jaccard similarity to merge questions')
+    parser.add_argument('--top', type=int, default=50, help='candidates to keep')
+    parser.add_argument('--min-count', type=int, default=2, help='ignore clusters asked fewer times')
+    args = parser.parse_args()
+
+    misses = load_misses(args.misses)
+    print(f"Loaded {len(misses)} distinct missed questions ({sum(m['count'] for m in misses)} asks)")
+
+    # Keep review decisions from the previous run
+    previous = {}
+    if os.path.exists(args.output):
+        with open(args.output, 'r', encoding='utf-8') as f:
+            previous = {c['question']: c for c in json.load(f)}
+
+    candidates = mine(misses, args.threshold, args.top, args.min_count)
+    for candidate in candidates:
+        old = previous.get(candidate['question'])
+        if old and old.get('accepted'):
+            candidate.update(answer=old['answer'], keywords=old['keywords'], accepted=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(candidates, f, indent=2, ensure_ascii=False)
+
+    print(f"Wrote {len(candidates)} FAQ candidates to {args.output}")
+    for candidate in candidates[:10]:
+        print(f"  {candidate['count']:>4}x  {candidate['question'][:70]}  {candidate['keywords'][:3]}")
+    print("\nReview answers, set \"accepted\": true, then run 'python generate_faq.py'")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Persistent log of questions the FAQ could not answer
+Every question that reaches /api/chat missed the browser's FAQ search. Each
+miss (and each model answer to one) is appended as a JSON line; several
+worker processes can share the file because every batch is a single O_APPEND
+write. load_misses() folds the lines into one record per normalized question
+with a count, an example, the languages seen and the latest model answer;
+mine_faq_misses.py turns those into new FAQ candidates.
+"""
+
+import json
+import os
+import threading
+import time
+
+from normalize import normalize
+
+
+class MissLog:
+    """FAQ misses appended to a JSONL file by a background writer every `flush_seconds`"""
+
+    def __init__(self, path, flush_seconds=30.0):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self._pending = []  # JSON lines not yet written
+        self._writer = None  # Runs while there is something to write
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def _append(self, record):
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._pending.append(line)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name='miss-log-writer', daemon=True)
+                self._writer.start()
+
+    def record(self, message, language='en'):
+        """Count one FAQ miss (never blocks on disk)"""
+        key = normalize(message, language)
+        if key:
+            self._append({'type': 'miss', 'normalized': key, 'example': message.strip(), 'language': language,
+                          'at': time.strftime('%Y-%m-%dT%H:%M:%S')})
+
+    def set_answer(self, message, answer, language='en'):
+        """Keep the model's latest answer as a draft answer for the FAQ candidate"""
+        if answer:
+            self._append({'type': 'answer', 'normalized': normalize(message, language), 'answer': answer,
+                          'at': time.strftime('%Y-%m-%dT%H:%M:%S')})
+
+    def _write_loop(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            with self._lock:
+                if not self._pending:
+                    self._writer = None
+                    return
+            self.flush()
+
+    def flush(self):
+        """Append everything queued now (eviction, shutdown)"""
+        with self._write_lock:
+            with self._lock:
+                lines, self._pending = self._pending, []
+            if not lines:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                # One write per batch: lines from other worker processes never land inside it
+                fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                try:
+                    os.write(fd, ''.join(lines).encode('utf-8'))
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                print(f"⚠️ Could not append {len(lines)} records to the FAQ miss log {self.path}: {e}")
+
+
+def load_misses(path):
+    """One record per normalized question, most asked first (also reads the older JSON array format)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    entries = {}
+    for line in text.splitlines():
+        try:
+            record = json.loads(line)
+            key = record['normalized']
+        except (ValueError, KeyError, TypeError):
+            continue  # A line torn by a crash
+        entry = entries.get(key)
+        if record.get('type') == 'answer':
+            if entry is not None:
+                entry['answer'] = record['answer']
+            continue
+        if entry is None:
+            entry = entries[key] = {'normalized': key, 'example': record['example'], 'count': 0, 'languages': [],
+                                    'first_seen': record['at'], 'answer': None}
+        entry['count'] += 1
+        entry['last_seen'] = record['at']
+        if record['language'] not in entry['languages']:
+            entry['languages'].append(record['language'])
+    return sorted(entries.values(), key=lambda e: e['count'], reverse=True)
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Conference data model
+Slot-based dataclasses for the event, its sessions, speakers and rooms, plus
+the loader and serializer every build script uses for data/conference.json.
+
+Ids, room ids and speaker names are interned (they repeat across sessions),
+times are parsed into aware datetimes once, and records are validated as
+they are read. The loader decodes one session/speaker/room at a time instead
+of building the whole dict tree first, and the serializer writes one record
+at a time, producing exactly the file json.dump(indent=2) would.
+
+Usage:
+    python model.py [path]    # validate conference.json and print a summary
+"""
+
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from functools import lru_cache
+
+CONFERENCE_PATH = 'data/conference.json'
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+CHUNK_SIZE = 1 << 16
+
+_scan = json.JSONDecoder().scan_once
+_encode_string = json.encoder.encode_basestring
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+@lru_cache(maxsize=4096)
+def parse_time(value):
+    """'2026-01-23T08:15:00Z' -> aware UTC datetime (cached: sessions share their slot times)"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        raise ValueError(f"time without timezone: {value!r}")
+    return parsed.astimezone(timezone.utc)
+
+
+@lru_cache(maxsize=4096)
+def format_time(value):
+    return value.astimezone(timezone.utc).strftime(TIME_FORMAT)
+
+
+_MISSING = object()
+_TEXT = (str,)
+_OPTIONAL_TEXT = (str, type(None))
+
+
+def _schema(fields):
+    """({name: allowed types, or None for any}, the usual type of each field) for _values"""
+    return fields, tuple(type(None) if kinds is None else kinds[0] for kinds in fields.values())
+
+
+def _values(record, schema, where):
+    """Values of the schema's fields in order, validated"""
+    fields, usual = schema
+    if type(record) is dict and record.keys() == fields.keys():
+        values = [record[name] for name in fields]
+        if tuple(map(type, values)) == usual:
+            return values
+    elif type(record) is not dict:
+        raise ValueError(f"{where}: expected an object, got {type(record).__name__}")
+
+    values = []
+    for name, kinds in fields.items():
+        value = record.get(name, _MISSING)
+        if value is _MISSING:
+            if kinds is not None and type(None) not in kinds:
+                raise ValueError(f"{where}: missing field {name!r}")
+            value = None
+        elif kinds is not None and type(value) not in kinds:
+            raise ValueError(f"{where}: field {name!r} has type {type(value).__name__}")
+        values.append(value)
+    unknown = record.keys() - fields.keys()
+    if unknown:
+        raise ValueError(f"{where}: unknown field(s) {', '.join(sorted(unknown))}")
+    return values
+
+
+@dataclass(slots=True)
+class Room:
+    id: str
+    name: str
+    floor: object = None
+
+    FIELDS = _schema({'id': _TEXT, 'name': _TEXT, 'floor': None})
+
+    @classmethod
+    def from_dict(cls, record, where='room'):
+        room_id, name, floor = _values(record, Room.FIELDS, where)
+        return cls(sys.intern(room_id), sys.intern(name), floor)
+
+    def to_dict(self):
+        return {'id': self.id, 'name': self.name, 'floor': self.floor}
+
+
+@dataclass(slots=True)
+class Speaker:
+    id: str
+    name: str
+    title: str = ''
+    bio: str = ''
+    photo: str = ''
+
+    FIELDS = _schema({'id': _TEXT, 'name': _TEXT, 'title': _OPTIONAL_TEXT, 'bio': _OPTIONAL_TEXT,
+                      'photo': _OPTIONAL_TEXT})
+
+    @classmethod
+    def from_dict(cls, record, where='speaker'):
+        speaker_id, name, title, bio, photo = _values(record, Speaker.FIELDS, where)
+        return cls(sys.intern(speaker_id), sys.intern(name), title or '', bio or '', photo or '')
+
+    def to_dict(self):
+        return {'id': self.id, 'name': self.name, 'title': self.title, 'bio': self.bio, 'photo': self.photo}
+
+
+@dataclass(slots=True)
+class Session:
+    id: str
+    title: str
+    description: str
+    speakers: list
+    room: str
+    room_id: str
+    start: datetime
+    end: datetime
+    duration: int
+
+    FIELDS = _schema({'id': _TEXT, 'title': _TEXT, 'description': _TEXT, 'speakers': (list,), 'room': _TEXT,
+                      'room_id': _TEXT, 'start': _TEXT, 'end': _TEXT, 'duration': (int,)})
+
+    @classmethod
+    def from_dict(cls, record, where='session'):
+        session_id, title, description, speakers, room, room_id, start, end, duration = \
+            _values(record, Session.FIELDS, where)
+        if not all(type(name) is str for name in speakers):
+            raise ValueError(f"{where}: speakers must be names")
+        try:
+            start, end = parse_time(start), parse_time(end)
+        except ValueError as e:
+            raise ValueError(f"{where}: {e}") from None
+        if end < start:
+            raise ValueError(f"{where}: ends before it starts")
+        return cls(sys.intern(session_id), title, description, [sys.intern(name) for name in speakers],
+                   sys.intern(room), sys.intern(room_id), start, end, duration)
+
+    def to_dict(self):
+        return {'id': self.id, 'title': self.title, 'description': self.description, 'speakers': list(self.speakers),
+                'room': self.room, 'room_id': self.room_id, 'start': format_time(self.start),
+                'end': format_time(self.end), 'duration': self.duration}
+
+
+CONFERENCE_FIELDS = _schema({'event': (dict,), 'sessions': (list,), 'speakers': (list,), 'rooms': (list,)})
+
+
+@dataclass(slots=True)
+class Event:
+    name: str
+    date: date
+    location: str
+    timezone: str
+    address: str = None
+    sessions: list = field(default_factory=list)
+    speakers: list = field(default_factory=list)
+    rooms: list = field(default_factory=list)
+
+    FIELDS = _schema({'name': _TEXT, 'date': _TEXT, 'location': _TEXT, 'address': _OPTIONAL_TEXT, 'timezone': _TEXT})
+
+    @classmethod
+    def from_dict(cls, data):
+        """Event from a conference.json-shaped dict (as the build scripts assemble it)"""
+        header, sessions, speakers, rooms = _values(data, CONFERENCE_FIELDS, 'conference')
+        event = cls.header(header)
+        event.sessions = [Session.from_dict(s, f"sessions[{i}]") for i, s in enumerate(sessions)]
+        event.speakers = [Speaker.from_dict(s, f"speakers[{i}]") for i, s in enumerate(speakers)]
+        event.rooms = [Room.from_dict(r, f"rooms[{i}]") for i, r in enumerate(rooms)]
+        event.validate()
+        return event
+
+    @classmethod
+    def header(cls, record):
+        """Event without sessions/speakers/rooms from the "event" object"""
+        name, day, location, address, tz = _values(record, Event.FIELDS, 'event')
+        try:
+            day = date.fromisoformat(day)
+        except ValueError as e:
+            raise ValueError(f"event: {e}") from None
+        return cls(name, day, location, tz, address)
+
+    def header_dict(self):
+        header = {'name': self.name, 'date': self.date.isoformat(), 'location': self.location}
+        if self.address is not None:
+            header['address'] = self.address
+        header['timezone'] = self.timezone
+        return header
+
+    def to_dict(self):
+        """The plain conference.json dict the server and FAQ generator work with"""
+        return {'event': self.header_dict(),
+                'sessions': [s.to_dict() for s in self.sessions],
+                'speakers': [s.to_dict() for s in self.speakers],
+                'rooms': [r.to_dict() for r in self.rooms]}
+
+    def validate(self):
+        """Cross-record checks: unique ids, and sessions only refer to known rooms and speakers"""
+        for kind, records in (('session', self.sessions), ('speaker', self.speakers), ('room', self.rooms)):
+            seen = set()
+            for record in records:
+                if record.id in seen:
+                    raise ValueError(f"duplicate {kind} id {record.id!r}")
+                seen.add(record.id)
+        rooms = {room.id for room in self.rooms}
+        names = {speaker.name for speaker in self.speakers}
+        for session in self.sessions:
+            if rooms and session.room_id not in rooms:
+                raise ValueError(f"session {session.id!r}: unknown room_id {session.room_id!r}")
+            for name in session.speakers:
+                if name not in names:
+                    raise ValueError(f"session {session.id!r}: unknown speaker {name!r}")
+
+    def speaker(self, name):
+        for speaker in self.speakers:
+            if speaker.name == name:
+                return speaker
+        return None
+
+
+class _Reader:
+    """Pulls JSON values out of a text file a chunk at a time"""
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ''
+        self.pos = 0
+        self.consumed = 0  # Characters dropped from the front of the buffer, for error offsets
+        self.eof = False
+
+    def _fill(self):
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.consumed += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character (not consumed), '' at end of file"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r} at offset {self.consumed + self.pos}, "
+                             f"found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def value(self):
+        """Next complete JSON value; reads more of the file until it decodes"""
+        self.peek()
+        while True:
+            try:
+                value, end = _scan(self.buffer, self.pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except (StopIteration, json.JSONDecodeError):
+                if self.eof:
+                    raise ValueError(f"invalid JSON at offset {self.consumed + self.pos}") from None
+            self._fill()
+
+    def items(self):
+        """Values of the array that starts here, one at a time"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect(']')
+            return
+
+
+def load_conference(path=CONFERENCE_PATH):
+    """Event read record by record from conference.json (ValueError on invalid data)"""
+    builders = {'sessions': Session.from_dict, 'speakers': Speaker.from_dict, 'rooms': Room.from_dict}
+    collected = {name: [] for name in builders}
+    header = None
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _Reader(f)
+        reader.expect('{')
+        while reader.peek() != '}':
+            key = reader.value()
+            reader.expect(':')
+            if key == 'event':
+                header = Event.header(reader.value())
+            elif key in builders:
+                build, records = builders[key], collected[key]
+                for i, record in enumerate(reader.items()):
+                    records.append(build(record, f"{key}[{i}]"))
+            else:
+                raise ValueError(f"{path}: unknown top-level field {key!r}")
+            if reader.peek() == ',':
+                reader.pos += 1
+        reader.expect('}')
+    if header is None:
+        raise ValueError(f"{path}: missing field 'event'")
+    header.sessions, header.speakers, header.rooms = collected['sessions'], collected['speakers'], collected['rooms']
+    header.validate()
+    return header
+
+
+def _nested(record, depth):
+    """json.dumps(indent=2) of a flat record that sits `depth` levels deep in the document
+
+    Strings, ints, None and lists of strings are encoded directly; json.dumps with
+    indent runs the pure-Python encoder, which is several times slower.
+    """
+    if not record:
+        return '{}'
+    pad = '\n' + '  ' * (depth + 1)
+    parts = []
+    for key, value in record.items():
+        kind = type(value)
+        if kind is str:
+            encoded = _encode_string(value)
+        elif value is None:
+            encoded = 'null'
+        elif kind is int:
+            encoded = int.__repr__(value)
+        elif kind is list and all(type(item) is str for item in value):
+            encoded = '[' + ''.join(f"{',' if i else ''}{pad}  {_encode_string(item)}"
+                                    for i, item in enumerate(value)) + (pad + ']' if value else ']')
+        else:
+            encoded = json.dumps(value, indent=2, ensure_ascii=False).replace('\n', pad)
+        parts.append(f"{_encode_string(key)}: {encoded}")
+    return '{' + pad + (',' + pad).join(parts) + '\n' + '  ' * depth + '}'
+
+
+def dump_conference(event, path=CONFERENCE_PATH):
+    """Write conference.json one record at a time; the file is replaced atomically"""
+    event.validate()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('{\n  "event": ' + _nested(event.header_dict(), 1))
+        for key in ('sessions', 'speakers', 'rooms'):
+            records = getattr(event, key)
+            if not records:
+                f.write(f',\n  "{key}": []')
+                continue
+            f.write(f',\n  "{key}": [')
+            separator = '\n    '
+            for record in records:
+                f.write(separator + _nested(record.to_dict(), 2))
+                separator = ',\n    '
+            f.write('\n  ]')
+        f.write('\n}')
+    os.replace(tmp_path, path)
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else CONFERENCE_PATH
+    try:
+        event = load_conference(path)
+    except (OSError, ValueError) as e:
+        print(f"❌ {path}: {e}")
+        sys.exit(1)
+    talks = sum(1 for s in event.sessions if s.speakers)
+    print(f"✓ {event.name} ({event.date}): {len(event.sessions)} sessions ({talks} talks), "
+          f"{len(event.speakers)} speakers, {len(event.rooms)} rooms")
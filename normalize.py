@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Shared query normalization
+One pipeline for the FAQ index, the response caches, the miss log and the FAQ
+generator, so "Which sessions start at 1:45 PM?", "Welche Sessions beginnen um
+13.45 Uhr?" and "Které přednášky začínají ve 13:45?" reduce to the same
+canonical time and comparable words. searchFAQ in app.js mirrors these rules.
+
+All tables and patterns are built once at import time.
+"""
+
+import re
+import unicodedata
+
+# Times: "1:45 PM", "13.45", "9:15am", "2 p.m.", "14 Uhr", "14 hod."
+TIME_PATTERN = re.compile(
+    r'(?<![\d:.])(\d{1,2})(?:[:.](\d{2}))?(?:\s*([ap])\.?\s?m\b\.?|\s*(uhr|hod(?:in|\.)?)\b)?(?![\d:])'
+)
+TOKEN_PATTERN = re.compile(r'\d\d:\d\d|\w+')
+
+# Same patterns as detectLanguage() in app.js
+CZECH_PATTERN = re.compile(r'\b(který|která|které|kde|kdy|jak|proč|co|jsem|jsi|jsou|přednáška|místnost|mi|můžeš|'
+                           r'odpovíš|udělej|shrň|česky|čeština|přehled|vět)\b')
+GERMAN_PATTERN = re.compile(r'\b(welche|welcher|wo|wann|wie|warum|was|ich|du|sind|vortrag|raum|deutsch)\b')
+
+# Stopwords in folded form (no diacritics). Question words stay: they decide intent.
+STOPWORDS = {
+    'en': {'a', 'an', 'the', 'is', 'are', 'am', 'be', 'to', 'of', 'in', 'on', 'at', 'for', 'and', 'or', 'i', 'me',
+           'my', 'you', 'your', 'can', 'could', 'do', 'does', 'please', 'there', 'any', 'it', 'this', 'that', 's'},
+    'cs': {'a', 'i', 'je', 'jsou', 'v', 've', 'na', 'o', 'mi', 'me', 'se', 'si', 'to', 'ten', 'ta', 'za', 'do',
+           'z', 'ze', 'k', 'ke', 's', 'prosim', 'nejake', 'nejaky', 'hod', 'hodin'},
+    'de': {'der', 'die', 'das', 'den', 'dem', 'ein', 'eine', 'einen', 'ist', 'sind', 'im', 'in', 'um', 'am', 'an',
+           'und', 'oder', 'ich', 'du', 'es', 'gibt', 'zu', 'zum', 'zur', 'bitte', 'mir', 'uhr'},
+}
+STOPWORDS['any'] = set().union(*STOPWORDS.values())
+
+# Diacritic folding for Latin-1 and Latin Extended-A (Czech, German, ...)
+_SPECIAL_FOLDS = {'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ø': 'o', 'ł': 'l', 'đ': 'd', 'ı': 'i'}
+FOLD_TABLE = {}
+for _code in range(0xC0, 0x180):
+    _char = chr(_code)
+    _base = _SPECIAL_FOLDS.get(_char) or unicodedata.normalize('NFKD', _char)[0]
+    if _base != _char and _base.isascii():
+        FOLD_TABLE[_code] = _base
+FOLD_TABLE.update((ord(k), v) for k, v in _SPECIAL_FOLDS.items())
+
+
+def detect_language(text):
+    """'cs', 'de' or 'en', using the same rules as app.js"""
+    lower = text.lower()
+    if CZECH_PATTERN.search(lower):
+        return 'cs'
+    if GERMAN_PATTERN.search(lower):
+        return 'de'
+    return 'en'
+
+
+def fold_diacritics(text):
+    return text.translate(FOLD_TABLE)
+
+
+def _canonical_time(match):
+    hour, minutes, meridiem, unit = match.groups()
+    if minutes is None and meridiem is None and unit is None:
+        return match.group(0)  # A bare number, not a time
+    hour, minute = int(hour), int(minutes or 0)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return match.group(0)
+        hour = hour % 12 + (12 if meridiem == 'p' else 0)
+    if hour > 23 or minute > 59:
+        return match.group(0)
+    return f"{hour:02d}:{minute:02d}"
+
+
+def canonical_times(text):
+    """Rewrite every time mention in lowercase text as HH:MM (24-hour)"""
+    return TIME_PATTERN.sub(_canonical_time, text)
+
+
+def find_times(text):
+    """All times mentioned in a question, as HH:MM strings"""
+    return [t for t in TOKEN_PATTERN.findall(canonical_times(text.lower())) if ':' in t]
+
+
+def normalize(text, language=None):
+    """Canonical form of a question or keyword
+
+    Case- and diacritic-folded, times as HH:MM, punctuation dropped and the
+    stopwords of `language` removed ('any' removes every language's stopwords,
+    None detects the language like app.js).
+    """
+    stopwords = STOPWORDS.get(language or detect_language(text), STOPWORDS['en'])
+    text = fold_diacritics(canonical_times(text.casefold()))
+    return ' '.join(t for t in TOKEN_PATTERN.findall(text) if t not in stopwords)
+
+
+def normalize_keywords(keywords):
+    """Normalized, deduplicated keywords in their original order (empty ones dropped)"""
+    seen = {}
+    for keyword in keywords:
+        key = normalize(keyword, 'any')
+        if key:
+            seen.setdefault(key, None)
+    return list(seen)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Local speaker photos
+Speaker records point at remote Sessionize images, so every attendee's
+browser would fetch each photo from a third party. This downloads every
+photo once (concurrently, into build/photos/, never twice for the same URL),
+crops it square and encodes AVIF and WebP variants at the display sizes plus
+a JPEG fallback. Files are named by content hash (data/photos/<speaker>-<size>-<hash>.<ext>),
+so the server can let browsers cache them for a year. data/photos.json maps
+each speaker to the fallback `src` and a `srcset` per image type, and the
+pipeline's conference stage points the speakers' `photo` at the local file.
+
+Resizing needs Pillow (optional: `pip install Pillow`; AVIF needs a Pillow
+built with libavif). Without it the original files are stored locally as they
+are, which still takes the third-party requests away.
+
+Usage:
+    python pipeline.py --photos               # as a pipeline stage (data/)
+    python photos.py --data-dir events/foo    # a hosted event: also rewrites its conference.json
+    python photos.py --fixtures path/to/dir   # read images from a directory instead of the network
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from model import dump_conference, load_conference
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Optional: originals are stored unresized
+    Image = None
+
+PHOTOS_FILE = 'photos.json'
+PHOTOS_DIR = 'photos'  # Under the data directory, served as data/photos/
+DOWNLOAD_DIR = 'build/photos'
+PHOTO_FIXTURES = os.environ.get('PHOTO_FIXTURES')  # Directory of images named like the URLs' last segment
+PHOTO_SIZES = (96, 192)  # Speaker detail shows 96 CSS px; 192 for 2x screens
+PHOTO_WORKERS = 8
+PHOTO_TIMEOUT = 20
+# (extension, Pillow format, MIME type, save options), preferred first
+ENCODINGS = (('avif', 'AVIF', 'image/avif', {'quality': 55}),
+             ('webp', 'WEBP', 'image/webp', {'quality': 80, 'method': 6}))
+FALLBACK_QUALITY = 82
+HASH_CHARS = 10
+
+
+def download_path(url, download_dir=DOWNLOAD_DIR):
+    return os.path.join(download_dir, hashlib.sha256(url.encode()).hexdigest()[:16])
+
+
+def fetch_photo(url, fixtures=None, download_dir=DOWNLOAD_DIR):
+    """The image bytes for `url` (None if unavailable), downloaded at most once"""
+    path = download_path(url, download_dir)
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    if fixtures:
+        fixture = os.path.join(fixtures, url.rstrip('/').rsplit('/', 1)[-1])
+        if not os.path.exists(fixture):
+            return None
+        with open(fixture, 'rb') as f:
+            data = f.read()
+    else:
+        try:
+            response = requests.get(url, timeout=PHOTO_TIMEOUT)
+        except requests.exceptions.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+        data = response.content
+    os.makedirs(download_dir, exist_ok=True)
+    with open(f"{path}.tmp", 'wb') as f:
+        f.write(data)
+    os.replace(f"{path}.tmp", path)
+    return data
+
+
+def fetch_photos(urls, fixtures=None, download_dir=DOWNLOAD_DIR, workers=PHOTO_WORKERS):
+    """{url: bytes or None}, fetched concurrently"""
+    urls = list(dict.fromkeys(urls))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(urls, executor.map(lambda url: fetch_photo(url, fixtures, download_dir), urls)))
+
+
+def encodings():
+    """The ENCODINGS this Pillow can write"""
+    if Image is None:
+        return []
+    Image.init()
+    return [encoding for encoding in ENCODINGS if encoding[1] in Image.SAVE]
+
+
+def _encode(image, fmt, **options):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def variants(data, formats):
+    """[(size, extension, MIME type, bytes)]: square crops at PHOTO_SIZES in each format, then the JPEG fallback"""
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+    image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    side = min(image.size)
+    square = ImageOps.fit(image, (side, side))
+    resized = {size: square.resize((size, size), Image.LANCZOS) for size in PHOTO_SIZES}
+    out = []
+    for extension, fmt, mime, options in formats:
+        try:
+            out.extend((size, extension, mime, _encode(resized[size], fmt, **options)) for size in PHOTO_SIZES)
+        except (OSError, ValueError):  # Plugin present but no encoder
+            continue
+    largest = resized[PHOTO_SIZES[-1]]
+    if largest.mode == 'RGBA':
+        background = Image.new('RGB', largest.size, (255, 255, 255))
+        background.paste(largest, mask=largest.getchannel('A'))
+        largest = background
+    out.append((PHOTO_SIZES[-1], 'jpg', 'image/jpeg', _encode(largest, 'JPEG', quality=FALLBACK_QUALITY, optimize=True)))
+    return out
+
+
+def original_extension(url):
+    extension = os.path.splitext(url.split('?')[0])[1].lower().lstrip('.')
+    return {'jpeg': 'jpg'}.get(extension, extension) or 'jpg'
+
+
+def load_photos(data_dir='data'):
+    """The data directory's photos.json, or None"""
+    try:
+        with open(os.path.join(data_dir, PHOTOS_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def source_url(speaker, previous=None):
+    """The remote photo URL of a speaker record, also when it already points at a local photo"""
+    photo = speaker.get('photo') or ''
+    if photo.startswith(('http://', 'https://')):
+        return photo
+    entry = (previous or {}).get('speakers', {}).get(speaker['id'])
+    return entry['url'] if entry and entry['src'] == photo else None
+
+
+def build_photos(conference_data, data_dir='data', fixtures=PHOTO_FIXTURES, download_dir=DOWNLOAD_DIR):
+    """Write the speakers' photo files under <data_dir>/photos/ and return the photos.json manifest"""
+    previous = load_photos(data_dir)
+    speakers = [dict(s, photo=source_url(s, previous)) for s in conference_data.get('speakers', [])]
+    speakers = [s for s in speakers if s['photo']]
+    fetched = fetch_photos([s['photo'] for s in speakers], fixtures, download_dir)
+    formats = encodings()
+    out_dir = os.path.join(data_dir, PHOTOS_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    manifest, written = {}, set()
+    for speaker in speakers:
+        data = fetched.get(speaker['photo'])
+        if data is None:
+            print(f"⚠️  No photo for {speaker['name']}: {speaker['photo']}")
+            continue
+        if Image is None:
+            files = [(None, original_extension(speaker['photo']), None, data)]
+        else:
+            try:
+                files = variants(data, formats)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Cannot read the photo of {speaker['name']}: {e}")
+                continue
+        sources = {}
+        for size, extension, mime, content in files:
+            digest = hashlib.sha256(content).hexdigest()[:HASH_CHARS]
+            stem = re.sub(r'[^A-Za-z0-9_-]+', '-', speaker['id'])
+            name = f"{stem}-{size}-{digest}.{extension}" if size else f"{stem}-{digest}.{extension}"
+            path = os.path.join(out_dir, name)
+            if not os.path.exists(path):
+                with open(path, 'wb') as f:
+                    f.write(content)
+            written.add(name)
+            src = f"data/{PHOTOS_DIR}/{name}"
+            if mime in (None, 'image/jpeg'):
+                fallback = src
+            else:
+                sources.setdefault(mime, []).append(f"{src} {size}w")
+        manifest[speaker['id']] = {'url': speaker['photo'], 'src': fallback,
+                                   'sources': {mime: ', '.join(srcset) for mime, srcset in sources.items()}}
+
+    for name in os.listdir(out_dir):
+        if name not in written:
+            os.remove(os.path.join(out_dir, name))
+    return {'sizes': list(PHOTO_SIZES) if Image is not None else [], 'speakers': manifest}
+
+
+def save_photos(manifest, data_dir='data'):
+    with open(os.path.join(data_dir, PHOTOS_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+
+
+def apply_photos(event, manifest):
+    """Point speakers at their local photo when it was made from their current photo URL; returns how many"""
+    local = 0
+    for speaker in event.speakers:
+        entry = manifest['speakers'].get(speaker.id)
+        if entry and entry['url'] == speaker.photo:
+            speaker.photo = entry['src']
+            local += 1
+    return local
+
+
+def localize_photos(data_dir='data', fixtures=PHOTO_FIXTURES, download_dir=DOWNLOAD_DIR):
+    """Build the photos of a data directory and point its conference.json at them; returns the manifest"""
+    conference_path = os.path.join(data_dir, 'conference.json')
+    event = load_conference(conference_path)
+    # Remote URLs from the manifest the current local paths were made with (build_photos deletes stale files)
+    previous = load_photos(data_dir)
+    remote = {speaker.id: source_url(speaker.to_dict(), previous) for speaker in event.speakers}
+    manifest = build_photos(event.to_dict(), data_dir, fixtures, download_dir)
+    save_photos(manifest, data_dir)
+    for speaker in event.speakers:
+        speaker.photo = remote[speaker.id] or speaker.photo
+    apply_photos(event, manifest)
+    dump_conference(event, conference_path)
+    return manifest
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Download, resize and fingerprint speaker photos')
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--fixtures', default=PHOTO_FIXTURES, help='read images from this directory, not the network')
+    parser.add_argument('--clean', action='store_true', help='forget earlier downloads')
+    args = parser.parse_args()
+
+    if args.clean:
+        shutil.rmtree(DOWNLOAD_DIR, ignore_errors=True)
+    manifest = localize_photos(args.data_dir, args.fixtures)
+    if Image is None:
+        print("⚠️  Pillow is not installed: originals stored without resizing (pip install Pillow)")
+    else:
+        print(f"Formats: {', '.join(e[0] for e in encodings()) or 'none'} + jpg")
+    print(f"{len(manifest['speakers'])} speaker photos in {os.path.join(args.data_dir, PHOTOS_DIR)}")
+    print(f"Saved to: {os.path.join(args.data_dir, PHOTOS_FILE)}")
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Build pipeline for the conference data
+Replaces running build_full_data.py, update_bios.py, fetch_speakers.py,
+similarity.py, generate_faq.py, binindex.py, suggest.py and releases.py by
+hand, and writes the service worker's precache manifest. Each stage declares
+the files it reads (including its own code) and the files it writes; stages
+that feed each other form a DAG and independent stages run in parallel worker
+processes.
+
+Caching is content-addressed: a stage's key is the hash of its input files,
+and its outputs are stored under build/cache/objects/ by hash. A stage whose
+key matches its last run and whose outputs are intact is skipped; one whose
+key matches an earlier run gets its outputs restored from the object store.
+File hashes are reused while size and mtime are unchanged, so a no-op
+rebuild only stats files.
+
+Usage:
+    python pipeline.py                 # build everything that changed
+    python pipeline.py faq             # build one stage (and what it depends on)
+    python pipeline.py --force         # rebuild everything
+    python pipeline.py --fetch         # also pull bios/taglines from Sessionize
+    python pipeline.py --photos        # also download and resize speaker photos
+"""
+
+import argparse
+import contextlib
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+CACHE_DIR = 'build/cache'
+OBJECTS_DIR = os.path.join(CACHE_DIR, 'objects')
+MANIFEST_PATH = os.path.join(CACHE_DIR, 'manifest.json')
+STAGING_DIR = 'build/pipeline'
+ASSETS_DIR = 'build/assets'
+KEEP_RUNS = 5  # Cached runs kept per stage (switching branches back and forth restores instead of rebuilding)
+
+INGESTED = os.path.join(STAGING_DIR, 'ingested.json')
+SESSIONIZE = os.path.join(STAGING_DIR, 'sessionize_speakers.json')
+MERGED = os.path.join(STAGING_DIR, 'merged.json')
+PHOTOS = 'data/photos.json'
+STATIC_ASSETS = ['index.html', 'app.js', 'jsonpatch.js', 'styles.css', 'sw.js', 'manifest.json', 'precache-manifest.js']
+# Precached by sw.js under their content hash; the manifest is imported by sw.js, so a change installs a new worker
+PRECACHE_ASSETS = ['index.html', 'app.js', 'jsonpatch.js', 'styles.css', 'manifest.json', 'favicon.png', 'icon-192.png',
+                   'icon-512.png']
+PRECACHE_MANIFEST = 'precache-manifest.js'
+DATA_ASSETS = ['data/conference.json', 'data/faq.json', 'data/similarity.json', 'data/suggest.json',
+               'data/releases.json']
+
+
+def compressed_path(path):
+    return os.path.join(ASSETS_DIR, f"{path}.gz")
+
+
+def write_json(data, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ===================
+# STAGES
+# ===================
+
+def run_fetch():
+    from fetch_speakers import fetch_sessionize_speakers
+    write_json(fetch_sessionize_speakers(), SESSIONIZE)
+
+
+def run_ingest():
+    from build_full_data import create_complete_data
+    from model import Event
+    write_json(Event.from_dict(create_complete_data()).to_dict(), INGESTED)
+
+
+def run_merge_bios():
+    from fetch_speakers import apply_sessionize
+    from model import Event
+    from update_bios import merge_bios
+
+    event = Event.from_dict(read_json(INGESTED))
+    print(f"{merge_bios(event, verbose=False)} bios from update_bios.py")
+    if os.path.exists(SESSIONIZE):
+        print(f"{apply_sessionize(event, read_json(SESSIONIZE), verbose=False)} bios from Sessionize")
+    write_json(event.to_dict(), MERGED)
+
+
+def run_photos():
+    from photos import build_photos, save_photos
+    manifest = build_photos(read_json(MERGED))
+    save_photos(manifest)
+    print(f"{len(manifest['speakers'])} speaker photos in data/photos/")
+
+
+def run_conference():
+    from model import Event, dump_conference
+    event = Event.from_dict(read_json(MERGED))
+    if os.path.exists(PHOTOS):
+        from photos import apply_photos
+        print(f"{apply_photos(event, read_json(PHOTOS))} local speaker photos")
+    dump_conference(event)
+    print(f"{len(event.sessions)} sessions, {len(event.speakers)} speakers, {len(event.rooms)} rooms")
+
+
+def run_similarity():
+    from similarity import SIMILARITY_PATH, build_similarity, save_similarity
+    save_similarity(build_similarity(read_json('data/conference.json')), SIMILARITY_PATH)
+
+
+def run_faq():
+    from generate_faq import assemble_faq, save_faq
+    faq = assemble_faq(read_json('data/conference.json'))
+    save_faq(faq)
+    print(f"{len(faq)} FAQ entries")
+
+
+def run_index():
+    from binindex import build_index
+    writer = build_index('data')
+    print(f"{len(writer.strings)} strings in data/search.idx")
+
+
+def run_suggest():
+    from suggest import SuggestIndex, save_suggest
+    index = SuggestIndex.build(read_json('data/conference.json'), read_json('data/faq.json'))
+    save_suggest(index)
+    print(f"{len(index.items)} suggestions, {len(index.tokens)} tokens")
+
+
+def run_release():
+    from releases import make_release
+    release = make_release('data')
+    print(f"Release {release['version']}, {len(release['patches'])} patches from earlier versions")
+
+
+def run_langid():
+    from langid import train, training_samples
+    train(training_samples()).save()
+
+
+def run_precache():
+    assets = {}
+    for path in PRECACHE_ASSETS:
+        with open(path, 'rb') as f:
+            assets[path] = hashlib.sha256(f.read()).hexdigest()[:10]
+    version = hashlib.sha256(json.dumps(assets, sort_keys=True).encode()).hexdigest()[:10]
+    manifest = json.dumps({'version': version, 'assets': assets}, indent=2)
+    with open(PRECACHE_MANIFEST, 'w', encoding='utf-8') as f:
+        f.write(f"// Generated by pipeline.py (precache stage): files sw.js precaches, by content hash\n"
+                f"self.PRECACHE_MANIFEST = {manifest};\n")
+    print(f"Precache {version}: {len(assets)} assets")
+
+
+def compress(paths):
+    """Gzip copies for the static server; mtime 0 keeps the bytes (and cache keys) stable"""
+    for path in paths:
+        target = compressed_path(path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(target, 'wb') as f:
+            f.write(gzip.compress(data, compresslevel=9, mtime=0))
+
+
+def run_static_assets():
+    compress(STATIC_ASSETS)
+
+
+def run_data_assets():
+    compress(DATA_ASSETS)
+
+
+class Stage:
+    """A build step: `run` reads `inputs` and writes `outputs` (all repo-relative paths)"""
+
+    def __init__(self, name, run, inputs, outputs, optional=(), always=False):
+        self.name = name
+        self.run = run
+        self.inputs = inputs + ['pipeline.py']
+        self.optional = set(optional)  # Inputs that may not exist
+        self.outputs = outputs
+        self.always = always  # Not content-addressable (network): runs whenever selected
+
+
+MODEL_CODE = ['model.py']
+SEARCH_CODE = ['normalize.py', 'similarity.py']
+
+STAGES = [
+    Stage('fetch', run_fetch, ['fetch_speakers.py'], [SESSIONIZE], always=True),
+    Stage('ingest', run_ingest, ['build_full_data.py'] + MODEL_CODE, [INGESTED]),
+    Stage('merge_bios', run_merge_bios, [INGESTED, SESSIONIZE, 'update_bios.py', 'fetch_speakers.py'] + MODEL_CODE,
+          [MERGED], optional=[SESSIONIZE]),
+    # Downloads and writes data/photos/ (named by content): runs only with --photos, like fetch
+    Stage('photos', run_photos, [MERGED, 'photos.py'], [PHOTOS], always=True),
+    Stage('conference', run_conference, [MERGED, PHOTOS, 'photos.py'] + MODEL_CODE, ['data/conference.json'],
+          optional=[PHOTOS]),
+    Stage('similarity', run_similarity, ['data/conference.json'] + SEARCH_CODE, ['data/similarity.json']),
+    Stage('faq', run_faq,
+          ['data/conference.json', 'data/similarity.json', 'data/precomputed.json', 'data/faq_candidates.json',
+           'generate_faq.py', 'planner.py', 'fallback.py'] + SEARCH_CODE,
+          ['data/faq.json'], optional=['data/precomputed.json', 'data/faq_candidates.json']),
+    Stage('index', run_index, ['data/faq.json', 'data/conference.json', 'binindex.py', 'faq_search.py', 'router.py',
+                               'normalize.py'], ['data/search.idx']),
+    Stage('suggest', run_suggest, ['data/conference.json', 'data/faq.json', 'suggest.py', 'normalize.py'],
+          ['data/suggest.json']),
+    Stage('release', run_release, ['data/conference.json', 'data/faq.json', 'releases.py', 'json_patch.py'],
+          ['data/releases.json']),
+    Stage('langid', run_langid, ['app.js', 'data/faq.json', 'langid.py', 'normalize.py'], ['data/langid_profile.json']),
+    Stage('precache', run_precache, list(PRECACHE_ASSETS), [PRECACHE_MANIFEST]),
+    Stage('static_assets', run_static_assets, list(STATIC_ASSETS), [compressed_path(p) for p in STATIC_ASSETS]),
+    Stage('data_assets', run_data_assets, list(DATA_ASSETS), [compressed_path(p) for p in DATA_ASSETS]),
+]
+
+
+def dependencies(stages):
+    """{stage name: names of the stages that write its inputs}"""
+    producers = {output: stage.name for stage in stages for output in stage.outputs}
+    return {stage.name: sorted({producers[path] for path in stage.inputs if path in producers} - {stage.name})
+            for stage in stages}
+
+
+def select(stages, targets, fetch=False, photos=False):
+    """The targets (default: everything) and all stages upstream of them"""
+    by_name = {stage.name: stage for stage in stages}
+    if not fetch:
+        by_name.pop('fetch')
+    if not photos:
+        by_name.pop('photos')
+    unknown = [name for name in targets if name not in by_name]
+    if unknown:
+        raise SystemExit(f"Unknown stage(s): {', '.join(unknown)} (available: {', '.join(by_name)})")
+    deps = dependencies(list(by_name.values()))
+    wanted, pending = set(), list(targets or by_name)
+    while pending:
+        name = pending.pop()
+        if name not in wanted:
+            wanted.add(name)
+            pending.extend(deps[name])
+    return [stage for stage in stages if stage.name in wanted]
+
+
+# ===================
+# CONTENT-ADDRESSED CACHE
+# ===================
+
+class BuildCache:
+    """File digests (memoized by size/mtime), per-stage run records and the object store"""
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        try:
+            manifest = read_json(path)
+        except (OSError, ValueError):
+            manifest = {}
+        self.files = manifest.get('files', {})
+        self.stages = manifest.get('stages', {})
+
+    def digest(self, path):
+        """sha256 of a file's bytes, or None if it does not exist"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        known = self.files.get(path)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        digest = sha.hexdigest()
+        self.files[path] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def key(self, stage):
+        """Hash over the stage name and the digest of every input"""
+        sha = hashlib.sha256(stage.name.encode())
+        for path in sorted(stage.inputs):
+            digest = self.digest(path)
+            if digest is None and path not in stage.optional:
+                raise FileNotFoundError(f"{stage.name}: input {path} does not exist")
+            sha.update(f"{path}\0{digest}\n".encode())
+        return sha.hexdigest()
+
+    def _object(self, digest):
+        return os.path.join(OBJECTS_DIR, digest[:2], digest)
+
+    def lookup(self, stage, key):
+        """'fresh' if the outputs are current, 'restored' if they were copied back from the store, else None"""
+        runs = self.stages.get(stage.name, [])
+        for run in runs:
+            if run['key'] != key:
+                continue
+            outputs = run['outputs']
+            if all(self.digest(path) == digest for path, digest in outputs.items()):
+                return 'fresh' if run is runs[0] else self._promote(stage, run, 'fresh')
+            if all(os.path.exists(self._object(digest)) for digest in outputs.values()):
+                for path, digest in outputs.items():
+                    if self.digest(path) != digest:
+                        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                        shutil.copyfile(self._object(digest), path)
+                return self._promote(stage, run, 'restored')
+        return None
+
+    def _promote(self, stage, run, status):
+        runs = self.stages[stage.name]
+        runs.remove(run)
+        runs.insert(0, run)
+        return status
+
+    def store(self, stage, key):
+        """Record a finished run and copy its outputs into the object store"""
+        outputs = {}
+        for path in stage.outputs:
+            self.files.pop(path, None)  # Rewritten within the same mtime tick: do not trust the stat
+            digest = self.digest(path)
+            if digest is None:
+                raise FileNotFoundError(f"{stage.name}: did not write {path}")
+            target = self._object(digest)
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copyfile(path, target)
+            outputs[path] = digest
+        runs = [run for run in self.stages.get(stage.name, []) if run['key'] != key]
+        self.stages[stage.name] = [{'key': key, 'outputs': outputs}] + runs[:KEEP_RUNS - 1]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'files': self.files, 'stages': self.stages}, f)
+        os.replace(tmp_path, self.path)
+
+
+def execute(name):
+    """Run one stage in a worker; returns (seconds, captured output)"""
+    stage = next(stage for stage in STAGES if stage.name == name)
+    log = io.StringIO()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        stage.run()
+    return time.perf_counter() - started, log.getvalue()
+
+
+def build(targets=(), force=False, fetch=False, jobs=None, verbose=False, photos=False):
+    """Run the selected stages in dependency order; returns True when all succeeded"""
+    started = time.perf_counter()
+    stages = select(STAGES, targets, fetch, photos)
+    deps = dependencies(stages)
+    cache = BuildCache()
+    done, failed, running = set(), set(), {}
+    executor = None
+    ok = True
+
+    def report(stage, status, seconds=None, output=''):
+        timing = f"{seconds * 1000:7.0f} ms" if seconds is not None else ' ' * 10
+        print(f"  {status:<9} {stage.name:<14} {timing}")
+        if verbose and output.strip():
+            print('\n'.join(f"              | {line}" for line in output.rstrip().split('\n')))
+
+    try:
+        while len(done) + len(failed) < len(stages):
+            for stage in stages:
+                name = stage.name
+                if name in done or name in failed or name in running:
+                    continue
+                if any(dep in failed for dep in deps[name]):
+                    failed.add(name)
+                    report(stage, '⏭️ skip')
+                    continue
+                if not all(dep in done for dep in deps[name]):
+                    continue
+                checked = time.perf_counter()
+                try:
+                    key = cache.key(stage)
+                except FileNotFoundError as e:
+                    failed.add(name)
+                    ok = False
+                    report(stage, '❌ failed')
+                    print(f"              {e}")
+                    continue
+                status = None if force or stage.always else cache.lookup(stage, key)
+                if status:
+                    done.add(name)
+                    report(stage, '✓ cached' if status == 'fresh' else '♻️ restored', time.perf_counter() - checked)
+                    continue
+                if executor is None:
+                    executor = ProcessPoolExecutor(max_workers=jobs)
+                running[name] = (executor.submit(execute, name), key)
+
+            if not running:
+                continue
+            finished, _ = wait([future for future, _ in running.values()], return_when=FIRST_COMPLETED)
+            for name in [n for n, (future, _) in running.items() if future in finished]:
+                future, key = running.pop(name)
+                stage = next(s for s in stages if s.name == name)
+                try:
+                    seconds, output = future.result()
+                    cache.store(stage, key)
+                    done.add(name)
+                    report(stage, '🔨 built', seconds, output)
+                except Exception as e:
+                    failed.add(name)
+                    ok = False
+                    report(stage, '❌ failed')
+                    print(f"              {type(e).__name__}: {e}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        cache.save()
+
+    print(f"{'✅' if ok else '❌'} {len(done)}/{len(stages)} stages in {time.perf_counter() - started:.2f} s")
+    return ok
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build conference data, FAQ, indexes and compressed assets')
+    parser.add_argument('stages', nargs='*', help=f"stages to build (default: all): {', '.join(s.name for s in STAGES)}")
+    parser.add_argument('--force', action='store_true', help='ignore the cache')
+    parser.add_argument('--fetch', action='store_true', help='pull bios and taglines from the Sessionize API first')
+    parser.add_argument('--photos', action='store_true', help='download and resize speaker photos (data/photos/)')
+    parser.add_argument('--jobs', type=int, default=None, help='parallel worker processes (default: CPU count)')
+    parser.add_argument('-v', '--verbose', action='store_true', help="show the stages' own output")
+    args = parser.parse_args()
+
+    sys.exit(0 if build(args.stages, args.force, args.fetch, args.jobs, args.verbose, args.photos) else 1)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Personal schedule builder
+Weighted interval scheduling over conference.json: every talk gets a weight
+from the attendee's interests, favorites and must-attend list, and the
+planner picks the non-overlapping set with the highest total weight, minus a
+penalty for changing rooms without a break in between.
+
+Sessions are swept in start order while per-room best plans are kept, so a
+plan costs O(n log n + n * rooms) - milliseconds even for multi-day events
+with 20 tracks. Ties are broken by session order, so the same input always
+gives the same plan.
+"""
+
+from bisect import bisect_left
+from datetime import datetime
+from functools import lru_cache
+
+from fallback import event_timezone
+from generate_faq import TOPICS
+from normalize import normalize
+
+BASE_WEIGHT = 1.0            # Any talk beats an empty slot
+INTEREST_WEIGHT = 3.0        # Per interest term in the title (description counts a third)
+FAVORITE_WEIGHT = 10.0
+MUST_ATTEND_WEIGHT = 1000.0  # More than any combination of other talks
+ROOM_CHANGE_PENALTY = 0.5
+TRANSFER_MINUTES = 10        # A gap this long (or a break) makes a room change free
+
+
+def parse_time(iso_string):
+    return datetime.fromisoformat(iso_string.replace('Z', '+00:00'))
+
+
+def interest_terms(interests):
+    """Normalized search terms; topic names from generate_faq expand to their keywords"""
+    topics = {name.lower(): keywords for name, keywords in TOPICS.items()}
+    terms = set()
+    for interest in interests:
+        for term in topics.get(interest.strip().lower(), [interest]):
+            term = normalize(term, 'any')
+            if term:
+                terms.add(term)
+    return terms
+
+
+@lru_cache(maxsize=65536)
+def padded_text(text):
+    """Normalized text with spaces around it for whole-term matching (cached across requests)"""
+    return f" {normalize(text, 'any')} "
+
+
+def relevance(session, terms):
+    """How well a session matches the interest terms"""
+    title = padded_text(session['title'])
+    description = padded_text(session['description'])
+    score = 0.0
+    for term in terms:
+        padded = f" {term} "
+        if padded in title:
+            score += INTEREST_WEIGHT
+        elif padded in description:
+            score += INTEREST_WEIGHT / 3
+    return score
+
+
+def plan_schedule(data, interests=(), favorites=(), must_attend=(),
+                  room_change_penalty=ROOM_CHANGE_PENALTY, transfer_minutes=TRANSFER_MINUTES):
+    """Best non-overlapping plan
+
+    Returns {'sessions': [...], 'breaks': [...], 'score', 'unscheduled_must_attend', 'unknown_ids'}.
+    Each planned session carries its relevance and why it was picked.
+    """
+    terms = interest_terms(interests)
+    favorites, must_attend = set(favorites), set(must_attend)
+    known_ids = {s['id'] for s in data['sessions']}
+
+    talks, breaks = [], []
+    for session in data['sessions']:
+        start, end = parse_time(session['start']), parse_time(session['end'])
+        if end <= start:
+            continue
+        if not session['speakers']:
+            breaks.append((start.timestamp(), end.timestamp(), session))
+            continue
+        score = relevance(session, terms)
+        if session['id'] in must_attend:
+            weight, reason = MUST_ATTEND_WEIGHT + score, 'must_attend'
+        elif session['id'] in favorites:
+            weight, reason = FAVORITE_WEIGHT + score, 'favorite'
+        elif score:
+            weight, reason = BASE_WEIGHT + score, 'interest'
+        else:
+            weight, reason = BASE_WEIGHT, 'filler'
+        talks.append((start.timestamp(), end.timestamp(), session['id'], session, weight, score, reason))
+    talks.sort(key=lambda t: (t[0], t[1], t[2]))
+    breaks.sort(key=lambda b: b[0])
+
+    # After a talk ends, changing rooms becomes free once a break has passed or enough time went by
+    break_starts = [b_start for b_start, _, _ in breaks]
+    transfer = transfer_minutes * 60
+    free_at = []
+    for i, (_, end, *_rest) in enumerate(talks):
+        release = end + transfer
+        next_break = bisect_left(break_starts, end)
+        if next_break < len(breaks):
+            release = min(release, breaks[next_break][1])
+        free_at.append((release, i))
+    free_at.sort()
+    by_end = sorted(range(len(talks)), key=lambda i: (talks[i][1], i))
+
+    best = [0.0] * len(talks)
+    parent = [None] * len(talks)
+    room_best = {}              # room -> (value, index) of the best plan ending there
+    free_best = (0.0, None)     # best plan after which any room is free
+    ended = released = 0
+
+    for i, (start, _, _, session, weight, _, _) in enumerate(talks):
+        while ended < len(by_end) and talks[by_end[ended]][1] <= start:
+            j = by_end[ended]
+            room = talks[j][3]['room_id']
+            if best[j] > room_best.get(room, (float('-inf'),))[0]:
+                room_best[room] = (best[j], j)
+            ended += 1
+        while released < len(free_at) and free_at[released][0] <= start:
+            j = free_at[released][1]
+            if talks[j][1] <= start and best[j] > free_best[0]:
+                free_best = (best[j], j)
+            released += 1
+
+        value, previous = free_best
+        for room, (room_value, j) in room_best.items():
+            if room != session['room_id']:
+                room_value -= room_change_penalty
+            if room_value > value:
+                value, previous = room_value, j
+        best[i] = value + weight
+        parent[i] = previous
+
+    planned = []
+    if talks:
+        i = max(range(len(talks)), key=lambda k: (best[k], -k))
+        while i is not None:
+            planned.append(i)
+            i = parent[i]
+    planned.reverse()
+
+    tz = event_timezone(data)
+    chosen = {talks[i][2] for i in planned}
+    return {
+        'sessions': [{
+            'id': talks[i][2],
+            'title': talks[i][3]['title'],
+            'start': talks[i][3]['start'],
+            'end': talks[i][3]['end'],
+            'local_time': datetime.fromtimestamp(talks[i][0], tz).strftime('%H:%M'),
+            'room': talks[i][3]['room'],
+            'speakers': talks[i][3]['speakers'],
+            'relevance': round(talks[i][5], 2),
+            'reason': talks[i][6]
+        } for i in planned],
+        'breaks': [{
+            'id': session['id'],
+            'title': session['title'],
+            'local_time': datetime.fromtimestamp(b_start, tz).strftime('%H:%M')
+        } for b_start, _, session in breaks],
+        'score': round(best[planned[-1]], 2) if planned else 0.0,
+        'unscheduled_must_attend': sorted(must_attend & known_ids - chosen),
+        'unknown_ids': sorted((favorites | must_attend) - known_ids)
+    }
@@ -0,0 +1,14 @@
+// Generated by pipeline.py (precache stage): files sw.js precaches, by content hash
+self.PRECACHE_MANIFEST = {
+  "version": "cb53c90f76",
+  "assets": {
+    "index.html": "82517bfa42",
+    "app.js": "4cf4c97aad",
+    "jsonpatch.js": "405f0ad9d6",
+    "styles.css": "60dc123503",
+    "manifest.json": "697c7df0ef",
+    "favicon.png": "6a0ab59691",
+    "icon-192.png": "6a0ab59691",
+    "icon-512.png": "6a0ab59691"
+  }
+};
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Precompute model answers for predictable questions at build time
+Generates anticipated questions from conference.json (in the style of
+generate_faq.py), sends them to the model in batches with bounded concurrency,
+checkpoints every answer so an interrupted run resumes where it stopped, and
+writes data/precomputed.json. generate_faq.py merges those answers into
+faq.json, so the FAQ tier serves them at zero runtime cost.
+
+Usage:
+    python precompute_answers.py                  # real API (ANTHROPIC_API_KEY)
+    python precompute_answers.py --stand-in       # local stand-in, output in build/stand-in/
+    python precompute_answers.py --upstream http://127.0.0.1:8089/v1/messages
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from generate_faq import TOPICS, format_time
+from prompts import build_prompt
+from router import MODEL_TIERS
+
+DEFAULT_UPSTREAM = os.environ.get('ANTHROPIC_API_URL', 'https://api.anthropic.com/v1/messages')
+RETRY_STATUSES = (429, 500, 502, 503, 529)
+
+
+def anticipated_questions(data):
+    """Questions that miss the keyword FAQ but have stable, reusable answers, one per language"""
+    real_sessions = [s for s in data['sessions'] if s['speakers']]
+    questions = []
+
+    def add(language, question, keywords):
+        questions.append({"question": question, "keywords": keywords, "language": language})
+
+    # Topic summaries: "summarize all Fabric sessions"
+    for topic_name, keywords in TOPICS.items():
+        matching = [s for s in real_sessions
+                    if any(k.lower() in f"{s['title']} {s['description']}".lower() for k in keywords)]
+        if len(matching) >= 2:
+            topic = topic_name.lower()
+            add('en', f"Summarize all {topic_name} sessions",
+                [f"summarize all {topic}", f"summarize {topic} sessions", f"summary of {topic} sessions",
+                 f"overview of {topic} sessions"])
+            add('cs', f"Shrň všechny přednášky na téma {topic_name}",
+                [f"shrň {topic}", f"shrnutí {topic}", f"přehled {topic}"])
+            add('de', f"Fasse alle {topic_name} Sessions zusammen",
+                [f"zusammenfassung {topic}", f"fasse {topic} zusammen", f"überblick {topic}"])
+
+    # Parallel-session comparisons: "compare the 13:45 options"
+    sessions_by_time = {}
+    for session in real_sessions:
+        sessions_by_time.setdefault(session['start'][:16], []).append(session)
+    for time_key in sorted(sessions_by_time):
+        if len(sessions_by_time[time_key]) > 1:
+            time_str = format_time(time_key)
+            add('en', f"Compare the {time_str} options",
+                [f"compare the {time_str}", f"compare {time_str}", f"compare sessions at {time_str}",
+                 f"difference {time_str}"])
+            add('cs', f"Porovnej přednášky v {time_str}", [f"porovnej {time_str}", f"srovnání {time_str}"])
+            add('de', f"Vergleiche die Sessions um {time_str}", [f"vergleiche {time_str}", f"vergleich {time_str}"])
+
+    # Room summaries: "summarize everything in Flamenco"
+    for room in data['rooms']:
+        if any(s['room_id'] == room['id'] for s in real_sessions):
+            add('en', f"Summarize the sessions in {room['name']}",
+                [f"summarize {room['name'].lower()}", f"summarize {room['id']}",
+                 f"summary of {room['id']}", f"overview of {room['id']}"])
+
+    return questions
+
+
+def job_id(model, prompt):
+    """Content address of a question: changes when the schedule or model changes"""
+    return hashlib.sha256(f"{model}\n{prompt}".encode('utf-8')).hexdigest()[:16]
+
+
+def load_checkpoint(path):
+    """Answers already computed by earlier (possibly interrupted) runs"""
+    done = {}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line from an interrupted run
+                done[record['id']] = record
+    return done
+
+
+def ask(url, api_key, model, prompt, max_tokens, retries=3):
+    """One Messages API call with exponential backoff on retryable errors"""
+    for attempt in range(retries + 1):
+        try:
+            response = requests.post(
+                url,
+                headers={
+                    'Content-Type': 'application/json',
+                    'x-api-key': api_key,
+                    'anthropic-version': '2023-06-01'
+                },
+                json={'model': model, 'max_tokens': max_tokens, 'messages': [{'role': 'user', 'content': prompt}]},
+                timeout=120
+            )
+        except requests.exceptions.RequestException as e:
+            if attempt == retries:
+                raise
+            print(f"  retrying after error: {e}")
+        else:
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                raise RuntimeError(f"API error {response.status_code}: {response.text[:200]}")
+        time.sleep(2 ** attempt)
+
+
+def precompute(data, url, api_key, tier='standard', concurrency=4, batch_size=16, max_tokens=1024,
+               checkpoint_path='data/.precompute_checkpoint.jsonl'):
+    """Answer every anticipated question, resuming from the checkpoint; returns FAQ entries"""
+    model = MODEL_TIERS[tier]['model']
+    pricing = MODEL_TIERS[tier]
+    jobs = []
+    for item in anticipated_questions(data):
+        prompt = build_prompt(data, item['question'], item['language'])
+        jobs.append(dict(item, id=job_id(model, prompt), prompt=prompt))
+
+    done = load_checkpoint(checkpoint_path)
+    pending = [job for job in jobs if job['id'] not in done]
+    print(f"{len(jobs)} anticipated questions, {len(jobs) - len(pending)} already answered, {len(pending)} to go")
+
+    spent = 0.0
+    failed = []
+
+    def run(job):
+        result = ask(url, api_key, model, job['prompt'], max_tokens)
+        usage = result.get('usage', {})
+        cost = (usage.get('input_tokens', 0) * pricing['input_price'] +
+                usage.get('output_tokens', 0) * pricing['output_price']) / 1_000_000
+        answer = ''.join(block.get('text', '') for block in result.get('content', []))
+        return {'id': job['id'], 'question': job['question'], 'answer': answer, 'cost': cost}
+
+    os.makedirs(os.path.dirname(checkpoint_path) or '.', exist_ok=True)
+    with open(checkpoint_path, 'a', encoding='utf-8') as checkpoint, ThreadPoolExecutor(concurrency) as pool:
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            started = time.perf_counter()
+            futures = [(job, pool.submit(run, job)) for job in batch]
+            answered = 0
+            for job, future in futures:
+                # Keep every answer already paid for, even when another job in the batch failed
+                try:
+                    record = future.result()
+                except (requests.exceptions.RequestException, RuntimeError) as e:
+                    failed.append(job)
+                    print(f"  ⚠️ {job['question']!r} ({job['language']}) failed: {e}")
+                    continue
+                checkpoint.write(json.dumps(record, ensure_ascii=False) + '\n')
+                done[record['id']] = record
+                spent += record['cost']
+                answered += 1
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+            print(f"  batch {start // batch_size + 1}: {answered} answers in "
+                  f"{time.perf_counter() - started:.1f}s, ${spent:.4f} spent this run")
+
+    if failed:
+        raise RuntimeError(f"{len(failed)} questions failed after retries; run again to answer only those")
+
+    return [{
+        "question": job['question'],
+        "answer": done[job['id']]['answer'],
+        "keywords": job['keywords'],
+        "category": "precomputed"
+    } for job in jobs if done[job['id']]['answer']]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Precompute model answers for anticipated questions')
+    parser.add_argument('--upstream', default=DEFAULT_UPSTREAM, help='Messages API URL')
+    parser.add_argument('--stand-in', action='store_true', help='run against a local stand-in upstream')
+    parser.add_argument('--tier', default='standard', choices=sorted(MODEL_TIERS))
+    parser.add_argument('--concurrency', type=int, default=4, help='parallel upstream calls')
+    parser.add_argument('--batch-size', type=int, default=16, help='answers per checkpoint flush')
+    parser.add_argument('--output', help='default data/precomputed.json (build/stand-in/ with --stand-in)')
+    parser.add_argument('--checkpoint', help='default data/.precompute_checkpoint.jsonl')
+    args = parser.parse_args()
+
+    output_dir = 'build/stand-in' if args.stand_in else 'data'
+    output_file = args.output or os.path.join(output_dir, 'precomputed.json')
+    checkpoint_file = args.checkpoint or os.path.join(output_dir, '.precompute_checkpoint.jsonl')
+
+    url, api_key = args.upstream, os.environ.get('ANTHROPIC_API_KEY')
+    if args.stand_in:
+        from stand_in_upstream import start_stand_in
+        _, url = start_stand_in()
+        api_key = 'stand-in'
+    if not api_key:
+        print("Set ANTHROPIC_API_KEY (or use --stand-in)")
+        exit(1)
+
+    with open('data/conference.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    entries = precompute(data, url, api_key, args.tier, args.concurrency, args.batch_size,
+                         checkpoint_path=checkpoint_file)
+
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, indent=2, ensure_ascii=False)
+
+    print(f"\nSaved {len(entries)} precomputed answers to: {output_file}")
+    print("Next step: Run 'python generate_faq.py' to merge them into faq.json")
@@ -2,10 +2,11 @@
 """
 Process Sessionize data and create structured JSON for the conference app.
 """
-import json
 import re
 from datetime import datetime
 
+from model import Event, dump_conference
+
 # Data ze Sessionize API (zatím mock data, později nahradíme skutečnými)
 sessions_data = [
     {
@@ -17,8 +18,7 @@ sessions_data = [
         "room_id": "foxtrott",
         "start": "2026-01-23T08:15:00Z",
         "end": "2026-01-23T09:15:00Z",
-        "duration": 60,
-        "floor": None
+        "duration": 60
     },
     {
         "id": "1023187",
@@ -29,8 +29,7 @@ sessions_data = [
         "room_id": "flamenco",
         "start": "2026-01-23T08:15:00Z",
         "end": "2026-01-23T09:15:00Z",
-        "duration": 60,
-        "floor": None
+        "duration": 60
     }
 ]
 
@@ -76,12 +75,11 @@ def create_conference_data():
     return conference
 
 if __name__ == "__main__":
-    data = create_conference_data()
+    event = Event.from_dict(create_conference_data())
     
     # Save to JSON
-    with open('data/conference.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    dump_conference(event)
     
-    print(f"✓ Created conference.json with {len(data['sessions'])} sessions")
-    print(f"✓ {len(data['speakers'])} speakers")
-    print(f"✓ {len(data['rooms'])} rooms")
+    print(f"✓ Created conference.json with {len(event.sessions)} sessions")
+    print(f"✓ {len(event.speakers)} speakers")
+    print(f"✓ {len(event.rooms)} rooms")
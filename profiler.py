@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Opt-in sampling profiler for individual server requests
+Writes collapsed stacks (one "frame;frame;frame count" line per stack) that
+flamegraph.pl, speedscope and inferno can read directly
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class StackSampler:
+    """Samples the call stack of one thread at a fixed interval"""
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        return self.stacks
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            names.reverse()
+            self.stacks[';'.join(names)] += 1
+            self.samples += 1
+
+
+def prune_profiles(output_dir, keep):
+    """Delete the oldest profile files so at most `keep` remain"""
+    files = [os.path.join(output_dir, name) for name in os.listdir(output_dir) if name.endswith('.folded')]
+    files.sort(key=os.path.getmtime)
+    for path in files[:max(0, len(files) - keep)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def install_profiler(app, output_dir='profiles', sample_rate=0.0, admin_token=None,
+                     header='X-Profile', interval=0.005, keep=50):
+    """Attach request hooks that profile a sample of requests
+
+    Nothing is registered when sampling is off and no admin token is set,
+    so a disabled profiler costs nothing per request.
+    """
+    if sample_rate <= 0 and not admin_token:
+        return False
+
+    from flask import g, request
+
+    os.makedirs(output_dir, exist_ok=True)
+    lock = threading.Lock()
+
+    @app.before_request
+    def start_profile():
+        forced = admin_token is not None and request.headers.get(header) == admin_token
+        if forced or random.random() < sample_rate:
+            g.profiler = StackSampler(threading.get_ident(), interval)
+            g.profiler_forced = forced
+            g.profiler.start()
+
+    @app.after_request
+    def tag_profile(response):
+        if getattr(g, 'profiler_forced', False):
+            response.headers['X-Profile-Id'] = g.profiler_id = f"{int(time.time() * 1000)}-{os.getpid()}"
+        return response
+
+    @app.teardown_request
+    def stop_profile(exc):
+        sampler = g.pop('profiler', None)
+        if sampler is None:
+            return
+        stacks = sampler.stop()
+        profile_id = g.pop('profiler_id', None) or f"{int(time.time() * 1000)}-{os.getpid()}"
+        route = request.path.strip('/').replace('/', '_') or 'index'
+        filename = f"{profile_id}-{request.method}-{route}-{int(sampler.elapsed * 1000)}ms.folded"
+        with open(os.path.join(output_dir, filename), 'w', encoding='utf-8') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        print(f"🔬 Profiled {request.method} {request.path}: {sampler.samples} samples, "
+              f"{sampler.elapsed * 1000:.0f} ms -> {filename}")
+        with lock:
+            prune_profiles(output_dir, keep)
+
+    return True
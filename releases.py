@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Versioned data releases with JSON Patch deltas
+Every build stamps conference.json + faq.json with a content version (a hash
+of both files) and writes data/releases.json: the current version, the last
+KEEP_RELEASES versions with their per-file hashes, and for each of them an
+RFC 6902 patch straight to the current data. A returning attendee whose
+cached data is a few releases old downloads one small patch (a room swap, a
+cancelled talk) instead of both files; /api/data/version serves the patch for
+the client's version and sw.js applies it to its cached copies.
+
+Patches are diffed against snapshots of earlier releases kept under
+build/releases/ (not committed). A version whose snapshot is gone, or whose
+patch would be nearly as large as the files themselves, gets no patch, and
+its clients download the changed files in full.
+
+Usage:
+    python releases.py                          # release data/ (after a rebuild)
+    python releases.py --data-dir events/foo
+    python releases.py --since 1a2b3c4d5e6f     # what a client at that version would get
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+
+from json_patch import diff
+
+RELEASES_FILE = 'releases.json'
+RELEASE_FILES = ('conference.json', 'faq.json')
+SNAPSHOT_DIR = 'build/releases'
+KEEP_RELEASES = 10        # Versions a client can be behind and still get a patch
+PATCH_MAX_RATIO = 0.5     # A patch larger than this share of the changed files is not worth it
+VERSION_CHARS = 12
+
+
+def file_hashes(data_dir):
+    """{file name: content hash} for the released files"""
+    hashes = {}
+    for name in RELEASE_FILES:
+        with open(os.path.join(data_dir, name), 'rb') as f:
+            hashes[name] = hashlib.sha256(f.read()).hexdigest()[:VERSION_CHARS]
+    return hashes
+
+
+def version_of(hashes):
+    return hashlib.sha256(json.dumps(hashes, sort_keys=True).encode()).hexdigest()[:VERSION_CHARS]
+
+
+def load_releases(data_dir):
+    """The data directory's releases.json, or None if it has not been released"""
+    try:
+        with open(os.path.join(data_dir, RELEASES_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def unreleased(data_dir):
+    """A release record for data that has no (current) releases.json: the version, no history, no patches"""
+    hashes = file_hashes(data_dir)
+    version = version_of(hashes)
+    return {'version': version, 'files': hashes, 'history': [{'version': version, 'files': hashes}], 'patches': {}}
+
+
+def snapshot_root(data_dir, snapshot_dir=SNAPSHOT_DIR):
+    return os.path.join(snapshot_dir, os.path.normpath(data_dir).replace(os.sep, '_'))
+
+
+def _encoded_size(value):
+    return len(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def make_release(data_dir='data', snapshot_dir=SNAPSHOT_DIR, keep=KEEP_RELEASES):
+    """Stamp the data directory's current files as a release and write its releases.json"""
+    hashes = file_hashes(data_dir)
+    version = version_of(hashes)
+    previous = load_releases(data_dir) or {'history': []}
+    history = [h for h in previous['history'] if h['version'] != version][-(keep - 1):] if keep > 1 else []
+    history.append({'version': version, 'files': hashes})
+
+    root = snapshot_root(data_dir, snapshot_dir)
+    current_dir = os.path.join(root, version)
+    if not all(os.path.exists(os.path.join(current_dir, name)) for name in RELEASE_FILES):
+        os.makedirs(current_dir, exist_ok=True)
+        for name in RELEASE_FILES:
+            shutil.copyfile(os.path.join(data_dir, name), os.path.join(current_dir, name))
+
+    current = {}
+    for name in RELEASE_FILES:
+        with open(os.path.join(data_dir, name), 'r', encoding='utf-8') as f:
+            current[name] = json.load(f)
+
+    patches = {}
+    for entry in history[:-1]:
+        changed = [name for name in RELEASE_FILES if entry['files'].get(name) != hashes[name]]
+        old_dir = os.path.join(root, entry['version'])
+        if not all(os.path.exists(os.path.join(old_dir, name)) for name in changed):
+            continue
+        ops = {}
+        for name in changed:
+            with open(os.path.join(old_dir, name), 'r', encoding='utf-8') as f:
+                ops[name] = diff(json.load(f), current[name])
+        if _encoded_size(ops) <= PATCH_MAX_RATIO * sum(_encoded_size(current[name]) for name in changed):
+            patches[entry['version']] = ops
+
+    # Snapshots are only needed for versions still in the history
+    kept = {entry['version'] for entry in history}
+    for name in os.listdir(root):
+        if name not in kept:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+    release = {'version': version, 'files': hashes, 'history': history, 'patches': patches}
+    with open(os.path.join(data_dir, RELEASES_FILE), 'w', encoding='utf-8') as f:
+        json.dump(release, f, ensure_ascii=False, separators=(',', ':'))
+    return release
+
+
+def version_info(release, since=None):
+    """What a client holding version `since` needs: the files that changed and, if there is one, their patch
+
+    `patch` is None when the client must download the changed files in full
+    (unknown or too old a version, or no patch was worth keeping).
+    """
+    info = {'version': release['version'], 'files': release['files'], 'since': since,
+            'current': since == release['version'], 'changed': [], 'patch': None}
+    if since is None or info['current']:
+        return info
+    old = next((entry['files'] for entry in release['history'] if entry['version'] == since), None)
+    if old is None:
+        info['changed'] = list(release['files'])
+        return info
+    info['changed'] = [name for name, digest in release['files'].items() if old.get(name) != digest]
+    info['patch'] = release['patches'].get(since)
+    return info
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Stamp a data release and write its JSON Patch deltas')
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--since', help='print what a client at this version would get instead of releasing')
+    args = parser.parse_args()
+
+    if args.since:
+        release = load_releases(args.data_dir) or unreleased(args.data_dir)
+        info = version_info(release, args.since)
+        print(f"Current version: {info['version']}")
+        if info['current']:
+            print("✅ Up to date")
+        elif info['patch'] is not None:
+            print(f"🩹 Patch for {', '.join(info['changed'])}: "
+                  f"{sum(len(ops) for ops in info['patch'].values())} operations, {_encoded_size(info['patch'])} bytes")
+        else:
+            print(f"📦 Full download of {', '.join(info['changed'])}")
+    else:
+        release = make_release(args.data_dir)
+        print(f"Released {release['version']} ({len(release['history'])} versions, {len(release['patches'])} patches)")
+        print(f"Saved to: {os.path.join(args.data_dir, RELEASES_FILE)}")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+In-memory cache of answers returned by the upstream model
+Answers are stored under the exact prompt (safe to serve again as-is) and
+indexed by the attendee's question so degraded mode can reuse them
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from normalize import normalize
+
+
+def question_key(message, language='en'):
+    """Cache key for an attendee question"""
+    return f"{language}:{normalize(message, language)}"
+
+
+def prompt_key(prompt):
+    """Cache key for a full upstream prompt"""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Bounded LRU cache of model answers with a freshness TTL"""
+
+    def __init__(self, max_entries=500, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._by_prompt = OrderedDict()
+        self._by_question = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _put(self, table, key, answer):
+        table[key] = (answer, time.monotonic())
+        table.move_to_end(key)
+        while len(table) > self.max_entries:
+            table.popitem(last=False)
+
+    def _get(self, table, key, max_age):
+        entry = table.get(key)
+        if entry is None:
+            return None
+        answer, stored_at = entry
+        if max_age is not None and time.monotonic() - stored_at > max_age:
+            return None
+        table.move_to_end(key)
+        return answer
+
+    def store(self, prompt, message, language, answer):
+        with self._lock:
+            self._put(self._by_prompt, prompt_key(prompt), answer)
+            self._put(self._by_question, question_key(message, language), answer)
+
+    def lookup_prompt(self, prompt):
+        """Fresh answer for exactly this prompt"""
+        with self._lock:
+            return self._get(self._by_prompt, prompt_key(prompt), self.ttl_seconds)
+
+    def lookup_question(self, message, language='en'):
+        """Any answer for this question, however old (degraded mode)"""
+        with self._lock:
+            return self._get(self._by_question, question_key(message, language), None)
+
+    def __len__(self):
+        return len(self._by_prompt)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Route chat questions to a model tier using cheap local features
+Simple lookups that just missed the FAQ go to a small, cheap model; open-ended
+summaries, comparisons and recommendations go to the standard model
+"""
+
+import os
+import re
+
+from faq_search import score_faq
+from normalize import find_times
+
+# Model and pricing ($ per million tokens) for each tier
+MODEL_TIERS = {
+    'light': {
+        'model': os.environ.get('LIGHT_MODEL', 'claude-haiku-4-5-20251001'),
+        'input_price': float(os.environ.get('LIGHT_INPUT_PRICE', '1.0')),
+        'output_price': float(os.environ.get('LIGHT_OUTPUT_PRICE', '5.0'))
+    },
+    'standard': {
+        'model': os.environ.get('STANDARD_MODEL', 'claude-sonnet-4-20250514'),
+        'input_price': float(os.environ.get('STANDARD_INPUT_PRICE', '3.0')),
+        'output_price': float(os.environ.get('STANDARD_OUTPUT_PRICE', '15.0'))
+    }
+}
+DEFAULT_TIER = 'standard'
+
+# Words that ask for synthesis over several sessions (en/cs/de)
+COMPLEX_PATTERN = re.compile(
+    r'\b(summari[sz]e|summary|compare|comparison|difference|versus|vs|recommend|suggest|plan|'
+    r'schedule for|all|every|each|overview|best|should i|why|explain|'
+    r'shrň|shrnutí|porovn\w*|doporuč\w*|přehled|všech|všechny|každ\w*|proč|'
+    r'zusammen\w*|vergleich\w*|empf(?:ie|e)hl\w*|überblick|alle|jede\w*|warum)\b',
+    re.IGNORECASE
+)
+
+# English words per word of each language: the length thresholds in route() are in English words, and
+# Czech (no articles, cases instead of prepositions) and German (compounds) say the same in fewer words
+WORD_WEIGHTS = {'en': 1.0, 'cs': 1.25, 'de': 1.1}
+
+
+def entity_names(conference_data):
+    """Lowercased speaker, session and room names a question can mention"""
+    entities = set()
+    for speaker in conference_data.get('speakers', []):
+        name = speaker['name'].lower()
+        entities.add(name)
+        entities.add(name.split()[-1])  # "Kornelis" alone is enough
+    for session in conference_data.get('sessions', []):
+        if session['speakers']:
+            entities.add(session['title'].lower())
+    for room in conference_data.get('rooms', []):
+        entities.add(room['name'].lower())
+        entities.add(room['id'].lower())
+    return {e for e in entities if len(e) > 3}
+
+
+class QuestionRouter:
+    """Deterministic feature-based tier classifier"""
+
+    def __init__(self, conference_data, faq, entities=None):
+        self.faq = faq
+        # Prebuilt names (binindex.py) skip the pass over the conference data
+        self.entities = set(entities) if entities is not None else entity_names(conference_data)
+
+    def features(self, message, language='en', faq_score=None):
+        text = message.lower()
+        if faq_score is None:
+            matches = score_faq(self.faq, message, language)
+            faq_score = matches[0][0] if matches else 0
+        mentioned = {e for e in self.entities if e in text}
+        # A surname is already counted by its full name
+        mentioned = {e for e in mentioned if not any(e != other and e in other for other in mentioned)}
+        words = len(text.split())
+        return {
+            'words': words,
+            'language': language,
+            'length': words * WORD_WEIGHTS.get(language, 1.0),  # In English words
+            'faq_score': faq_score,
+            'entities': len(mentioned) + len(find_times(message)),
+            'complex': bool(COMPLEX_PATTERN.search(text))
+        }
+
+    def route(self, message, language='en', faq_score=None):
+        """Return (tier, features) for a question (pass `faq_score` when the FAQ was already scored)
+
+        The language enters through `length`, the word count in English words.
+        """
+        f = self.features(message, language, faq_score)
+        complexity = 0
+        if f['complex']:
+            complexity += 2
+        if f['length'] > 20:
+            complexity += 1
+        if f['length'] > 40:
+            complexity += 1
+        if f['entities'] >= 3:
+            complexity += 1
+        if f['faq_score'] >= 10:
+            complexity -= 1  # Near-miss: the FAQ almost had it
+        if f['entities'] == 1 and f['length'] <= 12:
+            complexity -= 1  # Single lookup ("when does X talk?")
+        if f['entities'] == 0 and not f['complex'] and f['length'] <= 8:
+            complexity -= 1  # Short factual question about the event
+        tier = 'light' if complexity < 0 else DEFAULT_TIER
+        return tier, f
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Full-text search over sessions and speakers
+A positional inverted index over session titles, speaker names, descriptions,
+speaker taglines and bios, ranked with BM25F: term frequencies are weighted
+and length-normalized per field, then saturated once per document, so a word
+in a title counts for more than the same word deep in a bio.
+
+The BM25F contribution of a term to a document does not depend on the query,
+so it is computed once at build time ("impacts"); a query only adds up
+impacts along the postings of its terms. Positions are kept for phrase
+queries ("execution plan"), which match words in order within one field.
+
+Tokens are case- and diacritic-folded, stopwords are dropped (positions still
+count them, so phrases keep their gaps) and a light suffix stemmer for
+English, Czech or German strips inflections: "Fabricu" and "Fabric" meet.
+Documents are analyzed in the event's language and queries in theirs; a
+query word whose stem is not indexed falls back to the document-language stem.
+
+Usage:
+    python search.py "execution plans"            # search data/conference.json
+    python search.py '"sql server" preview' --page 2
+"""
+
+import argparse
+import heapq
+import json
+import math
+import re
+import time
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from operator import itemgetter
+
+from normalize import STOPWORDS, TOKEN_PATTERN, fold_diacritics
+
+# BM25F: per-field weight and length normalization (b), one saturation constant
+FIELDS = ('title', 'speakers', 'description', 'bio')
+FIELD_WEIGHTS = (3.0, 3.0, 1.0, 0.7)
+FIELD_B = (0.3, 0.3, 0.75, 0.75)
+K1 = 1.2
+FIELD_SHIFT = 24  # Position codes are field << FIELD_SHIFT | position
+MAX_POSITION = (1 << FIELD_SHIFT) - 1
+
+PAGE_SIZE = 10
+MAX_PAGE_SIZE = 50
+PHRASE_PATTERN = re.compile(r'"([^"]*)"')
+
+# Light stemmers (after folding): longest matching suffix first, only if enough of the word remains
+EN_SUFFIXES = (('ies', 'y', 3), ('sses', 'ss', 3), ('ing', '', 4), ('es', 'e', 3), ('s', '', 3))
+CS_SUFFIXES = [(s, '', 3) for s in ('atech', 'etem', 'atum', 'ech', 'ich', 'eho', 'emi', 'emu', 'ete', 'eti', 'iho',
+                                    'imi', 'imu', 'ach', 'ata', 'aty', 'ych', 'ama', 'ami', 'ove', 'ovi', 'ymi', 'em',
+                                    'es', 'im', 'um', 'at', 'am', 'os', 'us', 'ym', 'mi', 'ou', 'a', 'e', 'i', 'o', 'u',
+                                    'y')]
+DE_SUFFIXES = [(s, '', 3) for s in ('ern', 'em', 'en', 'er', 'es', 'e', 'n', 's')]
+SUFFIXES = {'en': EN_SUFFIXES, 'cs': CS_SUFFIXES, 'de': DE_SUFFIXES}
+KEEP_ENDINGS = {'en': ('ss', 'us', 'is', 'aes', 'ees', 'oes')}  # "class", "status", "analysis" keep their s
+
+
+@lru_cache(maxsize=1 << 16)  # A catalog's vocabulary is small; the same words are stemmed over and over
+def stem(token, language):
+    if token.isdigit() or ':' in token:
+        return token
+    if token.endswith(KEEP_ENDINGS.get(language, ())):
+        return token
+    for suffix, replacement, keep in SUFFIXES.get(language, EN_SUFFIXES):
+        if token.endswith(suffix) and len(token) - len(suffix) >= keep:
+            return token[:-len(suffix)] + replacement
+    return token
+
+
+def folded_tokens(text):
+    return TOKEN_PATTERN.findall(fold_diacritics(text.casefold()))
+
+
+def analyze(text, language):
+    """[(position, term)] for a text: folded, stopwords dropped (positions still count them), stemmed"""
+    stopwords = STOPWORDS.get(language, STOPWORDS['en'])
+    return [(i, stem(t, language)) for i, t in enumerate(folded_tokens(text)) if t not in stopwords]
+
+
+def parse_query(query):
+    """(phrases, words): the quoted parts and the rest of a query"""
+    phrases = [p for p in PHRASE_PATTERN.findall(query) if p.strip()]
+    return phrases, PHRASE_PATTERN.sub(' ', query).replace('"', ' ')
+
+
+def documents(conference_data):
+    """[(kind, id, field texts)]: one per talk and one per speaker"""
+    docs = []
+    for session in conference_data.get('sessions', []):
+        if session['speakers']:
+            docs.append(('session', session['id'],
+                         (session['title'], ' '.join(session['speakers']), session.get('description') or '', '')))
+    for speaker in conference_data.get('speakers', []):
+        docs.append(('speaker', speaker['id'],
+                     (speaker.get('title') or '', speaker['name'], '', speaker.get('bio') or '')))
+    return docs
+
+
+class SearchIndex:
+    """Postings per term: document numbers, BM25F impacts and field-coded positions"""
+
+    def __init__(self, docs, language='en'):
+        self.docs = [(kind, doc_id) for kind, doc_id, _ in docs]
+        self.language = language
+        self.terms = {}  # term -> (doc numbers, position starts, position codes, impacts)
+        lengths = [array('I') for _ in FIELDS]
+        terms = self.terms
+        for doc, (_, _, texts) in enumerate(docs):
+            occurrences = {}
+            for field, text in enumerate(texts):
+                analyzed = analyze(text, language)
+                lengths[field].append(len(analyzed))
+                base = field << FIELD_SHIFT
+                for position, term in analyzed:
+                    codes = occurrences.get(term)
+                    if codes is None:
+                        codes = occurrences[term] = []
+                    codes.append(base | min(position, MAX_POSITION))
+            for term, codes in occurrences.items():
+                postings = terms.get(term)
+                if postings is None:
+                    postings = terms[term] = (array('I'), array('I', [0]), array('I'), array('f'))
+                postings[0].append(doc)
+                postings[2].extend(codes)
+                postings[1].append(len(postings[2]))
+        self._compute_impacts(lengths)
+
+    @classmethod
+    def build(cls, conference_data, language='en'):
+        return cls(documents(conference_data), language)
+
+    def _compute_impacts(self, lengths):
+        """impact(term, doc) = idf * tf / (K1 + tf), tf summed over fields with weights and length normalization"""
+        n = len(self.docs)
+        # Per field and document: weight / (1 - b + b * length / average length)
+        norms = []
+        for field, field_lengths in enumerate(lengths):
+            average = sum(field_lengths) / n if n else 0.0
+            weight, b = FIELD_WEIGHTS[field], FIELD_B[field]
+            norms.append([weight / (1 - b + b * length / average) if average else 0.0 for length in field_lengths])
+        for term, (docs, starts, codes, impacts) in self.terms.items():
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for j, doc in enumerate(docs):
+                tf = 0.0
+                for code in codes[starts[j]:starts[j + 1]]:
+                    tf += norms[code >> FIELD_SHIFT][doc]
+                impacts.append(idf * tf / (K1 + tf))
+
+    def _query_terms(self, text, language, strict=False):
+        """[(position, indexed term)] for query text
+
+        Words the index does not know are dropped, or make the result None if `strict`.
+        """
+        stopwords = STOPWORDS.get(language, STOPWORDS['en'])
+        terms = []
+        for position, token in enumerate(folded_tokens(text)):
+            if token in stopwords:
+                continue
+            # The query's stemmer first, then the documents' ("Fabricu" -> "fabric" either way)
+            for term in (stem(token, language), stem(token, self.language)):
+                if term in self.terms:
+                    terms.append((position, term))
+                    break
+            else:
+                if strict:
+                    return None
+        return terms
+
+    def _impact(self, term, doc):
+        docs, _, _, impacts = self.terms[term]
+        j = bisect_left(docs, doc)
+        return impacts[j] if j < len(docs) and docs[j] == doc else 0.0
+
+    def _phrase_docs(self, phrase):
+        """Documents containing the phrase's terms at its relative positions, within one field"""
+        first = phrase[0][0]
+        phrase = sorted(((position - first, term) for position, term in phrase), key=lambda p: len(self.terms[p[1]][0]))
+        # Documents with every term (set intersection runs in C), then positions only for those
+        candidates = set(self.terms[phrase[0][1]][0]).intersection(*(self.terms[term][0] for _, term in phrase[1:]))
+        lookups = []
+        for offset, term in phrase:
+            docs, starts, codes, _ = self.terms[term]
+            lookups.append((offset, starts, codes, dict(zip(docs, range(len(docs)))) if len(phrase) > 1 else None))
+        matches = set()
+        for doc in candidates:
+            anchors = None
+            for offset, starts, codes, slots in lookups:
+                j = slots[doc] if slots is not None else bisect_left(self.terms[phrase[0][1]][0], doc)
+                shifted = {code - offset for code in codes[starts[j]:starts[j + 1]]}
+                anchors = shifted if anchors is None else anchors & shifted
+                if not anchors:
+                    break
+            if anchors:
+                matches.add(doc)
+        return matches
+
+    def search(self, query, language=None, offset=0, limit=PAGE_SIZE, kind=None):
+        """(number of matching documents, [(score, kind, id)] for results offset..offset + limit)
+
+        Every quoted phrase must match; other words are optional and add to the score.
+        """
+        language = language or self.language
+        phrase_texts, rest = parse_query(query)
+        phrases = [self._query_terms(p, language, strict=True) for p in phrase_texts]
+        if None in phrases:
+            return 0, []
+        phrases = [phrase for phrase in phrases if phrase]  # Only stopwords: no constraint
+        words = [term for _, term in self._query_terms(rest, language)]
+        terms = list(dict.fromkeys(words + [term for phrase in phrases for _, term in phrase]))
+
+        if phrases:
+            candidates = None
+            for phrase in phrases:
+                matched = self._phrase_docs(phrase)
+                candidates = matched if candidates is None else candidates & matched
+                if not candidates:
+                    return 0, []
+            scores = {doc: sum(self._impact(term, doc) for term in terms) for doc in candidates}
+        elif terms:
+            # The longest postings list is copied into the dict in C; the others are added one by one
+            terms.sort(key=lambda term: len(self.terms[term][0]), reverse=True)
+            docs, _, _, impacts = self.terms[terms[0]]
+            scores = dict(zip(docs, impacts))
+            get = scores.get
+            for term in terms[1:]:
+                docs, _, _, impacts = self.terms[term]
+                for doc, impact in zip(docs, impacts):
+                    scores[doc] = get(doc, 0.0) + impact
+        else:
+            scores = {}
+
+        if kind is not None:
+            scores = {doc: score for doc, score in scores.items() if self.docs[doc][0] == kind}
+        top = heapq.nlargest(offset + limit, scores.items(), key=itemgetter(1))[offset:]  # Ties: stable
+        return len(scores), [(round(score, 4),) + self.docs[doc] for doc, score in top]
+
+    def stats(self):
+        return {'documents': len(self.docs), 'terms': len(self.terms),
+                'postings': sum(len(postings[0]) for postings in self.terms.values()),
+                'positions': sum(len(postings[2]) for postings in self.terms.values())}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Search sessions and speakers')
+    parser.add_argument('query')
+    parser.add_argument('--language', choices=sorted(SUFFIXES), help='query language (default: the documents\')')
+    parser.add_argument('--page', type=int, default=1)
+    parser.add_argument('--data', default='data/conference.json')
+    args = parser.parse_args()
+
+    with open(args.data, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    started = time.perf_counter()
+    index = SearchIndex.build(data)
+    built = time.perf_counter() - started
+
+    started = time.perf_counter()
+    total, results = index.search(args.query, args.language, (args.page - 1) * PAGE_SIZE)
+    elapsed = time.perf_counter() - started
+    print(f"Indexed {index.stats()} in {built * 1000:.0f} ms")
+    print(f"{total} matches in {elapsed * 1000:.2f} ms (page {args.page})")
+    titles = {s['id']: s['title'] for s in data['sessions']}
+    names = {s['id']: s['name'] for s in data['speakers']}
+    for score, kind, doc_id in results:
+        print(f"  {score:6.2f}  [{kind}] {titles.get(doc_id) if kind == 'session' else names.get(doc_id)}")
@@ -8,22 +8,133 @@ from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 import requests
 import os
-import json
-from datetime import datetime
+import posixpath
+import atexit
+import gzip
+import mimetypes
+import time
+from collections import Counter
+
+from admission import AdmissionController, AdmissionRejected, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from circuit_breaker import CircuitBreaker
+from conversations import HISTORY_TOKENS, history_messages
+from events import DEFAULT_EVENT, EVENT_CACHE_BYTES, EVENTS_DIR, EventRegistry
+from fallback import degraded_answer
+from faq_search import FAQ_MIN_SCORE, score_faq_batch
+from langid import LanguageIdentifier
+from ledger import LEDGER_PATH, BudgetLedger
+from planner import plan_schedule
+from profiler import install_profiler
+from releases import version_info
+from router import DEFAULT_TIER, MODEL_TIERS
+from search import MAX_PAGE_SIZE, PAGE_SIZE, SUFFIXES
+from suggest import SUGGEST_LIMIT
+from tokens import TokenEstimator, trim_prompt
 
 app = Flask(__name__, static_folder='.')
 CORS(app)  # Enable CORS for all routes
 
-# Track API usage and costs
-api_usage = {
-    'today': datetime.now().strftime('%Y-%m-%d'),
-    'count': 0,
-    'estimated_cost': 0.0
-}
-
+# Default daily limits per event (an event's settings.json can override them)
 MAX_DAILY_REQUESTS = 200  # Safety limit (increased for spend-based model)
 MAX_DAILY_COST = 30.0  # $30 budget cap
 
+# Route simple questions to the light model tier (see router.py for models and pricing)
+MODEL_ROUTING = os.environ.get('MODEL_ROUTING', '1') == '1'
+
+# Pre-flight request shaping
+MAX_INPUT_TOKENS = int(os.environ.get('MAX_INPUT_TOKENS', '8000'))  # Larger prompts are trimmed
+MAX_OUTPUT_TOKENS = 1024
+MIN_OUTPUT_TOKENS = 256    # Refuse rather than cut replies shorter than this
+LOW_BUDGET_FRACTION = 0.25  # Below this share of the daily budget, max_tokens shrinks
+
+# ?debug=1 on /api/chat returns the full upstream response; off unless the server enables it
+DEBUG_RESPONSES = os.environ.get('DEBUG_RESPONSES', '0') == '1'
+
+# Questions per /api/faq/batch request (kiosks, smoke tests)
+FAQ_BATCH_MAX = int(os.environ.get('FAQ_BATCH_MAX', '100'))
+
+# Prompt caching: the schedule system prompt is marked cacheable (see conversations.py)
+CACHE_WRITE_PRICE_FACTOR = 1.25  # Input tokens written to the prompt cache cost 25% more
+CACHE_READ_PRICE_FACTOR = 0.1    # and cost a tenth when read back
+
+# Opt-in request profiling: sample a fraction of requests, or any request
+# carrying the admin token in the X-Profile header. Off unless configured.
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_ADMIN_TOKEN = os.environ.get('PROFILE_ADMIN_TOKEN')
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', '50'))  # Newest profile files kept on disk
+
+UPSTREAM_URL = os.environ.get('ANTHROPIC_API_URL', 'https://api.anthropic.com/v1/messages')
+UPSTREAM_TIMEOUT = 30  # seconds
+
+# Circuit breaker around the upstream call: trips on errors or slow calls
+BREAKER_ERROR_RATE = float(os.environ.get('BREAKER_ERROR_RATE', '0.5'))
+BREAKER_SLOW_SECONDS = float(os.environ.get('BREAKER_SLOW_SECONDS', '10'))
+BREAKER_OPEN_SECONDS = float(os.environ.get('BREAKER_OPEN_SECONDS', '30'))
+
+# Admission control: at most ADMISSION_MAX_LIMIT concurrent upstream calls
+# (adapted between 1 and the max by AIMD), excess queued for up to
+# ADMISSION_QUEUE_TIMEOUT seconds, 503 + Retry-After once the queue is full
+ADMISSION_INITIAL_LIMIT = int(os.environ.get('ADMISSION_INITIAL_LIMIT', '4'))
+ADMISSION_MAX_LIMIT = int(os.environ.get('ADMISSION_MAX_LIMIT', '16'))
+ADMISSION_MAX_QUEUE = int(os.environ.get('ADMISSION_MAX_QUEUE', '32'))
+ADMISSION_QUEUE_TIMEOUT = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', '10'))
+ADMISSION_LATENCY_TARGET = float(os.environ.get('ADMISSION_LATENCY_TARGET', '8'))
+
+# JSON responses larger than this are gzipped for clients that accept it
+GZIP_MIN_BYTES = int(os.environ.get('GZIP_MIN_BYTES', '1024'))
+
+# Questions the browser FAQ could not answer (input for mine_faq_misses.py)
+MISS_LOG_PATH = os.environ.get('MISS_LOG_PATH', 'logs/faq_misses.jsonl')
+PRIVATE_DIRS = ('logs/', 'profiles/', 'build/')  # Never served as static files
+FINGERPRINTED_DIRS = ('data/photos/',)  # File names carry a content hash (photos.py)
+FINGERPRINTED_MAX_AGE = 365 * 24 * 3600
+mimetypes.add_type('image/webp', '.webp')
+mimetypes.add_type('image/avif', '.avif')
+
+# Gzipped copies of the static files, written by pipeline.py
+ASSETS_DIR = os.environ.get('ASSETS_DIR', 'build/assets')
+
+# Server-side metrics, exposed on /api/metrics (per-event metrics live in each event's account)
+metrics = {
+    'breaker_transitions': Counter()
+}
+
+def on_breaker_transition(old_state, new_state):
+    metrics['breaker_transitions'][f"{old_state}->{new_state}"] += 1
+    print(f"🔌 Circuit breaker: {old_state} -> {new_state}")
+
+breaker = CircuitBreaker(
+    error_rate=BREAKER_ERROR_RATE,
+    slow_call_seconds=BREAKER_SLOW_SECONDS,
+    open_seconds=BREAKER_OPEN_SECONDS,
+    on_transition=on_breaker_transition
+)
+admission = AdmissionController(
+    initial_limit=ADMISSION_INITIAL_LIMIT,
+    max_limit=ADMISSION_MAX_LIMIT,
+    max_queue=ADMISSION_MAX_QUEUE,
+    queue_timeout=ADMISSION_QUEUE_TIMEOUT,
+    latency_target=ADMISSION_LATENCY_TARGET
+)
+token_estimator = TokenEstimator()
+
+# Server-side language decision; the browser's regex guess is only a hint
+language_id = LanguageIdentifier.load('data/langid_profile.json')
+
+# Append-only record of every upstream call; its rollups serve /api/usage and restore today's budget on restart
+ledger = BudgetLedger(LEDGER_PATH)
+atexit.register(ledger.close)
+
+# Hosted events: the default one from data/ on /api/..., others from EVENTS_DIR on /e/<event-id>/api/...
+# Each has its own conference data, FAQ, router, prompt contexts, response cache, miss log, budget and metrics
+events = EventRegistry(DEFAULT_EVENT, 'data', EVENTS_DIR, EVENT_CACHE_BYTES, language_id.languages,
+                       MISS_LOG_PATH, MAX_DAILY_REQUESTS, MAX_DAILY_COST, ledger=ledger)
+atexit.register(events.flush)
+
+if install_profiler(app, PROFILE_DIR, PROFILE_SAMPLE_RATE, PROFILE_ADMIN_TOKEN, keep=PROFILE_KEEP):
+    print(f"🔬 Request profiling enabled (sample rate {PROFILE_SAMPLE_RATE}, output {PROFILE_DIR}/)")
+
 # Load API key from config.js
 def get_api_key():
     try:
@@ -50,116 +161,416 @@ def get_api_key():
 # Try environment variable first (production), then config.js (local)
 API_KEY = os.environ.get('ANTHROPIC_API_KEY') or get_api_key()
 
-@app.route('/')
-def index():
-    """Serve the main HTML file"""
-    return send_from_directory('.', 'index.html')
+# (path, source stat, copy stat) -> whether the gzipped copy matches the source
+precompressed_checks = {}
 
-@app.route('/<path:path>')
-def serve_static(path):
-    """Serve static files"""
-    return send_from_directory('.', path)
+def precompressed(path):
+    """Path of a gzipped copy of `path` with the same content, or None
 
-@app.route('/api/chat', methods=['POST'])
-def chat():
-    """Proxy endpoint for Claude API with rate limiting and budget monitoring"""
-    global api_usage
+    The check decompresses the copy once per change to either file, so a
+    touched-but-unchanged source keeps its copy and an edited one never gets
+    a stale copy.
+    """
+    compressed = os.path.join(ASSETS_DIR, f"{path}.gz")
+    try:
+        source_stat, copy_stat = os.stat(path), os.stat(compressed)
+    except OSError:
+        return None
+    key = (path, source_stat.st_size, source_stat.st_mtime_ns, copy_stat.st_size, copy_stat.st_mtime_ns)
+    current = precompressed_checks.get(key)
+    if current is None:
+        try:
+            with open(path, 'rb') as f, gzip.open(compressed, 'rb') as g:
+                current = f.read() == g.read()
+        except (OSError, EOFError):
+            current = False
+        if len(precompressed_checks) > 1000:
+            precompressed_checks.clear()
+        precompressed_checks[key] = current
+    return compressed if current else None
+
+def static_file(path):
+    """A static file, sent precompressed when the client accepts gzip
+
+    Fingerprinted requests (?v=<content hash>, as sw.js precaches them, or
+    files in FINGERPRINTED_DIRS) never change, so they may be cached for a year.
+    """
+    if 'gzip' in request.headers.get('Accept-Encoding', '') and precompressed(path):
+        response = send_from_directory(ASSETS_DIR, f"{path}.gz",
+                                       mimetype=mimetypes.guess_type(path)[0] or 'application/octet-stream')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+    else:
+        response = send_from_directory('.', path)
+    return fingerprinted(response, path)
+
+def fingerprinted(response, path):
+    if request.args.get('v') or path.startswith(FINGERPRINTED_DIRS):
+        response.headers['Cache-Control'] = f"public, max-age={FINGERPRINTED_MAX_AGE}, immutable"
+    return response
+
+def event_route(rule, **options):
+    """Register a view on `rule` for the default event and on /e/<event_id>`rule` for the others"""
+    def register(view):
+        app.add_url_rule(rule, view.__name__, view, defaults={'event_id': None}, **options)
+        app.add_url_rule(f"/e/<event_id>{rule}", f"{view.__name__}_event", view, **options)
+        return view
+    return register
+
+def unknown_event(event_id):
+    return jsonify({'error': f"Unknown event: {event_id}"}), 404
+
+@event_route('/')
+def index(event_id):
+    """Serve the main HTML file"""
+    if event_id and events.data_dir(event_id) is None:
+        return unknown_event(event_id)
+    return static_file('index.html')
+
+@event_route('/<path:path>')
+def serve_static(path, event_id):
+    """Serve static files; under /e/<event_id>/ the data/ files come from that event's directory"""
+    path = posixpath.normpath(path).lstrip('/')
+    if path.startswith(PRIVATE_DIRS):
+        return jsonify({'error': 'Not found'}), 404
+    if event_id:
+        data_dir = events.data_dir(event_id)
+        if data_dir is None:
+            return unknown_event(event_id)
+        if path.startswith('data/') and data_dir != 'data':
+            return fingerprinted(send_from_directory(data_dir, path[len('data/'):]), path)
+    return static_file(path)
+
+def call_upstream(payload):
+    """POST to the Claude API and record the outcome with the circuit breaker"""
+    started = time.monotonic()
+    try:
+        response = requests.post(
+            UPSTREAM_URL,
+            headers={
+                'Content-Type': 'application/json',
+                'x-api-key': API_KEY,
+                'anthropic-version': '2023-06-01'
+            },
+            json=payload,
+            timeout=UPSTREAM_TIMEOUT
+        )
+    except requests.exceptions.RequestException:
+        breaker.record(False, time.monotonic() - started)
+        raise
+
+    # Server errors and rate limiting count against the upstream's health
+    breaker.record(response.status_code < 500 and response.status_code != 429,
+                   time.monotonic() - started)
+    return response
+
+@app.after_request
+def compress_json(response):
+    """Gzip large JSON responses (chat answers, FAQ results) for mobile clients"""
+    if (response.mimetype != 'application/json' or response.direct_passthrough or
+            'Content-Encoding' in response.headers or
+            'gzip' not in request.headers.get('Accept-Encoding', '')):
+        return response
+    body = response.get_data()
+    if len(body) < GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+def answer_response(text, cost=0.0, tier=DEFAULT_TIER, cached=False, **extra):
+    """Compact chat reply: just what the frontend reads"""
+    return jsonify({'answer': text, 'cost': cost, 'tier': tier, 'cached': cached, **extra})
+
+def degraded_response(event, message, language, **extra):
+    """Answer instantly without the upstream model"""
+    text, source = degraded_answer(message, language, event.response_cache, event.faq, event.conference_data)
+    event.account.metrics['degraded_responses'][source] += 1
+    print(f"🩹 Degraded answer from {source} (breaker {breaker.state})")
+    return answer_response(text, tier='degraded', cached=source == 'cache', source=source, **extra)
+
+def reserve_budget(account, estimated_input, tier):
+    """Reserve the worst-case cost of a call against the event's daily cap
+
+    Returns (max_tokens, reserved_cost), or (None, 0) if not even a short
+    reply is affordable. Replies shrink linearly once less than
+    LOW_BUDGET_FRACTION of the daily budget is left.
+    """
+    pricing = MODEL_TIERS[tier]
+    with account.lock:
+        usage = account.usage
+        remaining = account.max_daily_cost - usage['estimated_cost'] - usage['reserved']
+        input_cost = estimated_input * pricing['input_price'] / 1_000_000
+        affordable = int((remaining - input_cost) / (pricing['output_price'] / 1_000_000))
+        if affordable < MIN_OUTPUT_TOKENS:
+            return None, 0
+        scale = min(1.0, remaining / (account.max_daily_cost * LOW_BUDGET_FRACTION))
+        max_tokens = max(MIN_OUTPUT_TOKENS, min(affordable, int(MAX_OUTPUT_TOKENS * scale)))
+        reserved = input_cost + max_tokens * pricing['output_price'] / 1_000_000
+        usage['reserved'] += reserved
+        return max_tokens, reserved
+
+def release_budget(account, reserved):
+    with account.lock:
+        account.usage['reserved'] = max(0.0, account.usage['reserved'] - reserved)
+
+def ask_upstream(event, messages, tier, max_tokens, estimated_input, prompt, message, language,
+                 system=None, session_id=None):
+    """Send a shaped request upstream through the breaker and admission control"""
+    extra = {'session_id': session_id} if session_id else {}
+    # Upstream is failing or slow - answer from FAQ/cache/schedule instead of waiting
+    if not breaker.allow():
+        return degraded_response(event, message, language, **extra)
+
+    # Wait for an upstream slot (only chat is admission-controlled; FAQ and static never queue)
+    priority = PRIORITY_BACKGROUND if request.headers.get('X-Request-Priority') == 'background' else PRIORITY_INTERACTIVE
+    try:
+        admission.acquire(priority)
+    except AdmissionRejected as e:
+        breaker.cancel()
+        print(f"🚦 Admission rejected ({e.reason}), retry after {e.retry_after}s")
+        return jsonify({
+            'error': 'Server busy',
+            'message': 'Many questions are being answered right now. Please try again in a moment.'
+        }), 503, {'Retry-After': str(e.retry_after)}
+
+    # Make request to Claude API
+    started = time.monotonic()
+    throttled = False
+    payload = {
+        'model': MODEL_TIERS[tier]['model'],
+        'max_tokens': max_tokens,
+        'messages': messages
+    }
+    if system:
+        payload['system'] = system
+    try:
+        response = call_upstream(payload)
+        throttled = response.status_code == 429
+    except requests.exceptions.RequestException:
+        ledger.record(event.event_id, payload['model'], tier, latency_ms=(time.monotonic() - started) * 1000, status=0)
+        raise
+    finally:
+        admission.release(time.monotonic() - started, throttled)
+    latency_ms = (time.monotonic() - started) * 1000
+    if response.status_code != 200:
+        ledger.record(event.event_id, payload['model'], tier, latency_ms=latency_ms, status=response.status_code)
+
+    # Upstream rate limit: tell the client when to retry instead of passing the 429 through
+    if throttled:
+        print(f"🚦 Upstream rate limited: {response.text[:200]}")
+        return jsonify({
+            'error': 'Server busy',
+            'message': 'Many questions are being answered right now. Please try again in a moment.'
+        }), 503, {'Retry-After': response.headers.get('retry-after', '5')}
+
+    # Check if request was successful
+    if response.status_code != 200:
+        print(f"API error: {response.status_code}")
+        print(f"Response: {response.text}")
+        return jsonify({
+            'error': f'API error: {response.status_code}',
+            'details': response.text
+        }), response.status_code
+
+    # Return Claude's response
+    result = response.json()
+
+    # Calculate actual cost from token usage
+    usage_data = result.get('usage', {})
+    input_tokens = usage_data.get('input_tokens', 1000)
+    output_tokens = usage_data.get('output_tokens', 500)
+    cache_write_tokens = usage_data.get('cache_creation_input_tokens') or 0
+    cache_read_tokens = usage_data.get('cache_read_input_tokens') or 0
+
+    pricing = MODEL_TIERS[tier]
+    actual_cost = ((input_tokens + cache_write_tokens * CACHE_WRITE_PRICE_FACTOR + cache_read_tokens * CACHE_READ_PRICE_FACTOR)
+                   / 1_000_000 * pricing['input_price']) + (output_tokens / 1_000_000 * pricing['output_price'])
+
+    # Track usage against the event's budget
+    account = event.account
+    with account.lock:
+        account.usage['count'] += 1
+        account.usage['estimated_cost'] += actual_cost
+        call_number, total_cost = account.usage['count'], account.usage['estimated_cost']
+
+        tier_metrics = account.metrics['tiers'][tier]
+        tier_metrics['requests'] += 1
+        tier_metrics['input_tokens'] += input_tokens
+        tier_metrics['output_tokens'] += output_tokens
+        tier_metrics['cache_write_tokens'] += cache_write_tokens
+        tier_metrics['cache_read_tokens'] += cache_read_tokens
+        tier_metrics['cost'] += actual_cost
+    ledger.record(event.event_id, payload['model'], tier, input_tokens, output_tokens, cache_write_tokens,
+                  cache_read_tokens, actual_cost, latency_ms)
+
+    print(f"✅ API call #{call_number} for {event.event_id} successful ({tier} tier)")
+    print(f"📊 Tokens: {input_tokens} in, {output_tokens} out (max_tokens {max_tokens})"
+          f"{f', prompt cache: {cache_read_tokens} read, {cache_write_tokens} written' if system else ''}")
+    print(f"💰 This call: ${actual_cost:.4f}, Today's total: ${total_cost:.2f}")
+
+    # Calibration log: how far off was the pre-flight estimate?
+    if 'input_tokens' in usage_data:
+        total_input = input_tokens + cache_write_tokens + cache_read_tokens
+        ratio = token_estimator.observe(estimated_input, total_input)
+        print(f"🧮 Estimated {estimated_input} input tokens, actual {total_input} ({ratio:.2f}x)")
+
+    answer_text = ''.join(block.get('text', '') for block in result.get('content', []))
+    if answer_text:
+        event.response_cache.store(prompt, message, language, answer_text)
+        event.miss_log.set_answer(message, answer_text, language)
+        if session_id:
+            event.conversations.record(session_id, message, answer_text)
+
+    # Full upstream payload only when the server allows debugging; attendees get the compact reply
+    if DEBUG_RESPONSES and request.args.get('debug') == '1':
+        result['cost'] = actual_cost
+        return jsonify(result)
 
+    return answer_response(answer_text, cost=actual_cost, tier=tier, **extra)
+
+def conversation_request(event, data, message, language):
+    """(system, messages, cache key, session id) for a chat turn kept on the server
+
+    The event's schedule context is the system prompt, marked as a cacheable
+    prefix: it is the same for every turn and every attendee in a language.
+    The messages hold the session's recent turns within HISTORY_TOKENS.
+    Messages is None if the question alone does not fit.
+    """
+    session_id = event.conversations.session_id(data.get('session_id'))
+    # The browser answered the previous question from its FAQ: keep it as a turn for follow-ups
+    local_turn = data.get('local_turn')
+    if (isinstance(local_turn, dict) and isinstance(local_turn.get('question'), str)
+            and isinstance(local_turn.get('answer'), str)):
+        event.conversations.record(session_id, local_turn['question'], local_turn['answer'])
+
+    context = event.conference_contexts.get(language) or event.conference_contexts['en']
+    context = trim_prompt(context, MAX_INPUT_TOKENS - HISTORY_TOKENS, token_estimator) or context
+    messages = history_messages(event.conversations.turns(session_id), message, HISTORY_TOKENS, token_estimator)
+    system = [{'type': 'text', 'text': context, 'cache_control': {'type': 'ephemeral'}}]
+    cache_key = '\n\n'.join([context] + [m['content'] for m in messages]) if messages else None
+    return system, messages, cache_key, session_id
+
+@event_route('/api/chat', methods=['POST'])
+def chat(event_id):
+    """Proxy endpoint for Claude API with rate limiting and budget monitoring"""
     if not API_KEY:
         return jsonify({
             'error': 'API key not configured',
             'message': 'Please add your Anthropic API key to config.js'
         }), 500
 
-    # Check if conference is over (after January 23, 2026)
-    conference_date = datetime(2026, 1, 23).date()
-    today_date = datetime.now().date()
+    event = events.get(event_id)
+    if event is None:
+        return unknown_event(event_id)
+    account = event.account
 
-    if today_date > conference_date:
-        print(f"⚠️ Conference is over. No API calls allowed after {conference_date}")
+    # Check if the event is over (after the day of its last session)
+    if event.is_over():
+        print(f"⚠️ Event {event.event_id} is over. No API calls allowed after {event.closes_on}")
         return jsonify({
             'error': 'Conference ended',
             'message': 'The conference has ended. The chatbot is now sleeping after a great job!'
         }), 403
 
     # Reset counter if new day
-    today = datetime.now().strftime('%Y-%m-%d')
-    if api_usage['today'] != today:
-        api_usage = {'today': today, 'count': 0, 'estimated_cost': 0.0}
+    account.roll_day()
+    usage = account.usage
 
     # Check daily request limit
-    if api_usage['count'] >= MAX_DAILY_REQUESTS:
-        print(f"⚠️ Daily request limit reached: {api_usage['count']}/{MAX_DAILY_REQUESTS}")
+    if usage['count'] >= account.max_daily_requests:
+        print(f"⚠️ Daily request limit reached for {event.event_id}: {usage['count']}/{account.max_daily_requests}")
         return jsonify({
             'error': 'Daily limit reached',
-            'message': f"Daily request limit ({MAX_DAILY_REQUESTS}) exceeded. This helps control costs."
+            'message': f"Daily request limit ({account.max_daily_requests}) exceeded. This helps control costs."
         }), 429
 
     # Check daily cost limit
-    if api_usage['estimated_cost'] >= MAX_DAILY_COST:
-        print(f"⚠️ Daily cost limit reached: ${api_usage['estimated_cost']:.2f}/${MAX_DAILY_COST}")
+    if usage['estimated_cost'] >= account.max_daily_cost:
+        print(f"⚠️ Daily cost limit reached for {event.event_id}: ${usage['estimated_cost']:.2f}/${account.max_daily_cost}")
         return jsonify({
             'error': 'Budget limit reached',
-            'message': f"Daily budget limit (${MAX_DAILY_COST}) exceeded. Come back tomorrow!"
+            'message': f"Daily budget limit (${account.max_daily_cost}) exceeded. Come back tomorrow!"
         }), 429
 
     try:
         # Get request data from frontend
         data = request.json
         message = data.get('message', '')
-        print(f"📥 Chat request #{api_usage['count'] + 1}: {message[:50]}...")
-
-        # Make request to Claude API
-        response = requests.post(
-            'https://api.anthropic.com/v1/messages',
-            headers={
-                'Content-Type': 'application/json',
-                'x-api-key': API_KEY,
-                'anthropic-version': '2023-06-01'
-            },
-            json={
-                'model': 'claude-sonnet-4-20250514',
-                'max_tokens': 1024,
-                'messages': [{
-                    'role': 'user',
-                    'content': data.get('prompt', '')
-                }]
-            },
-            timeout=30
-        )
-
-        # Check if request was successful
-        if response.status_code != 200:
-            print(f"API error: {response.status_code}")
-            print(f"Response: {response.text}")
+        prompt = data.get('prompt', '')
+        client_language = data.get('language', 'en')
+        print(f"📥 Chat request #{usage['count'] + 1} for {event.event_id}: {message[:50]}...")
+
+        # Detect the language here; swap the prompt's instructions if the browser guessed wrong
+        language = language_id.detect(message, default=client_language)
+        if language != client_language:
+            print(f"🌐 Language: browser said {client_language}, detected {language}")
+            client_context = event.conference_contexts.get(client_language)
+            if prompt and client_context and prompt.startswith(client_context):
+                prompt = event.conference_contexts[language] + prompt[len(client_context):]
+        event.miss_log.record(message, language)  # Reached the server, so the browser FAQ missed it
+
+        if prompt:
+            # Older clients send the whole prompt, previous answer included
+            system, session_id, extra = None, None, {}
+        else:
+            system, messages, prompt, session_id = conversation_request(event, data, message, language)
+            extra = {'session_id': session_id}
+            if messages is None:
+                print(f"⚠️ Question alone exceeds the conversation budget ({HISTORY_TOKENS} tokens)")
+                return jsonify({
+                    'error': 'Question too long',
+                    'message': 'Your question is too long. Please shorten it and try again.'
+                }), 413
+
+        # Identical prompt answered recently - no need to pay again
+        cached = event.response_cache.lookup_prompt(prompt)
+        if cached:
+            account.metrics['cache_hits'] += 1
+            if session_id:
+                event.conversations.record(session_id, message, cached)
+            print("♻️ Answered from response cache")
+            return answer_response(cached, tier='cache', cached=True, **extra)
+
+        if system:
+            print(f"💬 Conversation {session_id[:8]}: {len(messages) // 2} earlier turns in the request")
+            estimated_input = token_estimator.estimate_messages(messages, system=system[0]['text'])
+        else:
+            # Pre-flight: estimate input tokens and trim oversized prompts
+            shaped_prompt = trim_prompt(prompt, MAX_INPUT_TOKENS, token_estimator)
+            if shaped_prompt is None:
+                print(f"⚠️ Question alone exceeds the input budget ({MAX_INPUT_TOKENS} tokens)")
+                return jsonify({
+                    'error': 'Question too long',
+                    'message': 'Your question is too long. Please shorten it and try again.'
+                }), 413
+            if shaped_prompt != prompt:
+                print(f"✂️ Prompt trimmed to fit {MAX_INPUT_TOKENS} input tokens")
+            messages = [{'role': 'user', 'content': shaped_prompt}]
+            estimated_input = token_estimator.estimate_messages(messages)
+
+        # Pick the model tier from cheap local features of the question
+        if MODEL_ROUTING:
+            tier, features = event.router.route(message, language)
+            print(f"🧭 Routed to {tier} tier: {features}")
+        else:
+            tier = DEFAULT_TIER
+
+        # Refuse before spending anything if the call could overshoot the daily cap
+        max_tokens, reserved = reserve_budget(account, estimated_input, tier)
+        if max_tokens is None:
+            print(f"⚠️ Not enough budget left for ~{estimated_input} input tokens")
             return jsonify({
-                'error': f'API error: {response.status_code}',
-                'details': response.text
-            }), response.status_code
-
-        # Return Claude's response
-        result = response.json()
+                'error': 'Budget limit reached',
+                'message': f"Daily budget limit (${account.max_daily_cost}) almost exceeded. Come back tomorrow!"
+            }), 429
 
-        # Track usage and calculate actual cost
-        api_usage['count'] += 1
-
-        # Calculate actual cost from token usage
-        usage_data = result.get('usage', {})
-        input_tokens = usage_data.get('input_tokens', 1000)
-        output_tokens = usage_data.get('output_tokens', 500)
-
-        # Claude Sonnet 4 pricing: $3/M input, $15/M output
-        actual_cost = (input_tokens / 1_000_000 * 3.0) + (output_tokens / 1_000_000 * 15.0)
-        api_usage['estimated_cost'] += actual_cost
-
-        print(f"✅ API call #{api_usage['count']} successful")
-        print(f"📊 Tokens: {input_tokens} in, {output_tokens} out")
-        print(f"💰 This call: ${actual_cost:.4f}, Today's total: ${api_usage['estimated_cost']:.2f}")
-
-        # Add cost to response for frontend tracking
-        result['cost'] = actual_cost
-
-        return jsonify(result)
+        try:
+            return ask_upstream(event, messages, tier, max_tokens, estimated_input, prompt, message, language,
+                                system, session_id)
+        finally:
+            release_budget(account, reserved)
 
     except requests.exceptions.Timeout:
         return jsonify({'error': 'Request timeout'}), 504
@@ -170,6 +581,158 @@ def chat():
         print(f"Unexpected error: {e}")
         return jsonify({'error': str(e)}), 500
 
+@event_route('/api/faq/batch', methods=['POST'])
+def faq_batch(event_id):
+    """Match many questions against the FAQ in one pass, with the tier that would answer each (no API call)"""
+    data = request.get_json(silent=True) or {}
+    questions = data.get('questions')
+    if not isinstance(questions, list) or not all(isinstance(q, str) for q in questions):
+        return jsonify({'error': "'questions' must be a list of strings"}), 400
+    if len(questions) > FAQ_BATCH_MAX:
+        return jsonify({'error': f"At most {FAQ_BATCH_MAX} questions per batch"}), 413
+    client_language = data.get('language') if isinstance(data.get('language'), str) else 'en'
+
+    event = events.get(event_id)
+    if event is None:
+        return unknown_event(event_id)
+
+    started = time.perf_counter()
+    languages = [language_id.detect(question, default=client_language) for question in questions]
+    results = []
+    for question, language, matches in zip(questions, languages, score_faq_batch(event.faq, questions, languages)):
+        score, item = matches[0] if matches else (0, None)
+        if score >= FAQ_MIN_SCORE:
+            tier = 'faq'
+        elif MODEL_ROUTING:
+            tier, _ = event.router.route(question, language, faq_score=score)
+        else:
+            tier = DEFAULT_TIER
+        results.append({
+            'question': question,
+            'language': language,
+            'score': score,
+            'tier': tier,
+            'match': item['question'] if item else None,
+            'answer': item['answer'] if tier == 'faq' else None
+        })
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+    answered = sum(1 for r in results if r['tier'] == 'faq')
+    print(f"📋 Matched {len(questions)} questions in {elapsed_ms} ms ({answered} from FAQ)")
+    return jsonify({'results': results, 'elapsed_ms': elapsed_ms})
+
+@event_route('/api/suggest', methods=['GET'])
+def suggest(event_id):
+    """Autocomplete for the chat input (?q=<typed so far>); each suggestion carries the question to ask"""
+    query = request.args.get('q', '')
+    limit = min(request.args.get('limit', type=int) or SUGGEST_LIMIT, SUGGEST_LIMIT)
+    event = events.get(event_id)
+    if event is None:
+        return unknown_event(event_id)
+    index = event.suggest_index()
+    started = time.perf_counter()
+    suggestions = index.lookup(query, limit)
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+    return jsonify({'query': query, 'suggestions': suggestions, 'elapsed_ms': elapsed_ms})
+
+@event_route('/api/search', methods=['GET'])
+def search(event_id):
+    """Full-text search over sessions and speakers (?q=, page, page_size, kind=session|speaker, language)"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': "Pass ?q=<words or \"a phrase\">"}), 400
+    page = max(request.args.get('page', type=int) or 1, 1)
+    page_size = min(max(request.args.get('page_size', type=int) or PAGE_SIZE, 1), MAX_PAGE_SIZE)
+    kind = request.args.get('kind')
+    if kind not in (None, 'session', 'speaker'):
+        return jsonify({'error': "'kind' must be session or speaker"}), 400
+    language = request.args.get('language')
+    if language not in SUFFIXES:
+        language = language_id.detect(query, default='en')
+
+    event = events.get(event_id)
+    if event is None:
+        return unknown_event(event_id)
+    index = event.search_index()
+    started = time.perf_counter()
+    total, hits = index.search(query, language, (page - 1) * page_size, page_size, kind)
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    sessions = {s['id']: s for s in event.conference_data['sessions']}
+    speakers = {s['id']: s for s in event.conference_data['speakers']}
+    results = []
+    for score, hit_kind, hit_id in hits:
+        if hit_kind == 'session':
+            item = sessions[hit_id]
+            results.append({'kind': hit_kind, 'id': hit_id, 'score': score, 'title': item['title'],
+                            'start': item['start'], 'room': item['room'], 'speakers': item['speakers']})
+        else:
+            item = speakers[hit_id]
+            results.append({'kind': hit_kind, 'id': hit_id, 'score': score, 'name': item['name'],
+                            'title': item.get('title')})
+    return jsonify({'query': query, 'language': language, 'total': total, 'page': page, 'page_size': page_size,
+                    'pages': -(-total // page_size), 'results': results, 'elapsed_ms': elapsed_ms})
+
+@event_route('/api/data/version', methods=['GET'])
+def data_version(event_id):
+    """Current data version; with ?since=<version> also what changed since then and the JSON Patch to apply"""
+    event = events.get(event_id)
+    if event is None:
+        return unknown_event(event_id)
+    info = version_info(event.release(), request.args.get('since') or None)
+    response = jsonify(info)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@event_route('/api/schedule', methods=['POST'])
+def schedule(event_id):
+    """Optimal personal schedule from interests, favorites and must-attend sessions (no API call)"""
+    data = request.get_json(silent=True) or {}
+    fields = {}
+    for field in ('interests', 'favorites', 'must_attend'):
+        value = data.get(field, [])
+        if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+            return jsonify({'error': f"'{field}' must be a list of strings"}), 400
+        fields[field] = value
+
+    event = events.get(event_id)
+    if event is None:
+        return unknown_event(event_id)
+
+    started = time.perf_counter()
+    plan = plan_schedule(event.conference_data, **fields)
+    plan['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    print(f"🗓️ Planned {len(plan['sessions'])} sessions in {plan['elapsed_ms']} ms")
+    return jsonify(plan)
+
+@event_route('/api/similar', methods=['GET'])
+def similar(event_id):
+    """Most similar sessions (?session=<id>) or speakers (?speaker=<id>) from the build-time table"""
+    kind = 'session' if request.args.get('session') else 'speaker' if request.args.get('speaker') else None
+    if kind is None:
+        return jsonify({'error': "Pass ?session=<id> or ?speaker=<id>"}), 400
+    event = events.get(event_id)
+    if event is None:
+        return unknown_event(event_id)
+    item_id = request.args[kind]
+    neighbors = event.similarity_table[f"{kind}s"].get(item_id)
+    if neighbors is None:
+        return jsonify({'error': f"Unknown {kind}: {item_id}"}), 404
+
+    limit = request.args.get('k', len(neighbors), type=int)
+    if limit < 1:
+        return jsonify({'error': "k must be a positive integer"}), 400
+    items = {s['id']: s for s in event.conference_data[f"{kind}s"]}
+    results = []
+    for neighbor in neighbors[:limit]:
+        item = items[neighbor['id']]
+        if kind == 'session':
+            results.append({'id': item['id'], 'score': neighbor['score'], 'title': item['title'],
+                            'start': item['start'], 'room': item['room'], 'speakers': item['speakers']})
+        else:
+            results.append({'id': item['id'], 'score': neighbor['score'], 'name': item['name'],
+                            'title': item.get('title')})
+    return jsonify({'id': item_id, 'kind': kind, 'similar': results})
+
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
@@ -178,17 +741,47 @@ def health():
         'api_key_configured': API_KEY is not None and API_KEY != 'YOUR_API_KEY_HERE'
     })
 
-@app.route('/api/usage', methods=['GET'])
-def usage():
-    """Get API usage statistics"""
+@event_route('/api/metrics', methods=['GET'])
+def get_metrics(event_id):
+    """Circuit breaker, admission control and event registry, plus the event's answers and cache statistics"""
+    event = events.get(event_id)
+    if event is None:
+        return unknown_event(event_id)
+    return jsonify({
+        'event': event.event_id,
+        'breaker': breaker.snapshot(),
+        'breaker_transitions': dict(metrics['breaker_transitions']),
+        'admission': admission.snapshot(),
+        **event.account.snapshot(),
+        'cache_entries': len(event.response_cache),
+        'conversations': event.conversations.snapshot(),
+        'token_estimates': token_estimator.snapshot(),
+        'events': events.snapshot(),
+        'ledger': ledger.snapshot()
+    })
+
+@event_route('/api/usage', methods=['GET'])
+def usage(event_id):
+    """Get API usage statistics for an event (from the budget ledger's rollups)"""
+    data_dir = events.data_dir(event_id or events.default_event)
+    if data_dir is None:
+        return unknown_event(event_id)
+    account = events.account(event_id or events.default_event, data_dir)  # No need to load the event's data
+    account.roll_day()
+    rollups = ledger.usage(account.event_id, hours=min(max(request.args.get('hours', 24, type=int) or 0, 0), 24 * 7))
+    today = rollups['today']
     return jsonify({
-        'date': api_usage['today'],
-        'requests': api_usage['count'],
-        'estimated_cost': round(api_usage['estimated_cost'], 2),
-        'max_requests': MAX_DAILY_REQUESTS,
-        'max_cost': MAX_DAILY_COST,
-        'remaining_requests': max(0, MAX_DAILY_REQUESTS - api_usage['count']),
-        'remaining_budget': max(0, MAX_DAILY_COST - api_usage['estimated_cost'])
+        'event': account.event_id,
+        'date': account.usage['today'],
+        'requests': today['requests'],
+        'estimated_cost': round(today['cost'], 2),
+        'max_requests': account.max_daily_requests,
+        'max_cost': account.max_daily_cost,
+        'remaining_requests': max(0, account.max_daily_requests - today['requests']),
+        'remaining_budget': max(0, account.max_daily_cost - today['cost']),
+        'today': today,
+        'this_hour': rollups['this_hour'],
+        'hours': rollups['hours']
     })
 
 if __name__ == '__main__':
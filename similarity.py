@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Session and speaker similarity
+TF-IDF vectors over session titles, descriptions and speaker bios, and a
+top-k neighbor table for every session and every speaker. Vectors are sparse
+dicts and the pairwise products run over an inverted index, so only pairs
+that share a term are ever touched - a 10k-session catalog builds in seconds
+without numpy.
+
+Usage:
+    python similarity.py [--k 5]    # writes data/similarity.json
+"""
+
+import argparse
+import heapq
+import json
+import math
+import time
+from collections import Counter, defaultdict
+
+from normalize import normalize
+
+SIMILARITY_PATH = 'data/similarity.json'
+TOP_K = 5
+MAX_DF = 0.5        # Terms in more than half of the documents carry no signal
+MAX_TERMS = 10      # Strongest terms per document used to find candidates
+MAX_POSTINGS = 40   # Per term, only the documents where it weighs most (bounds the work per document)
+RESCORE = 3         # Candidates per neighbor slot rescored with the full vectors
+MIN_SCORE = 0.05    # Weaker neighbors are not worth recommending
+
+
+def tokenize(text):
+    return [t for t in normalize(text, 'any').split() if len(t) > 1 and not t.isdigit()]
+
+
+def tfidf_vectors(documents, max_df=MAX_DF):
+    """L2-normalized sparse TF-IDF vectors ({term: weight}) with sublinear term frequency"""
+    counts = [Counter(tokenize(doc)) for doc in documents]
+    document_frequency = Counter()
+    for terms in counts:
+        document_frequency.update(terms.keys())
+
+    n = len(documents)
+    limit = max(2, max_df * n)
+    idf = {term: math.log((1 + n) / (1 + df)) + 1 for term, df in document_frequency.items() if df <= limit}
+
+    vectors = []
+    for terms in counts:
+        vector = {term: (1 + math.log(tf)) * idf[term] for term, tf in terms.items() if term in idf}
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        vectors.append({term: w / norm for term, w in vector.items()})
+    return vectors
+
+
+def top_k_neighbors(vectors, k=TOP_K, max_terms=MAX_TERMS, max_postings=MAX_POSTINGS, min_score=MIN_SCORE):
+    """For every vector, the k most cosine-similar others as [(index, score)]
+
+    Candidates come from each document's `max_terms` strongest terms, looked up
+    in postings cut to the `max_postings` documents each term weighs most in;
+    the best k * RESCORE candidates are then scored exactly. Small catalogs are
+    exact, large ones only miss pairs that share nothing but weak terms.
+    """
+    pruned = [heapq.nlargest(max_terms, vector.items(), key=lambda item: item[1]) for vector in vectors]
+    postings = defaultdict(list)
+    for j, terms in enumerate(pruned):
+        for term, weight in terms:
+            postings[term].append((j, weight))
+    for term, entries in postings.items():
+        if len(entries) > max_postings:
+            postings[term] = heapq.nlargest(max_postings, entries, key=lambda entry: entry[1])
+
+    neighbors = []
+    for i, terms in enumerate(pruned):
+        partial = defaultdict(float)
+        for term, weight in terms:
+            for j, other in postings.get(term, ()):
+                partial[j] += weight * other
+        partial.pop(i, None)
+
+        vector = vectors[i]
+        scores = []
+        for j, _ in heapq.nlargest(k * RESCORE, partial.items(), key=lambda item: item[1]):
+            other = vectors[j]
+            scores.append((sum(vector[t] * other[t] for t in vector.keys() & other.keys()), j))
+        best = heapq.nlargest(k, scores, key=lambda item: (item[0], -item[1]))
+        neighbors.append([(j, round(score, 4)) for score, j in best if score >= min_score])
+    return neighbors
+
+
+def session_document(session, bios):
+    return ' '.join([session['title'], session['title'], session['description']] +
+                    [bios.get(name, '') for name in session['speakers']])
+
+
+def build_similarity(data, k=TOP_K):
+    """{'sessions': {id: [{'id', 'score'}]}, 'speakers': {id: [...]}} for a conference.json"""
+    bios = {speaker['name']: speaker.get('bio') or '' for speaker in data['speakers']}
+    talks = [s for s in data['sessions'] if s['speakers']]
+    session_vectors = tfidf_vectors([session_document(s, bios) for s in talks])
+
+    by_speaker = defaultdict(list)
+    for session in talks:
+        for name in session['speakers']:
+            by_speaker[name].append(session)
+    speakers = data['speakers']
+    speaker_vectors = tfidf_vectors([
+        ' '.join([speaker.get('bio') or ''] + [f"{s['title']} {s['description']}" for s in by_speaker[speaker['name']]])
+        for speaker in speakers
+    ])
+
+    return {
+        'k': k,
+        'sessions': {talks[i]['id']: [{'id': talks[j]['id'], 'score': score} for j, score in row]
+                     for i, row in enumerate(top_k_neighbors(session_vectors, k))},
+        'speakers': {speakers[i]['id']: [{'id': speakers[j]['id'], 'score': score} for j, score in row]
+                     for i, row in enumerate(top_k_neighbors(speaker_vectors, k))}
+    }
+
+
+def load_similarity(data, path=SIMILARITY_PATH):
+    """The built table, or one computed now if the file is missing or stale"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            table = json.load(f)
+        talks = {s['id'] for s in data['sessions'] if s['speakers']}
+        speakers = {s['id'] for s in data['speakers']}
+        if set(table['sessions']) == talks and set(table['speakers']) == speakers:
+            return table
+        print(f"⚠️ {path} does not match conference.json, rebuilding similarity table")
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ Could not load similarity table from {path} ({e}), building it now")
+    return build_similarity(data)
+
+
+def save_similarity(table, path=SIMILARITY_PATH):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, indent=1, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the session/speaker similarity table')
+    parser.add_argument('--k', type=int, default=TOP_K, help='neighbors per session and speaker')
+    parser.add_argument('--output', default=SIMILARITY_PATH)
+    args = parser.parse_args()
+
+    with open('data/conference.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    started = time.perf_counter()
+    table = build_similarity(data, args.k)
+    elapsed = time.perf_counter() - started
+
+    save_similarity(table, args.output)
+
+    print(f"Built top-{args.k} neighbors for {len(table['sessions'])} sessions and "
+          f"{len(table['speakers'])} speakers in {elapsed * 1000:.0f} ms")
+    print(f"Saved to: {args.output}")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Claude Messages API
+Answers POST /v1/messages with a deterministic, correctly shaped response so
+the server and build scripts can run without an API key or spending money.
+
+Usage:
+    python stand_in_upstream.py --port 8089 [--latency 0.2] [--error-rate 0.1]
+    ANTHROPIC_API_URL=http://127.0.0.1:8089/v1/messages python server.py
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_answer(payload):
+    """Deterministic answer for a Messages API payload"""
+    content = payload['messages'][-1]['content']
+    if not isinstance(content, str):
+        content = ''.join(block.get('text', '') for block in content)
+    question = content.strip().split('\n')[-1]
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:8]
+    text = f"[stand-in answer {digest}] {question}"
+    prompt_chars = len(content) + len(str(payload.get('system', '')))
+    return {
+        'id': f"msg_standin_{digest}",
+        'type': 'message',
+        'role': 'assistant',
+        'model': payload.get('model', 'stand-in'),
+        'content': [{'type': 'text', 'text': text}],
+        'stop_reason': 'end_turn',
+        'usage': {'input_tokens': max(1, prompt_chars // 4), 'output_tokens': max(1, len(text) // 4)}
+    }
+
+
+def make_handler(latency=0.0, error_rate=0.0, seed=0):
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if not self.path.startswith('/v1/messages'):
+                self.send_error(404)
+                return
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            with lock:
+                fail = rng.random() < error_rate
+            if latency:
+                time.sleep(latency)
+            if fail:
+                status, result = 529, {'type': 'error', 'error': {'type': 'overloaded_error', 'message': 'Overloaded'}}
+            else:
+                status, result = 200, fake_answer(json.loads(body))
+            data = json.dumps(result).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_stand_in(port=0, latency=0.0, error_rate=0.0):
+    """Start the stand-in on a background thread; returns (server, messages_url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(latency, error_rate))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1/messages"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered with 529')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(args.latency, args.error_rate))
+    print(f"Stand-in Claude API on http://127.0.0.1:{args.port}/v1/messages")
+    server.serve_forever()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Prefix autocomplete for the chat input
+Speaker names, session titles, rooms and FAQ questions in one sorted-array
+prefix index: the distinct folded tokens are sorted, and the items containing
+each token are listed best first, so a keystroke is a binary search plus a
+walk over the matching token range. The last (partial) token tolerates one
+typo ("Kornlis", "Fabirc"). Every suggestion carries the question to ask, and
+names, titles and rooms point at the FAQ question about them, so picking a
+suggestion is usually answered from the FAQ without a model call.
+
+The same index is exported to data/suggest.json; app.js searches it itself
+when the server cannot be reached.
+
+Usage:
+    python suggest.py              # writes data/suggest.json
+    python suggest.py "hugo ko"    # print suggestions for a query
+"""
+
+import argparse
+import json
+import time
+from bisect import bisect_left
+
+from normalize import TOKEN_PATTERN, fold_diacritics
+
+SUGGEST_PATH = 'data/suggest.json'
+SUGGEST_LIMIT = 8
+MIN_QUERY_CHARS = 2   # Shorter input matches too much to be useful
+TYPO_MIN_CHARS = 3    # Typo tolerance only for partial tokens at least this long
+MAX_CANDIDATES = 400  # Items looked at per query (short prefixes of common tokens)
+KINDS = ('speaker', 'session', 'room', 'faq')  # Tie-break order
+
+
+def suggest_tokens(text):
+    """Folded, lowercased word tokens (no stopword removal: every word typed counts)"""
+    return TOKEN_PATTERN.findall(fold_diacritics(text.casefold()))
+
+
+class SuggestIndex:
+    """Items (text, kind, question to ask) and a sorted token array with per-token postings"""
+
+    def __init__(self, items, tokens, postings):
+        self.items = items        # [(text, kind, ask)], best first
+        self.tokens = tokens      # Sorted distinct tokens
+        self.postings = postings  # postings[i]: ids of the items containing tokens[i], ascending (best first)
+        self.item_tokens = [frozenset(suggest_tokens(text)) for text, _, _ in items]
+
+    @classmethod
+    def build(cls, conference_data, faq):
+        """From a conference.json dict and FAQ entries; names, titles and rooms ask their FAQ question"""
+        questions = [item['question'] for item in faq]
+        asking = {}  # token -> ids of the FAQ questions containing it
+        for i, question in enumerate(questions):
+            for token in suggest_tokens(question):
+                asking.setdefault(token, set()).add(i)
+
+        def ask_about(name, fallback):
+            wanted = suggest_tokens(name)
+            matches = set.intersection(*(asking.get(t, set()) for t in wanted)) if wanted else set()
+            # Shortest FAQ question naming it: "Who is X?" rather than a summary that lists X
+            return (questions[min(matches, key=lambda i: (len(questions[i]), i))], True) if matches else (fallback, False)
+
+        candidates = []
+        for speaker in conference_data.get('speakers', []):
+            candidates.append((speaker['name'], 'speaker') + ask_about(speaker['name'], f"Who is {speaker['name']}?"))
+        for session in conference_data.get('sessions', []):
+            if session['speakers']:
+                candidates.append((session['title'], 'session') +
+                                  ask_about(session['title'], f"Tell me about {session['title']}"))
+        for room in conference_data.get('rooms', []):
+            candidates.append((room['name'], 'room') + ask_about(room['name'], f"What sessions are in {room['name']}?"))
+        candidates += [(q, 'faq', q, True) for q in questions]
+
+        # Best first: FAQ-answerable, then entities before FAQ questions, then shorter
+        candidates.sort(key=lambda c: (not c[3], KINDS.index(c[1]), len(c[0])))
+        items, seen = [], set()
+        for text, kind, ask, _ in candidates:
+            if (text, ask) not in seen:
+                seen.add((text, ask))
+                items.append((text, kind, ask))
+
+        by_token = {}
+        for i, (text, _, _) in enumerate(items):
+            for token in dict.fromkeys(suggest_tokens(text)):
+                by_token.setdefault(token, []).append(i)
+        tokens = sorted(by_token)
+        return cls(items, tokens, [by_token[t] for t in tokens])
+
+    def _is_prefix(self, prefix):
+        i = bisect_left(self.tokens, prefix)
+        return i < len(self.tokens) and self.tokens[i].startswith(prefix)
+
+    def _next_chars(self, prefix):
+        """Characters that follow `prefix` in some token, one binary search per distinct character"""
+        tokens, n, chars = self.tokens, len(prefix), []
+        i = bisect_left(tokens, prefix)
+        while i < len(tokens) and tokens[i].startswith(prefix):
+            if len(tokens[i]) == n:
+                i += 1
+                continue
+            chars.append(tokens[i][n])
+            i = bisect_left(tokens, prefix + chr(ord(tokens[i][n]) + 1), i)
+        return chars
+
+    def typo_variants(self, token):
+        """Prefixes of indexed tokens one deletion, transposition, substitution or insertion away from `token`
+
+        An edit at position i only helps if token[:i] is itself a prefix in the
+        index, and only characters that follow it there are tried, so the
+        search stays small however large the alphabet.
+        """
+        variants = set()
+        for i in range(len(token)):
+            before = token[:i]
+            if not self._is_prefix(before):
+                break
+            variants.add(before + token[i + 1:])
+            if i + 1 < len(token):
+                variants.add(before + token[i + 1] + token[i] + token[i + 2:])
+            for c in self._next_chars(before):
+                variants.add(before + c + token[i + 1:])
+                variants.add(before + c + token[i:])
+        variants.discard(token)
+        return [v for v in variants if v and self._is_prefix(v)]
+
+    def _prefixed(self, prefix):
+        """Item ids with a token starting with `prefix` (at most MAX_CANDIDATES, best first)"""
+        found = set()
+        i = bisect_left(self.tokens, prefix)
+        while i < len(self.tokens) and self.tokens[i].startswith(prefix) and len(found) < MAX_CANDIDATES:
+            found.update(self.postings[i][:MAX_CANDIDATES - len(found)])
+            i += 1
+        return found
+
+    def _postings(self, token):
+        i = bisect_left(self.tokens, token)
+        return self.postings[i] if i < len(self.tokens) and self.tokens[i] == token else []
+
+    def _candidates(self, complete, anchor):
+        """{item id: matched with a typo} for items with a token starting with `anchor`
+
+        Items containing the rarest finished word are tried first, so a common
+        partial word ("i", "da") does not have to walk thousands of postings.
+        Exact prefixes win over typos, both within those items and overall.
+        """
+        finished = [postings for postings in map(self._postings, complete) if postings]
+        pool = min(finished, key=len)[:MAX_CANDIDATES] if finished else []
+
+        def in_pool(prefixes, typo):
+            return {i: typo for i in pool if any(t.startswith(prefixes) for t in self.item_tokens[i])}
+
+        found = in_pool(anchor, False) or dict.fromkeys(self._prefixed(anchor), False)
+        if found or len(anchor) < TYPO_MIN_CHARS:
+            return found
+        variants = self.typo_variants(anchor)
+        if not variants:
+            return {}
+        found = in_pool(tuple(variants), True)
+        if not found:
+            for variant in variants:
+                found.update(dict.fromkeys(self._prefixed(variant), True))
+        return found
+
+    def lookup(self, query, limit=SUGGEST_LIMIT):
+        """[{'text', 'kind', 'ask', 'typo'}] for what the attendee has typed so far"""
+        tokens = suggest_tokens(query)
+        if len(query.strip()) < MIN_QUERY_CHARS or not tokens:
+            return []
+        # A trailing space means the last word is finished; the last word is matched as a prefix either way
+        complete = tokens if query[-1].isspace() else tokens[:-1]
+        typo = self._candidates(complete, tokens[-1])
+
+        # Items that also contain the finished words come first; if any do, the others are dropped
+        wanted = set(complete)
+        matched = {item: len(wanted & self.item_tokens[item]) for item in typo}
+        best = max(matched.values(), default=0)
+        ranked = sorted((item for item in typo if matched[item] == best), key=lambda item: (typo[item], item))
+        suggestions, asked = [], set()
+        for item in ranked:
+            text, kind, ask = self.items[item]
+            if ask in asked:
+                continue
+            asked.add(ask)
+            suggestions.append({'text': text, 'kind': kind, 'ask': ask, 'typo': typo[item]})
+            if len(suggestions) == limit:
+                break
+        return suggestions
+
+    def to_dict(self):
+        """Compact form for data/suggest.json (searched by app.js when offline)"""
+        return {'items': [list(item) for item in self.items], 'tokens': self.tokens, 'postings': self.postings}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls([tuple(item) for item in data['items']], data['tokens'], data['postings'])
+
+
+def save_suggest(index, path=SUGGEST_PATH):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(index.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the autocomplete index or query it')
+    parser.add_argument('query', nargs='?', help='print suggestions instead of writing the index')
+    parser.add_argument('--output', default=SUGGEST_PATH)
+    args = parser.parse_args()
+
+    with open('data/conference.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    with open('data/faq.json', 'r', encoding='utf-8') as f:
+        faq = json.load(f)
+
+    started = time.perf_counter()
+    index = SuggestIndex.build(data, faq)
+    elapsed = time.perf_counter() - started
+
+    if args.query is not None:
+        started = time.perf_counter()
+        suggestions = index.lookup(args.query)
+        print(f"{len(suggestions)} suggestions in {(time.perf_counter() - started) * 1e6:.0f} µs")
+        for s in suggestions:
+            print(f"  [{s['kind']}{', typo' if s['typo'] else ''}] {s['text']}  ->  {s['ask']}")
+    else:
+        save_suggest(index, args.output)
+        print(f"Indexed {len(index.items)} items, {len(index.tokens)} tokens in {elapsed * 1000:.0f} ms")
+        print(f"Saved to: {args.output}")
@@ -1,23 +1,254 @@
-const CACHE_NAME = 'dca-2026-v1';
-const urlsToCache = [
-  '/',
-  '/index.html',
-  '/styles.css',
-  '/app.js',
-  '/manifest.json',
-  '/data/conference.json'
-];
+importScripts('precache-manifest.js', 'jsonpatch.js');
+
+// One strategy per route class:
+//   app shell and icons  precached by content hash (precache-manifest.js), cache-first
+//   data/photos/*        cache-first (file names carry a content hash)
+//   data/*.json          stale-while-revalidate; conference.json and faq.json are updated with release patches
+//   api/chat             network only, with a timeout
+//   FAQ lookups          api/suggest, api/search, api/similar: cache-first, network when missing, kept per data release
+//   anything else        stale-while-revalidate for this origin, untouched for others
+const CACHE_PREFIX = 'dca-2026';
+const STATIC_CACHE = `${CACHE_PREFIX}-static-${self.PRECACHE_MANIFEST.version}`;
+const DATA_CACHE = `${CACHE_PREFIX}-data`;  // Data files, kept current with JSON Patch deltas
+const LOOKUP_CACHE = `${CACHE_PREFIX}-lookups`;  // FAQ lookup responses for the cached data release
+const RUNTIME_CACHE = `${CACHE_PREFIX}-runtime`;
+const CURRENT_CACHES = [STATIC_CACHE, DATA_CACHE, LOOKUP_CACHE, RUNTIME_CACHE];
+
+const DATA_FILES = ['conference.json', 'faq.json'];
+const PRECACHE_DATA = ['data/conference.json', 'data/faq.json', 'data/suggest.json'];
+const LOOKUP_PATHS = ['api/suggest', 'api/search', 'api/similar'];
+const VERSION_KEY = 'data/version';  // Version of the cached data files
+const DATA_CHECK_MS = 60000;  // At most one version check per minute
+const CHAT_TIMEOUT_MS = 35000;  // A little over the server's upstream timeout
+const LOOKUP_TIMEOUT_MS = 4000;
+const MAX_LOOKUPS = 200;  // Cached lookup responses; the oldest are dropped
+let lastDataCheck = 0;
+
+const scoped = path => new URL(path, self.registration.scope).href;
+const fingerprinted = path => scoped(`${path}?v=${self.PRECACHE_MANIFEST.assets[path]}`);
 
 self.addEventListener('install', event => {
   event.waitUntil(
-    caches.open(CACHE_NAME)
-      .then(cache => cache.addAll(urlsToCache))
+    Promise.all([precacheAssets(), precacheData()])
+      .then(() => self.skipWaiting())
   );
 });
 
-self.addEventListener('fetch', event => {
-  event.respondWith(
-    caches.match(event.request)
-      .then(response => response || fetch(event.request))
+self.addEventListener('activate', event => {
+  // Drop the caches of earlier versions (and the old single cache, dca-2026-v1)
+  event.waitUntil(
+    caches.keys()
+      .then(names => Promise.all(names
+        .filter(name => name.startsWith(CACHE_PREFIX) && !CURRENT_CACHES.includes(name))
+        .map(name => caches.delete(name))))
+      .then(() => self.clients.claim())
   );
 });
+
+async function precacheAssets() {
+  // Assets whose hash did not change are copied from the previous version's cache, the rest downloaded
+  const cache = await caches.open(STATIC_CACHE);
+  await Promise.all(Object.keys(self.PRECACHE_MANIFEST.assets).map(async path => {
+    const key = fingerprinted(path);
+    if (await cache.match(key)) return;
+    const previous = await caches.match(key);
+    const response = previous || await fetch(key);
+    if (!response.ok) throw new Error(`${path}: HTTP ${response.status}`);
+    await cache.put(key, response);
+  }));
+}
+
+async function precacheData() {
+  // The FAQ is there before the first chat message, and answers offline. The version is stamped with the
+  // files: it is read before and after downloading them, and left unknown if a release landed in between
+  const cache = await caches.open(DATA_CACHE);
+  const cached = await Promise.all(PRECACHE_DATA.map(path => cache.match(path)));
+  if (cached.every(Boolean) && await cache.match(VERSION_KEY)) return;
+  const before = await dataVersion(null).catch(() => null);
+  await Promise.all(PRECACHE_DATA.map(async path => {
+    const response = await fetch(path, { cache: 'no-cache' });
+    if (response.ok) await cache.put(path, response);
+  }));
+  const after = await dataVersion(null).catch(() => null);
+  if (before && after && before.version === after.version) {
+    await cache.put(VERSION_KEY, new Response(after.version));
+  } else {
+    await cache.delete(VERSION_KEY);
+  }
+}
+
+self.addEventListener('fetch', event => {
+  const request = event.request;
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin || !url.href.startsWith(self.registration.scope)) return;
+  const path = url.href.slice(self.registration.scope.length).split(/[?#]/)[0];
+
+  if (path === 'api/chat') {
+    event.respondWith(chat(request));
+  } else if (request.method !== 'GET') {
+    return;
+  } else if (path === '' || (request.mode === 'navigate' && /^e\/[^/]+\/?$/.test(path))) {
+    event.respondWith(precached(request, 'index.html'));  // The app shell, for this event or one under it
+  } else if (Object.prototype.hasOwnProperty.call(self.PRECACHE_MANIFEST.assets, path)) {
+    event.respondWith(precached(request, path));
+  } else if (path.startsWith('data/photos/')) {
+    event.respondWith(cacheFirst(RUNTIME_CACHE, request));  // Named by content hash: never revalidated
+  } else if (path.startsWith('data/') && path.endsWith('.json')) {
+    event.respondWith(staleWhileRevalidate(event, DATA_CACHE, path, !DATA_FILES.includes(path.slice(5))));
+    event.waitUntil(checkForUpdates());
+  } else if (LOOKUP_PATHS.includes(path)) {
+    event.respondWith(lookup(request));
+  } else if (!path.startsWith('api/')) {
+    event.respondWith(staleWhileRevalidate(event, RUNTIME_CACHE, request, true));
+  }
+});
+
+async function precached(request, path) {
+  const cached = await caches.match(fingerprinted(path), { cacheName: STATIC_CACHE });
+  return cached || fetch(request);
+}
+
+async function cacheFirst(cacheName, request) {
+  const cache = await caches.open(cacheName);
+  const cached = await cache.match(request);
+  if (cached) return cached;
+  const response = await fetch(request);
+  if (response.ok) await cache.put(request, response.clone());
+  return response;
+}
+
+// Cached copy at once; `revalidate` also refreshes it in the background (the patched data files are
+// refreshed by checkForUpdates instead, which downloads a delta)
+async function staleWhileRevalidate(event, cacheName, key, revalidate) {
+  const cache = await caches.open(cacheName);
+  const cached = await cache.match(key);
+  const update = (cached && !revalidate) ? null : fetch(key)
+    .then(async response => {
+      if (response.ok) await cache.put(key, response.clone());
+      return response;
+    });
+  if (cached) {
+    if (update) event.waitUntil(update.catch(() => {}));
+    return cached;
+  }
+  return update;
+}
+
+async function fetchWithTimeout(request, ms) {
+  const controller = new AbortController();
+  const timer = setTimeout(() => controller.abort(), ms);
+  try {
+    return await fetch(request, { signal: controller.signal });
+  } finally {
+    clearTimeout(timer);
+  }
+}
+
+function unavailable(message) {
+  return new Response(JSON.stringify({ error: message }),
+    { status: 503, headers: { 'Content-Type': 'application/json' } });
+}
+
+async function chat(request) {
+  // Never cached; a slow or lost connection fails in bounded time and the page answers from its FAQ
+  try {
+    return await fetchWithTimeout(request, CHAT_TIMEOUT_MS);
+  } catch (err) {
+    return unavailable('Chat is not reachable right now');
+  }
+}
+
+async function lookup(request) {
+  const cache = await caches.open(LOOKUP_CACHE);
+  const cached = await cache.match(request);
+  if (cached) return cached;
+  try {
+    const response = await fetchWithTimeout(request, LOOKUP_TIMEOUT_MS);
+    if (response.ok) {
+      await cache.put(request, response.clone());
+      const keys = await cache.keys();
+      await Promise.all(keys.slice(0, Math.max(keys.length - MAX_LOOKUPS, 0)).map(key => cache.delete(key)));
+    }
+    return response;
+  } catch (err) {
+    return unavailable('Offline');
+  }
+}
+
+async function checkForUpdates() {
+  if (Date.now() - lastDataCheck < DATA_CHECK_MS) return;
+  lastDataCheck = Date.now();
+  try {
+    await refreshData();
+  } catch (err) {
+    console.log('Data update check failed', err);
+  }
+}
+
+// What changed since `since`: from /api/data/version, or from data/releases.json on static hosting
+async function dataVersion(since) {
+  const query = since ? `?since=${encodeURIComponent(since)}` : '';
+  try {
+    const response = await fetch(`api/data/version${query}`, { cache: 'no-store' });
+    if (response.ok) return await response.json();
+  } catch (err) {
+    // No backend: fall through to the release file
+  }
+  const response = await fetch('data/releases.json', { cache: 'no-store' });
+  if (!response.ok) return null;
+  const release = await response.json();
+  const old = release.history.find(entry => entry.version === since);
+  return {
+    version: release.version,
+    current: since === release.version,
+    changed: Object.keys(release.files).filter(name => !old || old.files[name] !== release.files[name]),
+    patch: (old && release.patches[since]) || null
+  };
+}
+
+async function refreshData() {
+  const cache = await caches.open(DATA_CACHE);
+  const stored = await cache.match(VERSION_KEY);
+  const since = stored ? await stored.text() : null;
+  const info = await dataVersion(since);
+  if (!info || info.current) return;
+  // Cached files of an unknown version: no base to patch, download them in full
+  if (!since) info.changed = DATA_FILES;
+
+  let patch = info.patch;
+  if (patch) {
+    try {
+      const patched = {};
+      for (const [name, ops] of Object.entries(patch)) {
+        const cached = await cache.match(`data/${name}`);
+        if (!cached) throw new Error(`data/${name} is not cached`);
+        patched[name] = applyJsonPatch(await cached.json(), ops);
+      }
+      await Promise.all(Object.entries(patched).map(([name, doc]) => cache.put(`data/${name}`,
+        new Response(JSON.stringify(doc), { headers: { 'Content-Type': 'application/json' } }))));
+    } catch (err) {
+      console.log('Patch failed, downloading the data again', err);
+      patch = null;
+    }
+  }
+  let stamped = true;
+  if (!patch) {
+    await Promise.all(info.changed.map(async name => {
+      const response = await fetch(`data/${name}`, { cache: 'no-cache' });
+      if (!response.ok) throw new Error(`data/${name}: HTTP ${response.status}`);
+      await cache.put(`data/${name}`, response);
+    }));
+    // Downloaded files may be newer than info.version: stamp them only if no release landed meanwhile
+    const after = await dataVersion(null).catch(() => null);
+    stamped = Boolean(after) && after.version === info.version;
+  }
+  if (stamped) {
+    await cache.put(VERSION_KEY, new Response(info.version));
+  } else {
+    await cache.delete(VERSION_KEY);
+  }
+  await caches.delete(LOOKUP_CACHE);  // Answers for the old data
+
+  const clients = await self.clients.matchAll({ type: 'window' });
+  clients.forEach(client => client.postMessage({ type: 'data-updated', version: info.version, patch }));
+}
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Synthetic conference data for scaling tests
+Generates conference.json-schema data at any multiple of the real event
+(1x is about 40 talks, 1 day): more days (up to 3) and more parallel tracks,
+talks of 10 to 90 minutes so time blocks overlap across rooms, co-presented
+sessions, long bios and titles/descriptions in English, German and Czech.
+The same seed always gives the same event.
+
+Usage:
+    python synthetic.py --scale 10                    # writes build/synthetic/10x/conference.json
+    python synthetic.py --scale 100 --faq --output events/synthetic-100x   # plus faq.json, served as an event
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+TALKS_PER_SCALE = 40    # Talks at 1x (the real event has 40)
+SPEAKERS_PER_TALK = 0.95  # Some speakers give two talks
+TALKS_PER_ROOM_DAY = 6  # Rooms are sized so each fits about this many talks a day
+DAY_START = (8, 15)     # UTC, like data/conference.json
+LUNCH = ((12, 0), (13, 0))
+DAY_END = (17, 0)
+GAP_MINUTES = 15        # Between talks in the same room
+DURATIONS = ((60, 0.55), (45, 0.15), (20, 0.12), (90, 0.10), (10, 0.08))  # (minutes, share): overlapping blocks
+CO_SPEAKERS = ((1, 0.83), (2, 0.13), (3, 0.04))  # (speakers per talk, share)
+LANGUAGES = (('en', 0.7), ('de', 0.2), ('cs', 0.1))
+
+TOPICS = ['Microsoft Fabric', 'Power BI', 'SQL Server 2025', 'Azure Databricks', 'Apache Spark', 'Delta Lake',
+          'Azure Synapse', 'Data Factory', 'Microsoft Purview', 'dbt', 'Kusto', 'Real-Time Intelligence', 'Copilot',
+          'semantic models', 'DAX', 'Python notebooks', 'PostgreSQL', 'Cosmos DB', 'the lakehouse', 'data mesh',
+          'vector search', 'LLM agents', 'Query Store', 'row-level security', 'Azure DevOps', 'Terraform',
+          'data governance', 'machine learning', 'event streaming', 'data quality', 'OneLake', 'Power Automate']
+TITLES = {
+    'en': ['{a} in practice', 'Deep dive into {a}', 'From {a} to {b}: lessons learned', '{a} and {b}: better together',
+           'Ten things I wish I knew about {a}', 'Scaling {a} for the enterprise', 'Securing {a}',
+           "What's new in {a}", 'Building a platform with {a} and {b}', 'Performance tuning for {a}',
+           'Hands-on workshop: {a}', '{a} anti-patterns and how to fix them'],
+    'de': ['{a} in der Praxis', 'Einführung in {a}', 'Von {a} zu {b}: Erfahrungen aus Projekten',
+           '{a} und {b} im Zusammenspiel', 'Was ist neu in {a}?', 'Sicherheit für {a}', 'Performance-Tuning mit {a}',
+           'Workshop: {a} für Einsteiger'],
+    'cs': ['{a} v praxi', 'Úvod do {a}', 'Od {a} k {b}: zkušenosti z projektů', 'Co je nového v {a}',
+           'Zabezpečení {a}', 'Ladění výkonu {a}', 'Workshop: {a} pro začátečníky'],
+}
+DESCRIPTIONS = {
+    'en': ['In this session we look at how {a} fits into a modern data platform.',
+           'We cover real-world patterns, common pitfalls and the trade-offs between {a} and {b}.',
+           'Expect plenty of demos, including a live migration from {b}.',
+           'You will leave with a checklist you can apply to your own {a} projects on Monday.',
+           'The session assumes basic familiarity with {b}.',
+           'We also discuss cost, monitoring and how to get buy-in from your team.',
+           'Along the way we benchmark {a} against the alternatives and share the numbers.'],
+    'de': ['In dieser Session zeigen wir, wie sich {a} in eine moderne Datenplattform einfügt.',
+           'Wir besprechen typische Muster, Stolperfallen und die Abwägungen zwischen {a} und {b}.',
+           'Es gibt viele Demos, unter anderem eine Live-Migration von {b}.',
+           'Am Ende haben Sie eine Checkliste für Ihre eigenen Projekte mit {a}.',
+           'Grundkenntnisse in {b} sind hilfreich.',
+           'Außerdem geht es um Kosten, Monitoring und die Einführung im Team.'],
+    'cs': ['V této přednášce ukážeme, jak {a} zapadá do moderní datové platformy.',
+           'Probereme osvědčené postupy, časté chyby a kompromisy mezi {a} a {b}.',
+           'Čeká vás spousta ukázek včetně živé migrace z {b}.',
+           'Odnesete si kontrolní seznam pro vlastní projekty s {a}.',
+           'Předpokládá se základní znalost {b}.',
+           'Dojde i na náklady, monitoring a zavedení v týmu.'],
+}
+BIO = ['{name} is a {role} at {company} with {years} years of experience in {a}.',
+       'Before joining {company}, {first} worked on {b} projects in banking, retail and manufacturing.',
+       '{first} is a Microsoft Data Platform MVP and a regular speaker at community events across Europe.',
+       'Their work focuses on {a}, {b} and helping teams adopt modern data practices.',
+       '{first} runs the local {a} user group and writes about {b} on their blog.',
+       '{first} holds a degree in computer science and has trained more than {people} people on {a}.',
+       'Recent projects include a {b} migration for a large insurer and a real-time analytics platform built on {a}.',
+       'When not working with data, {first} enjoys hiking, board games and strong coffee.',
+       '{first} contributes to open-source tooling around {b} and reviews talks for several conferences.',
+       'At {company}, {first} leads a team of {team} engineers building on {a} and {b}.',
+       '{first} has spoken at SQLBits, PASS Data Community Summit and dozens of Data Saturdays.',
+       'Over the years {first} has helped more than {team} organizations move their reporting from spreadsheets to {a}.',
+       'In the community, {first} is known for deep dives that explain how {b} works under the hood.']
+FIRST_NAMES = ['Tomáš', 'Jiří', 'Lucie', 'Kateřina', 'Jürgen', 'Anna', 'Lukas', 'Sophie', 'Marek', 'Zuzana', 'Petra',
+               'Stefan', 'Jana', 'Martin', 'Eva', 'Florian', 'Ondřej', 'Markéta', 'Julia', 'Matthias', 'Ana', 'João',
+               'Priya', 'Chen', 'Olga', 'Mateusz', 'Agnieszka', 'Sven', 'Ingrid', 'Emre', 'Laura', 'David', 'Nina',
+               'Felix', 'Elena', 'Sara', 'Tobias', 'Klára', 'Vojtěch', 'Bernhard']
+LAST_NAMES = ['Novák', 'Svobodová', 'Dvořák', 'Černý', 'Procházková', 'Müller', 'Schmidt', 'Schneider', 'Fischer',
+              'Weiß', 'Wagner', 'Becker', 'Hoffmann', 'Kowalski', 'Nowak', 'Horváth', 'Kovač', 'Rossi', 'Silva',
+              'García', 'Jensen', 'Larsen', 'Öztürk', 'Yılmaz', 'Kumar', 'Wang', 'Ivanova', 'Petrović', 'Janssen',
+              'de Vries', 'Gruber', 'Huber', 'Bauer', 'Steiner', 'Moser', 'Pichler', 'Eder', 'Hofer', 'Lang', 'Žák']
+ROLES = ['Data Engineer', 'Solution Architect', 'BI Consultant', 'Principal Program Manager', 'Data Scientist',
+         'Database Administrator', 'Analytics Lead', 'CTO', 'Cloud Architect', 'Trainer']
+COMPANIES = ['Clouds on Mars', 'b.telligent', 'Cubido', 'HEDDA.IO', 'Datenwerk', 'Lakeview Analytics', 'Prague Data Labs',
+             'Alpenquery', 'Northwind Traders', 'Contoso', 'Fabrikam', 'Vienna Insights']
+SPONSORS = ['ACP', 'b.telligent', 'HEDDA.IO', 'Cubido', 'Datenwerk', 'Contoso', 'Fabrikam', 'Lakeview']
+DANCES = ['Flamenco', 'Foxtrott', 'Ballerina', 'Menuett', 'Tango', 'Walzer', 'Polka', 'Samba', 'Rumba', 'Quickstep']
+
+
+def weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def speaker_names(count, rng):
+    """`count` distinct names; past every first/last combination a middle initial keeps them unique"""
+    pairs = list(itertools.product(FIRST_NAMES, LAST_NAMES))
+    rng.shuffle(pairs)
+    names = []
+    for i in range(count):
+        first, last = pairs[i % len(pairs)]
+        round_ = i // len(pairs)
+        names.append((first, f"{first} {chr(64 + round_)}. {last}" if round_ else f"{first} {last}"))
+    return names
+
+
+def slug(text):
+    return ''.join(c if c.isalnum() else '-' for c in text.lower()).strip('-')
+
+
+def generate_conference(scale=1, seed=1, days=None):
+    """A conference.json dict with about TALKS_PER_SCALE * scale talks"""
+    rng = random.Random(seed)
+    talk_count = max(1, round(TALKS_PER_SCALE * scale))
+    days = days or (1 if talk_count <= 60 else 2 if talk_count <= 200 else 3)
+    tracks = math.ceil(talk_count / (days * TALKS_PER_ROOM_DAY))
+
+    rooms = []
+    for i in range(tracks):
+        name = f"{SPONSORS[i % len(SPONSORS)]} ({DANCES[i % len(DANCES)]})"
+        if i >= len(SPONSORS) * len(DANCES) // math.gcd(len(SPONSORS), len(DANCES)):
+            name += f" {i}"
+        rooms.append({'id': f"room-{i}", 'name': name, 'floor': i // 10})
+    rooms.append({'id': 'lobby', 'name': 'Main Lobby', 'floor': 0})
+
+    speakers = []
+    for first, name in speaker_names(max(1, round(talk_count * SPEAKERS_PER_TALK)), rng):
+        role, company = rng.choice(ROLES), rng.choice(COMPANIES)
+        a, b = rng.sample(TOPICS, 2)
+        sentences = [BIO[0]] + rng.sample(BIO[1:], rng.randint(7, len(BIO) - 1))
+        bio = ' '.join(s.format(a=a, b=b, name=name, first=first, role=role, company=company,
+                                years=rng.randint(3, 25), people=rng.randint(2, 40) * 50, team=rng.randint(3, 30))
+                       for s in sentences)
+        speakers.append({'id': slug(name), 'name': name, 'title': f"{role} @ {company}", 'bio': bio, 'photo': ''})
+
+    # Every speaker presents at least once (shuffled round-robin), co-speakers at random
+    leads = [s['name'] for s in speakers]
+    rng.shuffle(leads)
+
+    def at(day, hour_minute):
+        return datetime(2026, 1, 23 + day, *hour_minute, tzinfo=timezone.utc)
+
+    def session(session_id, title, description, names, room, start, end):
+        return {'id': session_id, 'title': title, 'description': description, 'speakers': names, 'room': room['name'],
+                'room_id': room['id'], 'start': start.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'end': end.strftime('%Y-%m-%dT%H:%M:%SZ'), 'duration': int((end - start).total_seconds() // 60)}
+
+    lobby = rooms[-1]
+    sessions = [session('reg-1', 'Registration', 'Conference registration and welcome coffee', [], lobby,
+                        at(0, (7, 0)), at(0, DAY_START))]
+    talks = 0
+    for day in range(days):
+        sessions.append(session(f"lunch-{day + 1}", 'Lunch', 'Lunch break for all attendees', [], lobby,
+                                at(day, LUNCH[0]), at(day, LUNCH[1])))
+        for room in rooms[:-1]:
+            for block_start, block_end in ((at(day, DAY_START), at(day, LUNCH[0])), (at(day, LUNCH[1]), at(day, DAY_END))):
+                start = block_start
+                while talks < talk_count:
+                    end = start + timedelta(minutes=weighted(rng, DURATIONS))
+                    if end > block_end:
+                        break
+                    language = weighted(rng, LANGUAGES)
+                    names = [leads[talks % len(leads)]]
+                    names += [n for n in rng.sample(leads, weighted(rng, CO_SPEAKERS) - 1) if n not in names]
+                    a, b = rng.sample(TOPICS, 2)
+                    title = rng.choice(TITLES[language]).format(a=a, b=b)
+                    description = ' '.join(s.format(a=a, b=b)
+                                           for s in rng.sample(DESCRIPTIONS[language], rng.randint(3, 5)))
+                    sessions.append(session(f"s{talks + 1}", title, description, names, room, start, end))
+                    talks += 1
+                    start = end + timedelta(minutes=GAP_MINUTES)
+
+    return {
+        'event': {'name': f"Synthetic Data Day ({scale}x)", 'date': '2026-01-23', 'location': 'JUFA Hotel Wien',
+                  'address': 'Mautner-Markhof-Gasse 50, 1110 Wien', 'timezone': 'Europe/Vienna'},
+        'sessions': sessions,
+        'speakers': speakers,
+        'rooms': rooms
+    }
+
+
+def write_event(data, directory, faq=False):
+    """conference.json (and a generated faq.json) in an event directory"""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, 'conference.json'), 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    if faq:
+        import contextlib
+        import io
+        from generate_faq import generate_faq, save_faq
+        from normalize import normalize_keywords
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            entries = generate_faq(data)
+        for item in entries:
+            item['keywords'] = normalize_keywords(item['keywords'])
+        save_faq(entries, os.path.join(directory, 'faq.json'))
+
+
+if __name__ == '__main__':
+    from model import Event
+
+    parser = argparse.ArgumentParser(description='Generate a synthetic conference.json at some multiple of the real event')
+    parser.add_argument('--scale', type=float, default=10, help='multiple of the real event (1 = about 40 talks)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--days', type=int, help='default: 1-3 depending on size')
+    parser.add_argument('--faq', action='store_true', help='also write faq.json')
+    parser.add_argument('--output', help='directory (default: build/synthetic/<scale>x)')
+    args = parser.parse_args()
+    scale = int(args.scale) if args.scale == int(args.scale) else args.scale
+
+    started = time.perf_counter()
+    data = generate_conference(scale, args.seed, args.days)
+    event = Event.from_dict(data)
+    output = args.output or os.path.join('build', 'synthetic', f"{scale}x")
+    write_event(data, output, args.faq)
+    talks = [s for s in event.sessions if s.speakers]
+    print(f"✓ {output}: {len(talks)} talks over {len({s.start.date() for s in talks})} days in {len(event.rooms) - 1} "
+          f"rooms, {len(event.speakers)} speakers in {time.perf_counter() - started:.1f} s")
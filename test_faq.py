@@ -5,6 +5,8 @@ Test FAQ matching to verify it catches recommendation questions
 
 import json
 
+from faq_search import score_faq
+
 # Load FAQ
 with open('data/faq.json', 'r', encoding='utf-8') as f:
     faq = json.load(f)
@@ -19,25 +21,17 @@ test_questions = [
     "I want to learn about Azure",
     "Sessions about performance optimization?",
     "Which sessions start at 1:45 PM?",
+    "Which sessions start at 13.45?",
+    "Welche Sessions beginnen um 13:45 Uhr?",
+    "Které přednášky začínají ve 13:45?",
     "What are my options at 9:15?",
     "Tell me about sessions in the first block",
 ]
 
 def search_faq(question):
-    """Simple FAQ matching (mimics frontend logic)"""
-    question_lower = question.lower()
-    matches = []
-
-    for faq_item in faq:
-        score = 0
-        for keyword in faq_item['keywords']:
-            if keyword.lower() in question_lower:
-                score += 10
-        if score > 0:
-            matches.append({'item': faq_item, 'score': score})
-
-    matches.sort(key=lambda x: x['score'], reverse=True)
-    return matches[0] if matches else None
+    """FAQ matching on normalized text (same rules as the frontend)"""
+    matches = score_faq(faq, question)
+    return {'item': matches[0][1], 'score': matches[0][0]} if matches else None
 
 print("Testing FAQ matching:\n")
 print("=" * 80)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test local speaker photos against fixtures: every rewritten photo path must
+exist, also after the photos changed and were built again
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+
+from model import load_conference
+from photos import localize_photos
+
+
+def solid_png(rgb, side=8):
+    """A small single-colour PNG (no Pillow needed)"""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    rows = b''.join(b'\0' + bytes(rgb) * side for _ in range(side))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', side, side, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b''))
+
+
+def write_fixtures(directory, urls, rgb):
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    for url in urls:
+        with open(os.path.join(directory, url.rstrip('/').rsplit('/', 1)[-1]), 'wb') as f:
+            f.write(solid_png(rgb))
+
+
+tmp = tempfile.mkdtemp()
+try:
+    data_dir = os.path.join(tmp, 'event')
+    fixtures = os.path.join(tmp, 'fixtures')
+    os.makedirs(data_dir)
+    shutil.copyfile('data/conference.json', os.path.join(data_dir, 'conference.json'))
+    urls = [s.photo for s in load_conference('data/conference.json').speakers if s.photo]
+
+    # Second run: every photo changed and the download cache is gone
+    for run, rgb in enumerate([(200, 40, 40), (40, 40, 200)], 1):
+        write_fixtures(fixtures, urls, rgb)
+        localize_photos(data_dir, fixtures, os.path.join(tmp, f"downloads-{run}"))
+        photos = [s.photo for s in load_conference(os.path.join(data_dir, 'conference.json')).speakers if s.photo]
+        missing = [p for p in photos if not os.path.exists(os.path.join(data_dir, p[len('data/'):]))]
+        print(f"Run {run}: {len(photos) - len(missing)}/{len(photos)} speaker photos are local files")
+        assert len(photos) == len(urls), f"{len(urls) - len(photos)} speakers lost their photo"
+        assert not missing, f"Missing photo files: {missing[:3]}"
+    print("✅ Photo paths in conference.json exist after a rebuild")
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
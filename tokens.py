@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Fast local token estimation for Claude prompts
+Lets the server shape and refuse requests before any money is spent.
+The estimate self-calibrates against the real `usage` counts the API returns.
+"""
+
+import threading
+
+CHARS_PER_TOKEN = 3.8          # English text and code, measured on our prompts
+NON_ASCII_BYTE_TOKENS = 0.5    # Extra tokens per non-ASCII UTF-8 byte (č, ř, ä, ...)
+MESSAGE_OVERHEAD_TOKENS = 8    # Role markers and message framing
+TRIM_MARKER = '[... part of the schedule omitted to fit the request budget ...]'
+
+
+class TokenEstimator:
+    """Character-based token estimate with an EMA calibration factor"""
+
+    def __init__(self, chars_per_token=CHARS_PER_TOKEN, calibration=1.0, smoothing=0.1):
+        self.chars_per_token = chars_per_token
+        self.calibration = calibration
+        self.smoothing = smoothing
+        self.observations = 0
+        self.total_estimated = 0
+        self.total_actual = 0
+        self._lock = threading.Lock()
+
+    def estimate(self, text):
+        """Estimated tokens for a piece of text (no message overhead)"""
+        extra_bytes = len(text.encode('utf-8')) - len(text)
+        return int((len(text) / self.chars_per_token + extra_bytes * NON_ASCII_BYTE_TOKENS) * self.calibration)
+
+    def estimate_messages(self, messages, system=''):
+        """Estimated input tokens for a Messages API request"""
+        total = self.estimate(system) if system else 0
+        for message in messages:
+            content = message['content']
+            if not isinstance(content, str):
+                content = ''.join(block.get('text', '') for block in content)
+            total += self.estimate(content) + MESSAGE_OVERHEAD_TOKENS
+        return total
+
+    def observe(self, estimated, actual):
+        """Feed back the real input token count; returns actual/estimated"""
+        if estimated <= 0 or actual <= 0:
+            return None
+        ratio = actual / estimated
+        with self._lock:
+            self.observations += 1
+            self.total_estimated += estimated
+            self.total_actual += actual
+            factor = (1 - self.smoothing) + self.smoothing * ratio
+            self.calibration = min(2.0, max(0.5, self.calibration * factor))
+        return ratio
+
+    def snapshot(self):
+        """Calibration state for the metrics endpoint"""
+        with self._lock:
+            return {
+                'observations': self.observations,
+                'calibration': round(self.calibration, 3),
+                'actual_over_estimated': round(self.total_actual / self.total_estimated, 3) if self.total_estimated else None
+            }
+
+
+def trim_prompt(prompt, budget, estimator):
+    """Drop whole paragraphs from the middle of a prompt until it fits the budget
+
+    The first paragraph (role and event) and the last one (the attendee's
+    question) are always kept. Returns None if even those do not fit.
+    """
+    if estimator.estimate(prompt) <= budget:
+        return prompt
+
+    paragraphs = prompt.split('\n\n')
+    if len(paragraphs) < 3:
+        return None
+    head, middle, tail = paragraphs[0], paragraphs[1:-1], paragraphs[-1]
+    sizes = [estimator.estimate(p + '\n\n') for p in middle]
+    total = estimator.estimate(head) + estimator.estimate(tail) + estimator.estimate(TRIM_MARKER) + sum(sizes)
+
+    while middle and total > budget:
+        center = len(middle) // 2
+        total -= sizes.pop(center)
+        middle.pop(center)
+
+    if total > budget:
+        return None
+    center = len(middle) // 2
+    return '\n\n'.join([head] + middle[:center] + [TRIM_MARKER] + middle[center:] + [tail])
@@ -3,7 +3,7 @@
 Update speaker bios in conference.json from the provided text
 """
 
-import json
+from model import dump_conference, load_conference
 
 # Speaker bios from Sessionize
 speaker_bios = {
@@ -92,28 +92,33 @@ speaker_bios = {
     "Ynte Jan Kuindersma": "Ynte Jan Kuindersma is a Senior Technology Advisor and Developer at BIRD Automation. He is a longtime freelance developer of database-driven applications in the Microsoft Universe. Since 2015 he uses Power BI and the surrounding Power Platfom tools. His goal is not just programming, but making people and organizations more efficient in their daily work by means of some clever code and ETL. And he is very persistent in finding the best way to find a solution for a given problem. Besides programming he is an enthusiastic teacher and speaker at community developer conferences. Dived into Fabric from the beginning and earned a DP 600 Microsoft Certified: Fabric Analytics Engineer Associate certificate in Juni 2024."
 }
 
-# Load conference.json
-print("Loading conference.json...")
-with open('data/conference.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
-
-# Update bios
-updated = 0
-for speaker in data['speakers']:
-    name = speaker['name']
-    if name in speaker_bios:
-        speaker['bio'] = speaker_bios[name]
-        updated += 1
-        try:
-            print(f"[OK] Updated: {name}")
-        except:
-            print(f"[OK] Updated speaker (name contains special chars)")
-
-print(f"\n{updated} speaker bios updated out of {len(data['speakers'])} total speakers")
-
-# Save updated data
-print("\nSaving updated conference.json...")
-with open('data/conference.json', 'w', encoding='utf-8') as f:
-    json.dump(data, f, indent=2, ensure_ascii=False)
-
-print("[DONE] Now run: python generate_faq.py")
+
+def merge_bios(event, bios=speaker_bios, verbose=True):
+    """Set the bios of the event's speakers from `bios` (by name); returns how many changed"""
+    updated = 0
+    for speaker in event.speakers:
+        name = speaker.name
+        if name in bios:
+            speaker.bio = bios[name]
+            updated += 1
+            if verbose:
+                try:
+                    print(f"[OK] Updated: {name}")
+                except:
+                    print(f"[OK] Updated speaker (name contains special chars)")
+    return updated
+
+
+if __name__ == '__main__':
+    # Load conference.json
+    print("Loading conference.json...")
+    event = load_conference()
+
+    updated = merge_bios(event)
+    print(f"\n{updated} speaker bios updated out of {len(event.speakers)} total speakers")
+
+    # Save updated data
+    print("\nSaving updated conference.json...")
+    dump_conference(event)
+
+    print("[DONE] Now run: python pipeline.py (or python generate_faq.py)")